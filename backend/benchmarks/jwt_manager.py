@@ -0,0 +1,123 @@
+"""
+Micro-benchmark for JWTAuthManager token throughput.
+
+Usage (from backend/):
+    python -m benchmarks.jwt_manager [--algorithm HS256|EdDSA|ES256]
+                                     [--iterations N] [--redis]
+
+Without --redis an in-memory stand-in is used so the numbers reflect
+signing/verification cost only.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from pydantic import SecretStr
+
+from src.core.security.jwt_manager import JWTAuthManager
+
+USER_DATA = {
+    "id": 1,
+    "email": "bench@example.com",
+    "username": "bench",
+    "is_admin": False,
+}
+
+
+class InMemoryRedis:
+    def __init__(self) -> None:
+        self._data: dict[str, str] = {}
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        self._data[key] = value
+
+    async def exists(self, key: str) -> int:
+        return int(key in self._data)
+
+
+def generate_key_pair(algorithm: str) -> tuple[bytes, bytes]:
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem, public_pem
+
+
+def build_manager(algorithm: str, use_redis: bool) -> JWTAuthManager:
+    if use_redis:
+        from src.adapters.redis import get_redis_client
+        from src.core.config import get_settings
+
+        redis_client = get_redis_client(get_settings())
+    else:
+        redis_client = InMemoryRedis()
+
+    private_key = public_key = None
+    if algorithm != "HS256":
+        private_key, public_key = generate_key_pair(algorithm)
+
+    return JWTAuthManager(
+        redis_client,  # type: ignore[arg-type]
+        SecretStr("access-secret-for-benchmarking-only"),
+        SecretStr("refresh-secret-for-benchmarking-only"),
+        algorithm,
+        refresh_token_life=7,
+        access_token_life=15,
+        private_key=private_key,
+        public_key=public_key,
+    )
+
+
+async def measure(
+    name: str, iterations: int, func: Callable[[], Awaitable[Any]]
+) -> None:
+    for _ in range(min(iterations, 100)):
+        await func()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<24} {iterations / elapsed:>10,.0f} ops/s "
+        f"{elapsed / iterations * 1e6:>8.1f} us/op"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--algorithm", default="HS256")
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--redis", action="store_true")
+    args = parser.parse_args()
+
+    manager = build_manager(args.algorithm, args.redis)
+    token = await manager.create_access_token(USER_DATA)
+
+    print(f"algorithm={args.algorithm} redis={args.redis}")
+    await measure(
+        "create_access_token",
+        args.iterations,
+        lambda: manager.create_access_token(USER_DATA),
+    )
+    await measure(
+        "verify_token", args.iterations, lambda: manager.verify_token(token)
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
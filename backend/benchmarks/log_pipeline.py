@@ -0,0 +1,111 @@
+"""
+Throughput of the logging pipeline against the previous setup.
+
+Usage (from backend/):
+    python -m benchmarks.log_pipeline [--records N] [--write-delay-us N]
+
+Modes:
+    stream        the previous setup: a StreamHandler on the root logger
+                  with the text format and f-string messages
+    queue-text    queue pipeline, text format, lazy arguments
+    queue-json    queue pipeline, JSON lines, lazy arguments
+    queue-sampled queue-json with the message on a sampled logger
+
+"caller" is the time the logging call takes in the calling thread, what
+the event loop pays. "drained" includes waiting for the writer thread to
+empty the queue. --write-delay-us makes every write sleep, standing in
+for a stdout pipe that is slower than the log rate.
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable
+
+from src.core.config import get_settings
+from src.core.utils.logger import TEXT_FORMAT, setup_logger, shutdown_logger
+
+SNIPPET_ID = "6f1c2a94-51b1-4b1e-9d6f-0d1f4a7c2e55"
+
+
+class Sink:
+    def __init__(self, write_delay: float) -> None:
+        self._write_delay = write_delay
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        if self._write_delay:
+            time.sleep(self._write_delay)
+        self.lines += 1
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _reset_root() -> logging.Logger:
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(logging.INFO)
+    return root
+
+
+def run_stream(sink: Sink, records: int) -> tuple[float, float]:
+    handler = logging.StreamHandler(sink)  # type: ignore[arg-type]
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    _reset_root().addHandler(handler)
+    log = logging.getLogger("snippetly")
+
+    start = time.perf_counter()
+    for i in range(records):
+        # The call style this replaced
+        log.info(f"Snippet {SNIPPET_ID} synced, {i} rows refreshed")  # noqa: G004
+    caller = time.perf_counter() - start
+    return caller, caller
+
+
+def run_queue(
+    sink: Sink, records: int, json_format: bool, logger_name: str
+) -> tuple[float, float]:
+    _reset_root()
+    settings = get_settings().model_copy(
+        update={"LOG_JSON": json_format, "LOG_SAMPLED_LOGGERS": ["bench"]}
+    )
+    setup_logger(settings, stream=sink)  # type: ignore[arg-type]
+    log = logging.getLogger(logger_name)
+
+    start = time.perf_counter()
+    for i in range(records):
+        log.info("Snippet %s synced, %s rows refreshed", SNIPPET_ID, i)
+    caller = time.perf_counter() - start
+    shutdown_logger()
+    return caller, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--write-delay-us", type=float, default=0)
+    args = parser.parse_args()
+
+    modes: dict[str, Callable[[Sink, int], tuple[float, float]]] = {
+        "stream": run_stream,
+        "queue-text": lambda s, n: run_queue(s, n, False, "snippetly"),
+        "queue-json": lambda s, n: run_queue(s, n, True, "snippetly"),
+        "queue-sampled": lambda s, n: run_queue(s, n, True, "bench"),
+    }
+
+    print(f"records={args.records} write_delay={args.write_delay_us}us")
+    print(f"{'mode':<14} {'caller':>16} {'drained':>16} {'written':>9}")
+    for name, run in modes.items():
+        sink = Sink(args.write_delay_us / 1e6)
+        caller, drained = run(sink, args.records)
+        print(
+            f"{name:<14} {args.records / caller:>10,.0f} rec/s "
+            f"{args.records / drained:>10,.0f} rec/s {sink.lines:>9,}"
+        )
+    _reset_root()
+
+
+if __name__ == "__main__":
+    main()
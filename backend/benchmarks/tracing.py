@@ -0,0 +1,119 @@
+"""
+Request overhead of the OpenTelemetry instrumentation.
+
+Usage (from backend/, needs the tracing dependency group):
+    python -m benchmarks.tracing [--iterations N] [--spans N]
+
+Runs the same FastAPI route through the ASGI stack in three modes:
+    off        no instrumentation, what TRACING_ENABLED=false costs
+    unsampled  instrumented, the sampler drops every trace (rate 0)
+    sampled    instrumented, every trace kept and batch exported
+
+The route opens --spans child spans, standing in for the SQL, Mongo and
+Redis calls of a typical endpoint. Spans are exported to a sink that
+drops them, so the numbers exclude the network but include the
+processor queue.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Sequence
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import NoOpTracerProvider
+from opentelemetry.trace import TracerProvider as BaseTracerProvider
+
+from src.core.tracing import build_sampler
+
+
+class DiscardingExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.exported = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self.exported += len(spans)
+        return SpanExportResult.SUCCESS
+
+
+def build_app(provider: BaseTracerProvider, child_spans: int) -> FastAPI:
+    app = FastAPI()
+    tracer = provider.get_tracer("benchmark")
+
+    @app.get("/snippets/{uuid}")
+    async def get_snippet(uuid: str) -> dict:
+        for i in range(child_spans):
+            with tracer.start_as_current_span(f"query-{i}"):
+                pass
+        return {"uuid": uuid, "title": "benchmark", "tags": ["a", "b"]}
+
+    if not isinstance(provider, NoOpTracerProvider):
+        FastAPIInstrumentor.instrument_app(app, tracer_provider=provider)
+    return app
+
+
+async def measure(name: str, app: FastAPI, iterations: int) -> float:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        for _ in range(min(iterations, 100)):
+            await client.get("/snippets/abc")
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await client.get("/snippets/abc")
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<12} {iterations / elapsed:>10,.0f} req/s "
+        f"{elapsed / iterations * 1e6:>8.1f} us/req"
+    )
+    return elapsed / iterations
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--spans", type=int, default=5)
+    args = parser.parse_args()
+
+    exporter = DiscardingExporter()
+    providers: dict[str, BaseTracerProvider] = {
+        "off": NoOpTracerProvider(),
+        "unsampled": TracerProvider(sampler=build_sampler(0.0)),
+        "sampled": TracerProvider(sampler=build_sampler(1.0)),
+    }
+    for provider in providers.values():
+        if isinstance(provider, TracerProvider):
+            provider.add_span_processor(BatchSpanProcessor(exporter))
+
+    print(f"iterations={args.iterations} child_spans={args.spans}")
+    results = {
+        name: await measure(
+            name, build_app(provider, args.spans), args.iterations
+        )
+        for name, provider in providers.items()
+    }
+    for name in ("unsampled", "sampled"):
+        print(
+            f"{name} overhead: "
+            f"{(results[name] - results['off']) * 1e6:+.1f} us/req"
+        )
+
+    for provider in providers.values():
+        if isinstance(provider, TracerProvider):
+            provider.shutdown()
+    print(f"spans exported: {exporter.exported:,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
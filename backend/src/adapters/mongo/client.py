@@ -3,13 +3,17 @@ from pymongo import AsyncMongoClient
 
 from src.core.config import get_settings
 from .documents import SnippetDocument
+from .monitoring import command_metrics_listener, pool_metrics_listener
 
 settings = get_settings()
 
 
 async def init_mongo_client() -> None:
     client: AsyncMongoClient = AsyncMongoClient(
-        settings.mongodb_url, maxPoolSize=10, minPoolSize=1
+        settings.mongodb_url,
+        maxPoolSize=10,
+        minPoolSize=1,
+        event_listeners=[command_metrics_listener, pool_metrics_listener],
     )
     await init_beanie(
         database=client.snippetly, document_models=[SnippetDocument]
@@ -0,0 +1,221 @@
+"""
+pymongo event listeners feeding the Mongo Prometheus metrics.
+
+Listeners run synchronously inside the operation, in the same task as
+the caller, so the request id context is available for the slow log.
+"""
+
+import logging
+from typing import Any, Mapping, Optional, Union
+
+from pymongo import monitoring
+
+from src.core.config import get_settings
+from src.middleware.prometheus import (
+    mongo_command_duration_seconds,
+    mongo_command_failures_total,
+    mongo_pool_checkout_seconds,
+    mongo_pool_connections,
+)
+from src.middleware.request_id import get_request_id
+from src.middleware.server_timing import record_phase
+
+logger = logging.getLogger("snippetly.mongo")
+
+CommandEvent = Union[
+    monitoring.CommandStartedEvent,
+    monitoring.CommandSucceededEvent,
+    monitoring.CommandFailedEvent,
+]
+
+# Commands get their own series, anything else is grouped as "other"
+TRACKED_COMMANDS = frozenset(
+    {
+        "find",
+        "getMore",
+        "aggregate",
+        "count",
+        "distinct",
+        "insert",
+        "update",
+        "delete",
+        "findAndModify",
+    }
+)
+
+
+def query_shape(value: Any) -> Any:  # noqa: ANN401
+    """
+    Filter with every value replaced by "?", keeping keys and operators.
+
+    {"uuid": {"$in": ["a", "b"]}} -> {"uuid": {"$in": "?"}}
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and any(
+        isinstance(item, dict) for item in value
+    ):
+        return [query_shape(item) for item in value]
+    return "?"
+
+
+def command_shape(command_name: str, command: Mapping[str, Any]) -> Any:  # noqa: ANN401
+    if command_name in ("find", "count", "distinct"):
+        return query_shape(command.get("filter", command.get("query", {})))
+    if command_name == "aggregate":
+        return query_shape(command.get("pipeline", []))
+    if command_name == "findAndModify":
+        return query_shape(command.get("query", {}))
+    if command_name == "update":
+        return [
+            query_shape(u.get("q", {})) for u in command.get("updates", [])
+        ]
+    if command_name == "delete":
+        return [
+            query_shape(d.get("q", {})) for d in command.get("deletes", [])
+        ]
+    return None
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Per-command latency histograms and a slow command log.
+
+    The started event is the only one carrying the command document, it
+    is kept by reference until the command finishes and only turned
+    into a shape when the command was slow.
+    """
+
+    def __init__(self, slow_command_ms: int) -> None:
+        self._slow_micros = slow_command_ms * 1000
+        self._started: dict[tuple, tuple[str, Mapping[str, Any]]] = {}
+
+    @staticmethod
+    def _key(event: CommandEvent) -> tuple:
+        return event.request_id, event.connection_id
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if self._slow_micros > 0:
+            self._started[self._key(event)] = (
+                event.database_name,
+                event.command,
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event)
+        mongo_command_failures_total.labels(
+            command=self._label(event.command_name)
+        ).inc()
+
+    @staticmethod
+    def _label(command_name: str) -> str:
+        return command_name if command_name in TRACKED_COMMANDS else "other"
+
+    def _finish(self, event: CommandEvent) -> None:
+        started = self._started.pop(self._key(event), None)
+        duration = event.duration_micros / 1_000_000
+        record_phase("mongo", duration)
+        mongo_command_duration_seconds.labels(
+            command=self._label(event.command_name)
+        ).observe(duration)
+
+        if started is None or event.duration_micros < self._slow_micros:
+            return
+        database_name, command = started
+        logger.warning(
+            "Slow mongo command %.1fms command=%s collection=%s.%s "
+            "request_id=%s shape=%s",
+            event.duration_micros / 1000,
+            event.command_name,
+            database_name,
+            command.get(event.command_name),
+            get_request_id() or "-",
+            command_shape(event.command_name, command),
+        )
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Tracks checkout wait time and the connections of this process's
+    Mongo pools.
+
+    pymongo has no public pool statistics, the counts are kept from the
+    pool events instead and read by the metrics collector.
+    """
+
+    def __init__(self) -> None:
+        self.open_connections = 0
+        self.in_use_connections = 0
+
+    def _update_gauges(self) -> None:
+        mongo_pool_connections.labels(state="in_use").set(
+            self.in_use_connections
+        )
+        mongo_pool_connections.labels(state="idle").set(
+            self.open_connections - self.in_use_connections
+        )
+
+    @staticmethod
+    def _observe_checkout(duration: Optional[float]) -> None:
+        # Only set by pymongo versions that time the checkout
+        if duration is not None:
+            mongo_pool_checkout_seconds.observe(duration)
+
+    def connection_created(
+        self, event: monitoring.ConnectionCreatedEvent
+    ) -> None:
+        self.open_connections += 1
+        self._update_gauges()
+
+    def connection_closed(
+        self, event: monitoring.ConnectionClosedEvent
+    ) -> None:
+        self.open_connections -= 1
+        self._update_gauges()
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        self._observe_checkout(event.duration)
+        self.in_use_connections += 1
+        self._update_gauges()
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        self._observe_checkout(event.duration)
+
+    def connection_checked_in(
+        self, event: monitoring.ConnectionCheckedInEvent
+    ) -> None:
+        self.in_use_connections -= 1
+        self._update_gauges()
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        pass
+
+
+pool_metrics_listener = PoolMetricsListener()
+command_metrics_listener = CommandMetricsListener(
+    get_settings().MONGO_SLOW_COMMAND_MS
+)
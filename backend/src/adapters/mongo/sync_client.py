@@ -0,0 +1,26 @@
+from typing import Optional
+
+from pymongo import MongoClient
+from pymongo.collection import Collection
+
+from src.core.config import get_settings
+from .documents import SnippetDocument
+from .monitoring import command_metrics_listener, pool_metrics_listener
+
+settings = get_settings()
+
+_sync_client: Optional[MongoClient] = None
+
+
+def get_sync_snippet_collection() -> Collection:
+    # Celery workers are synchronous and run without beanie, they read
+    # the same collection through a plain pymongo client
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = MongoClient(
+            settings.mongodb_url,
+            maxPoolSize=5,
+            minPoolSize=0,
+            event_listeners=[command_metrics_listener, pool_metrics_listener],
+        )
+    return _sync_client.snippetly[SnippetDocument.Settings.name]
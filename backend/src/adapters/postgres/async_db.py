@@ -1,17 +1,35 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
-from sqlalchemy.ext.asyncio import (
-    create_async_engine,
-    async_sessionmaker,
-    AsyncSession,
-)
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 from src.core.config import get_settings
+from .pool import create_db_engine
+from .routing import PrimarySession
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url)
-SessionLocal = async_sessionmaker(autoflush=False, bind=engine)
+engine = create_db_engine(settings, settings.database_url)
+# Sessions check a connection out lazily on their first statement, so a
+# request that never queries Postgres never touches the pool
+SessionLocal = async_sessionmaker(
+    autoflush=False,
+    bind=engine,
+    expire_on_commit=False,
+    sync_session_class=PrimarySession,
+)
+
+replica_engine = (
+    create_db_engine(settings, settings.replica_database_url, name="replica")
+    if settings.replica_database_url
+    else None
+)
+ReadSessionLocal: Optional[async_sessionmaker[AsyncSession]] = (
+    async_sessionmaker(
+        autoflush=False, bind=replica_engine, expire_on_commit=False
+    )
+    if replica_engine is not None
+    else None
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -20,3 +38,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield db
     finally:
         await db.close()
+
+
+async def release_connection(db: AsyncSession) -> None:
+    # Ends a read-only transaction so its connection goes back to the pool
+    # while the request is still doing non-database work (Mongo, Redis,
+    # serialization). Loaded objects stay usable since nothing is expired
+    if db.in_transaction() and not (db.new or db.dirty or db.deleted):
+        await db.commit()
@@ -0,0 +1,122 @@
+"""
+Per-statement query metrics and slow query log for SQLAlchemy engines.
+
+Statements are grouped by a fingerprint, a short hash of the SQL with
+literals and bind parameter lists collapsed, so every call site of a
+repository method lands in the same series. The full statement for a
+fingerprint shows up in the slow query log.
+"""
+
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from random import random
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+
+from src.core.config.dbs import PostgresSQLSettings
+from src.middleware.prometheus import (
+    db_query_duration_seconds,
+    db_query_rows_total,
+)
+from src.middleware.request_id import get_request_id
+from src.middleware.server_timing import record_phase
+
+logger = logging.getLogger("snippetly.sql")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# asyncpg statements carry bind casts, $1::UUID or $2::VARCHAR(40)[]
+_BIND_PARAM = re.compile(
+    r"(?:\$\d+|%\(\w+\)s|%s|\?)(?:::\w+(?:\(\d+\))?(?:\[\])*)?"
+)
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Longest statement text written to the slow query log
+_LOGGED_STATEMENT_CHARS = 1000
+
+
+@lru_cache(maxsize=2048)
+def fingerprint_statement(statement: str) -> tuple[str, str]:
+    """
+    Operation keyword and fingerprint of a SQL statement.
+
+    Cached per statement text, SQLAlchemy reuses the compiled string
+    of a query so the regexes run once per distinct statement.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(?)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip().lower()
+
+    operation = normalized.split(" ", 1)[0] if normalized else "unknown"
+    digest = hashlib.sha1(normalized.encode(), usedforsecurity=False)
+    return operation, digest.hexdigest()[:12]
+
+
+def instrument_engine(
+    engine: Engine, settings: PostgresSQLSettings, name: str
+) -> None:
+    """
+    Attach the cursor execution hooks to a (sync) engine.
+
+    For an AsyncEngine pass engine.sync_engine.
+    """
+    sample_rate = settings.POSTGRES_QUERY_METRICS_SAMPLE_RATE
+    slow_seconds = settings.POSTGRES_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn: Connection,
+        cursor: Any,  # noqa: ANN401
+        statement: str,
+        parameters: Any,  # noqa: ANN401
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        context._query_start = perf_counter()  # type: ignore[attr-defined]
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Connection,
+        cursor: Any,  # noqa: ANN401
+        statement: str,
+        parameters: Any,  # noqa: ANN401
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        start = getattr(context, "_query_start", None)
+        if start is None:
+            return
+        duration = perf_counter() - start
+        record_phase("db", duration)
+
+        slow = 0 < slow_seconds <= duration
+        sampled = sample_rate >= 1 or random() < sample_rate
+        if not (slow or sampled):
+            return
+
+        operation, fingerprint = fingerprint_statement(statement)
+        if sampled:
+            db_query_duration_seconds.labels(
+                engine=name, operation=operation, fingerprint=fingerprint
+            ).observe(duration)
+            if cursor.rowcount > 0:
+                db_query_rows_total.labels(
+                    engine=name, operation=operation, fingerprint=fingerprint
+                ).inc(cursor.rowcount)
+        if slow:
+            logger.warning(
+                "Slow query %.1fms engine=%s fingerprint=%s request_id=%s: %s",
+                duration * 1000,
+                name,
+                fingerprint,
+                get_request_id() or "-",
+                statement[:_LOGGED_STATEMENT_CHARS],
+            )
@@ -0,0 +1,83 @@
+"""hash refresh tokens
+
+Revision ID: 2b7e5d0c9a14
+Revises: 8f3c2a91d4e7
+Create Date: 2026-10-19 12:03:27.114920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b7e5d0c9a14"
+down_revision: Union[str, Sequence[str], None] = "8f3c2a91d4e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One set-based pass. The jti comes from the JWT payload, base64url
+# re-padded for decode(). SET expressions all read the old token
+_BACKFILL = """
+UPDATE refresh_tokens
+SET
+    jti = CASE
+        WHEN jsonb_typeof(payload.claims -> 'jti') = 'string'
+            AND length(payload.claims ->> 'jti') <= 32
+        THEN payload.claims ->> 'jti'
+    END,
+    token = encode(sha256(convert_to(refresh_tokens.token, 'UTF8')), 'hex')
+FROM (
+    SELECT
+        id,
+        convert_from(
+            decode(
+                rpad(
+                    translate(split_part(token, '.', 2), '-_', '+/'),
+                    (length(split_part(token, '.', 2)) + 3) / 4 * 4,
+                    '='
+                ),
+                'base64'
+            ),
+            'UTF8'
+        )::jsonb AS claims
+    FROM refresh_tokens
+) AS payload
+WHERE payload.id = refresh_tokens.id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "refresh_tokens", sa.Column("jti", sa.String(length=32), nullable=True)
+    )
+
+    op.execute(_BACKFILL)
+
+    op.alter_column(
+        "refresh_tokens",
+        "token",
+        existing_type=sa.String(length=512),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+    )
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Digests cannot be turned back into JWTs, every session is dropped
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens")
+    op.alter_column(
+        "refresh_tokens",
+        "token",
+        existing_type=sa.String(length=64),
+        type_=sa.String(length=512),
+        existing_nullable=False,
+    )
+    op.drop_column("refresh_tokens", "jti")
@@ -0,0 +1,88 @@
+"""listing and cleanup indexes
+
+Revision ID: 5d41c7e3a8b2
+Revises: 2b7e5d0c9a14
+Create Date: 2026-10-19 14:21:05.336170
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d41c7e3a8b2"
+down_revision: Union[str, Sequence[str], None] = "2b7e5d0c9a14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES: list[tuple[str, str, list[str], dict]] = [
+    (
+        "ix_snippets_public_created_at",
+        "snippets",
+        ["created_at"],
+        {"postgresql_where": sa.text("is_private IS false")},
+    ),
+    (
+        "ix_snippets_user_id_created_at",
+        "snippets",
+        ["user_id", "created_at"],
+        {},
+    ),
+    (
+        "ix_snippet_favorites_user_id_created_at",
+        "snippet_favorites",
+        ["user_id", "created_at"],
+        {},
+    ),
+    (
+        "ix_snippet_favorites_snippet_id",
+        "snippet_favorites",
+        ["snippet_id"],
+        {},
+    ),
+    ("ix_snippets_tags_tag_id", "snippets_tags", ["tag_id", "snippet_id"], {}),
+    (
+        "ix_activation_tokens_expires_at",
+        "activation_tokens",
+        ["expires_at"],
+        {},
+    ),
+    (
+        "ix_password_reset_tokens_expires_at",
+        "password_reset_tokens",
+        ["expires_at"],
+        {},
+    ),
+    ("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+    # building without it would lock writes on the tables meanwhile
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,41 @@
+"""case insensitive login indexes
+
+Revision ID: 8f3c2a91d4e7
+Revises: 196cd12cd328
+Create Date: 2026-10-19 10:12:41.508113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3c2a91d4e7"
+down_revision: Union[str, Sequence[str], None] = "196cd12cd328"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_users_email_lower",
+        "users",
+        [sa.text("lower(email)")],
+        unique=True,
+    )
+    op.create_index(
+        "ix_users_username_lower",
+        "users",
+        [sa.text("lower(username)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_username_lower", table_name="users")
+    op.drop_index("ix_users_email_lower", table_name="users")
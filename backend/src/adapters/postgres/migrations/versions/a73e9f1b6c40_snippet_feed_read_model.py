@@ -0,0 +1,83 @@
+"""snippet feed read model
+
+Revision ID: a73e9f1b6c40
+Revises: 5d41c7e3a8b2
+Create Date: 2026-10-19 15:47:12.904518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a73e9f1b6c40"
+down_revision: Union[str, Sequence[str], None] = "5d41c7e3a8b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are filled by the snippets.sync_feed task, which also has to
+    # read content and description from MongoDB
+    op.create_table(
+        "snippet_feed",
+        sa.Column("snippet_id", sa.Integer(), nullable=False),
+        sa.Column("uuid", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=40), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column(
+            "language",
+            postgresql.ENUM(name="languageenum", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("is_private", sa.Boolean(), nullable=False),
+        sa.Column(
+            "tags",
+            postgresql.ARRAY(sa.Text()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column("content", sa.Text(), server_default="", nullable=False),
+        sa.Column("description", sa.Text(), server_default="", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["snippet_id"], ["snippets.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("snippet_id"),
+    )
+    op.create_index(
+        "ix_snippet_feed_user_id_created_at",
+        "snippet_feed",
+        ["user_id", "created_at"],
+    )
+    op.create_index(
+        "ix_snippet_feed_public_created_at",
+        "snippet_feed",
+        ["created_at"],
+        postgresql_where=sa.text("is_private IS false"),
+    )
+    op.create_index(
+        "ix_snippet_feed_tags",
+        "snippet_feed",
+        ["tags"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_snippet_feed_tags", table_name="snippet_feed")
+    op.drop_index(
+        "ix_snippet_feed_public_created_at", table_name="snippet_feed"
+    )
+    op.drop_index(
+        "ix_snippet_feed_user_id_created_at", table_name="snippet_feed"
+    )
+    op.drop_table("snippet_feed")
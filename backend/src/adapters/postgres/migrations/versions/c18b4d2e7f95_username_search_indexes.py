@@ -0,0 +1,70 @@
+"""username search indexes
+
+Revision ID: c18b4d2e7f95
+Revises: a73e9f1b6c40
+Create Date: 2026-10-19 17:05:38.217643
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c18b4d2e7f95"
+down_revision: Union[str, Sequence[str], None] = "a73e9f1b6c40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_trigram_support() -> bool:
+    query = sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )
+    return op.get_bind().scalar(query) is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Prefix LIKE can only use a btree built with pattern ops unless
+        # the database collation is C
+        op.create_index(
+            "ix_users_username_lower_pattern",
+            "users",
+            [sa.text("lower(username) text_pattern_ops")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+        # Fuzzy username search still works without pg_trgm, it just
+        # falls back to scanning users
+        if _has_trigram_support():
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            op.create_index(
+                "ix_users_username_lower_trgm",
+                "users",
+                [sa.text("lower(username) gin_trgm_ops")],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_username_lower_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_users_username_lower_pattern",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,69 @@
+"""snippet favorites count
+
+Revision ID: e4a2b9c61d37
+Revises: c18b4d2e7f95
+Create Date: 2026-10-19 18:22:51.640193
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a2b9c61d37"
+down_revision: Union[str, Sequence[str], None] = "c18b4d2e7f95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("snippets", "snippet_feed"):
+        op.add_column(
+            table,
+            sa.Column(
+                "favorites_count",
+                sa.Integer(),
+                server_default="0",
+                nullable=False,
+            ),
+        )
+
+    op.execute(
+        "UPDATE snippets SET favorites_count = counts.total "
+        "FROM (SELECT snippet_id, count(*) AS total "
+        "FROM snippet_favorites GROUP BY snippet_id) AS counts "
+        "WHERE counts.snippet_id = snippets.id"
+    )
+    op.execute(
+        "UPDATE snippet_feed SET favorites_count = snippets.favorites_count "
+        "FROM snippets WHERE snippets.id = snippet_feed.snippet_id"
+    )
+
+    # Commits the columns and backfill first, CREATE INDEX CONCURRENTLY
+    # cannot run inside a transaction block and keeps the feed writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_snippet_feed_public_favorites_count",
+            "snippet_feed",
+            ["favorites_count", "created_at"],
+            postgresql_where=sa.text("is_private IS false"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_snippet_feed_public_favorites_count",
+            table_name="snippet_feed",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("snippet_feed", "favorites_count")
+    op.drop_column("snippets", "favorites_count")
@@ -11,6 +11,8 @@ from .enums import GenderEnum, LanguageEnum
 from .snippets import (
     SnippetModel,
     SnippetFavoritesModel,
+    SnippetFeedModel,
+    SnippetsTagsTable,
     TagModel,
 )
 
@@ -26,5 +28,7 @@ __all__ = [
     "LanguageEnum",
     "SnippetModel",
     "SnippetFavoritesModel",
+    "SnippetFeedModel",
+    "SnippetsTagsTable",
     "TagModel",
 ]
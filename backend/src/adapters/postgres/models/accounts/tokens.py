@@ -1,17 +1,20 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, TYPE_CHECKING
 
+import jwt
 from sqlalchemy import (
     Integer,
     String,
     DateTime,
     ForeignKey,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.security import (
     generate_secure_token,
+    hash_token,
 )
 from ..base import Base
 
@@ -31,6 +34,7 @@ class TokenBaseModel(Base):
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
+        index=True,
         default=lambda: datetime.now(timezone.utc) + timedelta(days=1),
     )
     user_id: Mapped[int] = mapped_column(
@@ -50,6 +54,10 @@ class TokenBaseModel(Base):
             expires_at=datetime.now(timezone.utc) + timedelta(days=days),
         )
 
+    @staticmethod
+    def lookup_key(token: str) -> str:
+        return token
+
 
 class ActivationTokenModel(TokenBaseModel):
     __tablename__ = "activation_tokens"
@@ -86,14 +94,42 @@ class PasswordResetTokenModel(TokenBaseModel):
 class RefreshTokenModel(TokenBaseModel):
     __tablename__ = "refresh_tokens"
 
-    token: Mapped[str] = mapped_column(
-        String(512), unique=True, nullable=False, default=generate_secure_token
-    )
+    # token column holds sha256(JWT), jti is kept for blacklisting
+    jti: Mapped[str | None] = mapped_column(String(32))
 
     user: Mapped["UserModel"] = relationship(
         "UserModel", back_populates="refresh_tokens"
     )
 
+    __table_args__ = (Index("ix_refresh_tokens_user_id", "user_id"),)
+
+    @classmethod
+    def create(
+        cls,
+        user_id: int,
+        token: Optional[str] = None,
+        days: int = 1,
+    ) -> "RefreshTokenModel":
+        token = token or generate_secure_token()
+        return cls(
+            user_id=user_id,
+            token=cls.lookup_key(token),
+            jti=cls._extract_jti(token),
+            expires_at=datetime.now(timezone.utc) + timedelta(days=days),
+        )
+
+    @staticmethod
+    def lookup_key(token: str) -> str:
+        return hash_token(token)
+
+    @staticmethod
+    def _extract_jti(token: str) -> Optional[str]:
+        try:
+            payload = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return None
+        return payload.get("jti")
+
     def __repr__(self) -> str:
         return (
             f"<RefreshTokenModel(id={self.id}, "
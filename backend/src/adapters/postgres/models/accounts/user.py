@@ -6,6 +6,7 @@ from sqlalchemy import (
     String,
     Boolean,
     DateTime,
+    Index,
     func,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -86,6 +87,16 @@ class UserModel(Base):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+        Index("ix_users_username_lower", func.lower(username), unique=True),
+        Index(
+            "ix_users_username_lower_pattern",
+            func.lower(username).label("username_lower"),
+            postgresql_ops={"username_lower": "text_pattern_ops"},
+        ),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<UserModel(id={self.id}, "
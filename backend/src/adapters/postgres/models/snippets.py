@@ -14,7 +14,11 @@ from sqlalchemy import (
     Table,
     Column,
     UniqueConstraint,
+    Index,
+    Text,
+    text,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -39,6 +43,7 @@ SnippetsTagsTable = Table(
         primary_key=True,
     ),
     UniqueConstraint("snippet_id", "tag_id", name="uq_snippet_tag"),
+    Index("ix_snippets_tags_tag_id", "tag_id", "snippet_id"),
 )
 
 
@@ -59,6 +64,10 @@ class SnippetModel(Base):
     is_private: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=True
     )
+    # Maintained by FavoritesRepository in the favorite's transaction
+    favorites_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -93,6 +102,12 @@ class SnippetModel(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "title", name="uq_user_title"),
+        Index("ix_snippets_user_id_created_at", "user_id", "created_at"),
+        Index(
+            "ix_snippets_public_created_at",
+            "created_at",
+            postgresql_where=text("is_private IS false"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -122,6 +137,10 @@ class SnippetFavoritesModel(Base):
         UniqueConstraint(
             "user_id", "snippet_id", name="uq_user_snippet_favorite"
         ),
+        Index(
+            "ix_snippet_favorites_user_id_created_at", "user_id", "created_at"
+        ),
+        Index("ix_snippet_favorites_snippet_id", "snippet_id"),
     )
 
     user: Mapped["UserModel"] = relationship(
@@ -162,3 +181,64 @@ class TagModel(Base):
             f"<TagModel(id={self.id}, "
             f"name={self.name}, created_at={self.created_at})>"
         )
+
+
+# Read model for listings: author name, tag names and Mongo content are
+# copied in so a page is one range scan. Written together with the
+# snippet by the service, healed by the snippets.sync_feed task
+class SnippetFeedModel(Base):
+    __tablename__ = "snippet_feed"
+
+    snippet_id: Mapped[int] = mapped_column(
+        ForeignKey("snippets.id", ondelete="CASCADE"), primary_key=True
+    )
+    uuid: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    username: Mapped[str] = mapped_column(String(40), nullable=False)
+
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    language: Mapped[LanguageEnum] = mapped_column(
+        Enum(LanguageEnum), nullable=False
+    )
+    is_private: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    favorites_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    tags: Mapped[list[str]] = mapped_column(
+        ARRAY(Text), nullable=False, server_default="{}"
+    )
+    content: Mapped[str] = mapped_column(
+        Text, nullable=False, server_default=""
+    )
+    description: Mapped[str] = mapped_column(
+        Text, nullable=False, server_default=""
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_snippet_feed_user_id_created_at", "user_id", "created_at"),
+        Index(
+            "ix_snippet_feed_public_created_at",
+            "created_at",
+            postgresql_where=text("is_private IS false"),
+        ),
+        Index(
+            "ix_snippet_feed_public_favorites_count",
+            "favorites_count",
+            "created_at",
+            postgresql_where=text("is_private IS false"),
+        ),
+        Index("ix_snippet_feed_tags", "tags", postgresql_using="gin"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SnippetFeedModel(snippet_id={self.snippet_id}, "
+            f"title={self.title}, username={self.username})>"
+        )
@@ -0,0 +1,80 @@
+from time import perf_counter
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from src.core.config.dbs import PostgresSQLSettings
+from .instrumentation import instrument_engine
+from src.middleware.prometheus import (
+    db_pool_checked_out,
+    db_pool_checkout_seconds,
+    db_pool_size,
+    set_gauge_function,
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            # logging_name survives pool.recreate() on engine.dispose()
+            db_pool_checkout_seconds.labels(
+                engine=self._orig_logging_name or "primary"
+            ).observe(perf_counter() - start)
+
+
+def _unique_statement_name() -> str:
+    # PgBouncer may hand the next transaction to another server
+    # connection, so statement names must never collide
+    return f"__asyncpg_{uuid4()}__"
+
+
+def build_connect_args(settings: PostgresSQLSettings) -> dict:
+    if settings.POSTGRES_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+
+    connect_args: dict = {
+        "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+    }
+    if settings.POSTGRES_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.POSTGRES_STATEMENT_TIMEOUT_MS)
+        }
+    return connect_args
+
+
+def create_db_engine(
+    settings: PostgresSQLSettings, url: str, name: str = "primary"
+) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        connect_args=build_connect_args(settings),
+        pool_logging_name=name,
+    )
+
+    instrument_engine(engine.sync_engine, settings, name)
+
+    db_pool_size.labels(engine=name).set(settings.POSTGRES_POOL_SIZE)
+    set_gauge_function(
+        db_pool_checked_out.labels(engine=name),
+        lambda: engine.sync_engine.pool.checkedout(),  # type: ignore[attr-defined]
+    )
+    return engine
+
+
+def count_open_connections(engine: AsyncEngine) -> int:
+    pool = engine.sync_engine.pool
+    return pool.checkedin() + pool.checkedout()  # type: ignore[attr-defined]
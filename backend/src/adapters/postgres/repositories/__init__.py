@@ -1,2 +1,12 @@
-from .accounts import UserRepository, UserProfileRepository, TokenRepository
-from .snippets import SnippetRepository, FavoritesRepository
+from .accounts import (
+    UserRepository,
+    UserProfileRepository,
+    TokenRepository,
+    RefreshTokenRepository,
+)
+from .snippets import (
+    SnippetRepository,
+    FavoritesRepository,
+    SnippetFeedRepository,
+)
+from .stats import StatsRepository
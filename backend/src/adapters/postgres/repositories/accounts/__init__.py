@@ -1,3 +1,3 @@
 from .profile import UserProfileRepository
-from .token import TokenRepository
+from .token import TokenRepository, RefreshTokenRepository
 from .user import UserRepository
@@ -1,10 +1,12 @@
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple, cast, TypeVar, Generic
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func, distinct, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.adapters.postgres.models import (
     TokenBaseModel,
+    RefreshTokenModel,
     UserModel,
 )
 
@@ -24,7 +26,9 @@ class TokenRepository(Generic[T]):
 
     # --- Read ---
     async def get_by_token(self, token: str) -> Optional[T]:
-        query = select(self.token_model).where(self.token_model.token == token)
+        query = select(self.token_model).where(
+            self.token_model.token == self.token_model.lookup_key(token)
+        )
         result = await self._db.execute(query)
         return result.scalar_one_or_none()
 
@@ -32,7 +36,9 @@ class TokenRepository(Generic[T]):
         query = (
             select(UserModel, self.token_model)
             .join(UserModel)
-            .where(self.token_model.token == token)
+            .where(
+                self.token_model.token == self.token_model.lookup_key(token)
+            )
         )
         result = await self._db.execute(query)
         row = result.one_or_none()
@@ -55,7 +61,9 @@ class TokenRepository(Generic[T]):
 
     # --- Delete ---
     async def delete(self, token: str) -> None:
-        query = delete(self.token_model).where(self.token_model.token == token)
+        query = delete(self.token_model).where(
+            self.token_model.token == self.token_model.lookup_key(token)
+        )
         await self._db.execute(query)
 
     async def delete_by_user_id(self, user_id: int) -> None:
@@ -63,3 +71,38 @@ class TokenRepository(Generic[T]):
             self.token_model.user_id == user_id
         )
         await self._db.execute(query)
+
+
+class RefreshTokenRepository(TokenRepository[RefreshTokenModel]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, RefreshTokenModel)
+
+    # --- Read ---
+    @staticmethod
+    def build_active_users_query(days: int, window: timedelta) -> Select:
+        # Tokens are issued with expires_at = now + days, so one issued
+        # within the window expires after now + days - window. A range
+        # on ix_refresh_tokens_expires_at, sized by recent logins only
+        threshold = datetime.now(timezone.utc) + timedelta(days=days) - window
+        return select(func.count(distinct(RefreshTokenModel.user_id))).where(
+            RefreshTokenModel.expires_at > threshold
+        )
+
+    async def count_active_users(
+        self, days: int, window: timedelta = timedelta(hours=24)
+    ) -> int:
+        return await self._db.scalar(  # type: ignore[return-value]
+            self.build_active_users_query(days, window)
+        )
+
+    # --- Delete ---
+    async def delete_by_user_id_returning(
+        self, user_id: int
+    ) -> list[Tuple[Optional[str], datetime]]:
+        query = (
+            delete(RefreshTokenModel)
+            .where(RefreshTokenModel.user_id == user_id)
+            .returning(RefreshTokenModel.jti, RefreshTokenModel.expires_at)
+        )
+        result = await self._db.execute(query)
+        return [(row.jti, row.expires_at) for row in result]
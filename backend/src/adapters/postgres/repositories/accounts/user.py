@@ -1,9 +1,11 @@
 from typing import Optional
 
-from sqlalchemy import select, or_
+from sqlalchemy import select, func, union_all, literal, Select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only, raiseload
 
 from src.adapters.postgres.models import UserModel
+from src.api.v1.schemas.snippets import UsernameMatchEnum
 
 
 class UserRepository:
@@ -31,18 +33,79 @@ class UserRepository:
         result = await self._db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_by_login(self, login: str) -> Optional[UserModel]:
-        query = select(UserModel).where(
-            or_(UserModel.email == login, UserModel.username == login)
+    @staticmethod
+    def build_login_query(login: str) -> Select:
+        # Each UNION ALL branch is a single probe of its lower() index,
+        # LIMIT 1 stops the Append node after the first match.
+        # The user is partially loaded for login: id, email, username,
+        # password hash, is_active and is_admin. Any other column or
+        # relationship raises instead of lazy loading on the event loop
+        normalized = login.strip().lower()
+        by_email = select(UserModel).where(
+            func.lower(UserModel.email) == normalized
         )
-        result = await self._db.execute(query)
+        by_username = select(UserModel).where(
+            func.lower(UserModel.username) == normalized
+        )
+        matched = union_all(by_email, by_username).limit(1).subquery()
+        user = aliased(UserModel, matched)
+
+        return select(user).options(
+            load_only(
+                user.id,
+                user.email,
+                user.username,
+                user._hashed_password,
+                user.is_active,
+                user.is_admin,
+                raiseload=True,
+            ),
+            raiseload("*"),
+        )
+
+    async def get_by_login(self, login: str) -> Optional[UserModel]:
+        result = await self._db.execute(self.build_login_query(login))
         return result.scalar_one_or_none()
 
-    async def get_by_email_or_username(
+    @staticmethod
+    def build_ids_by_username_query(
+        username: str, mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY
+    ) -> Select:
+        # exact and prefix probe the lower(username) btree indexes, fuzzy
+        # is a substring match served by the optional pg_trgm index.
+        # Listings use it as an IN (SELECT ...) semijoin, the ids are
+        # never loaded into Python
+        normalized = username.strip().lower()
+        lowered = func.lower(UserModel.username)
+
+        if mode == UsernameMatchEnum.EXACT:
+            condition = lowered == normalized
+        elif mode == UsernameMatchEnum.FUZZY:
+            condition = lowered.contains(normalized, autoescape=True)
+        else:
+            escaped = (
+                normalized.replace("/", "//")
+                .replace("%", "/%")
+                .replace("_", "/_")
+            )
+            condition = lowered.like(f"{escaped}%", escape="/")
+
+        return select(UserModel.id).where(condition)
+
+    @staticmethod
+    def build_taken_field_query(email: str, username: str) -> Select:
+        by_email = select(literal("email").label("field")).where(
+            func.lower(UserModel.email) == email.strip().lower()
+        )
+        by_username = select(literal("username").label("field")).where(
+            func.lower(UserModel.username) == username.strip().lower()
+        )
+        taken = union_all(by_email, by_username).subquery()
+        return select(taken.c.field).order_by(taken.c.field).limit(1)
+
+    async def get_taken_field(
         self, email: str, username: str
-    ) -> Optional[UserModel]:
-        query = select(UserModel).where(
-            or_(UserModel.email == email, UserModel.username == username)
+    ) -> Optional[str]:
+        return await self._db.scalar(
+            self.build_taken_field_query(email, username)
         )
-        result = await self._db.execute(query)
-        return result.scalar_one_or_none()
@@ -1,2 +1,3 @@
 from .favorites import FavoritesRepository
+from .feed import SnippetFeedRepository
 from .snippet import SnippetRepository
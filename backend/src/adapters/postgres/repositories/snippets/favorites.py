@@ -1,7 +1,16 @@
-from typing import Optional, Sequence, Tuple
+from typing import Collection, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, delete, func
+from sqlalchemy import (
+    select,
+    delete,
+    update,
+    func,
+    literal,
+    Select,
+    CTE,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
@@ -11,9 +20,14 @@ from src.adapters.postgres.models import (
     SnippetFavoritesModel,
     LanguageEnum,
     SnippetModel,
-    TagModel,
+    SnippetFeedModel,
+)
+from src.api.v1.schemas.snippets import (
+    FavoritesSortingEnum,
+    TagMatchEnum,
+    UsernameMatchEnum,
 )
-from src.api.v1.schemas.snippets import FavoritesSortingEnum
+from ..accounts import UserRepository
 from .snippet import SnippetRepository
 
 
@@ -22,45 +36,129 @@ class FavoritesRepository:
         self._db = db
         self._snippet_repo = SnippetRepository(db)
 
+    @staticmethod
+    def _build_toggle_query(
+        changed: CTE, snippet_uuids: Collection[UUID], delta: int
+    ) -> Select:
+        # Counter lives on the snippet and its feed row so listings can
+        # show and sort by it without counting snippet_favorites. Both
+        # shifts ride along as data-modifying CTEs of the same statement,
+        # updated_at is pinned so onupdate does not treat it as an edit
+        changed_ids = select(changed.c.snippet_id)
+        shift_snippets = (
+            update(SnippetModel)
+            .where(SnippetModel.id.in_(changed_ids))
+            .values(
+                favorites_count=SnippetModel.favorites_count + delta,
+                updated_at=SnippetModel.updated_at,
+            )
+            .returning(SnippetModel.id)
+            .cte("shift_snippets")
+        )
+        shift_feed = (
+            update(SnippetFeedModel)
+            .where(SnippetFeedModel.snippet_id.in_(changed_ids))
+            .values(favorites_count=SnippetFeedModel.favorites_count + delta)
+            .returning(SnippetFeedModel.snippet_id)
+            .cte("shift_feed")
+        )
+
+        # One row per existing snippet, changed is NULL when the favorite
+        # was already in (or already out of) the requested state
+        return (
+            select(
+                SnippetModel.uuid,
+                changed.c.snippet_id.is_not(None).label("changed"),
+            )
+            .outerjoin(changed, changed.c.snippet_id == SnippetModel.id)
+            .where(SnippetModel.uuid.in_(snippet_uuids))
+            .add_cte(shift_snippets, shift_feed)
+        )
+
+    @classmethod
+    def build_add_query(
+        cls, user_id: int, snippet_uuids: Collection[UUID]
+    ) -> Select:
+        inserted = (
+            insert(SnippetFavoritesModel)
+            .from_select(
+                ["user_id", "snippet_id"],
+                select(literal(user_id), SnippetModel.id).where(
+                    SnippetModel.uuid.in_(snippet_uuids)
+                ),
+            )
+            .on_conflict_do_nothing(constraint="uq_user_snippet_favorite")
+            .returning(SnippetFavoritesModel.snippet_id)
+            .cte("inserted")
+        )
+        return cls._build_toggle_query(inserted, snippet_uuids, 1)
+
+    @classmethod
+    def build_remove_query(
+        cls, user_id: int, snippet_uuids: Collection[UUID]
+    ) -> Select:
+        # Joining snippets in the WHERE renders DELETE ... USING snippets
+        deleted = (
+            delete(SnippetFavoritesModel)
+            .where(
+                SnippetFavoritesModel.user_id == user_id,
+                SnippetFavoritesModel.snippet_id == SnippetModel.id,
+                SnippetModel.uuid.in_(snippet_uuids),
+            )
+            .returning(SnippetFavoritesModel.snippet_id)
+            .cte("deleted")
+        )
+        return cls._build_toggle_query(deleted, snippet_uuids, -1)
+
+    async def _toggle(self, query: Select) -> dict[UUID, bool]:
+        result = await self._db.execute(query)
+        return {row.uuid: row.changed for row in result}
+
+    # --- Create ---
+    async def add_many_to_favorites(
+        self, user: UserModel, snippet_uuids: Collection[UUID]
+    ) -> dict[UUID, bool]:
+        return await self._toggle(self.build_add_query(user.id, snippet_uuids))
+
     async def add_to_favorites(
         self, user: UserModel, snippet_uuid: UUID
     ) -> None:
-        snippet = await self._snippet_repo.get_by_uuid(snippet_uuid)
-        if snippet is None:
+        result = await self.add_many_to_favorites(user, [snippet_uuid])
+        if snippet_uuid not in result:
             raise exc.SnippetNotFoundError
-
-        query = select(SnippetFavoritesModel).where(
-            SnippetFavoritesModel.user_id == user.id,
-            SnippetFavoritesModel.snippet_id == snippet.id,
-        )
-        result = await self._db.execute(query)
-        favorite = result.scalar_one_or_none()
-        if favorite:
+        if not result[snippet_uuid]:
             raise exc.FavoritesAlreadyError
 
-        fav = SnippetFavoritesModel(user_id=user.id, snippet_id=snippet.id)
-        self._db.add(fav)
+    # --- Delete ---
+    async def remove_many_from_favorites(
+        self, user: UserModel, snippet_uuids: Collection[UUID]
+    ) -> dict[UUID, bool]:
+        return await self._toggle(
+            self.build_remove_query(user.id, snippet_uuids)
+        )
 
     async def remove_from_favorites(
         self, user: UserModel, snippet_uuid: UUID
     ) -> None:
-        snippet = await self._snippet_repo.get_by_uuid(snippet_uuid)
-        if snippet is None:
+        result = await self.remove_many_from_favorites(user, [snippet_uuid])
+        if snippet_uuid not in result:
             raise exc.SnippetNotFoundError
+        if not result[snippet_uuid]:
+            raise exc.FavoritesAlreadyError
 
-        query = (
-            delete(SnippetFavoritesModel)
-            .where(
-                SnippetFavoritesModel.user_id == user.id,
-                SnippetFavoritesModel.snippet_id == snippet.id,
-            )
-            .returning(SnippetFavoritesModel.id)
+    # --- Read ---
+    async def get_favorited_ids(
+        self, user_id: int, snippet_ids: Sequence[int]
+    ) -> set[int]:
+        # One probe of uq_user_snippet_favorite for a whole page
+        if not snippet_ids:
+            return set()
+        query = select(SnippetFavoritesModel.snippet_id).where(
+            SnippetFavoritesModel.user_id == user_id,
+            SnippetFavoritesModel.snippet_id.in_(snippet_ids),
         )
-
-        result = await self._db.execute(query)
-        deleted = result.scalar_one_or_none()
-        if not deleted:
-            raise exc.FavoritesAlreadyError
+        result = await self._db.scalars(query)
+        return set(result)
 
     async def get_favorites_paginated(
         self,
@@ -71,6 +169,8 @@ class FavoritesRepository:
         language: Optional[LanguageEnum] = None,
         tags: Optional[list[str]] = None,
         username: Optional[str] = None,
+        tag_mode: TagMatchEnum = TagMatchEnum.ANY,
+        username_mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY,
     ) -> Tuple[Sequence[SnippetModel], int]:
         base_query = (
             select(SnippetModel)
@@ -88,13 +188,17 @@ class FavoritesRepository:
             base_query = base_query.where(SnippetModel.language == language)
 
         if tags:
-            base_query = base_query.join(SnippetModel.tags).where(
-                TagModel.name.in_(tags)
+            base_query = base_query.where(
+                self._snippet_repo.build_tags_filter(tags, tag_mode)
             )
 
         if username:
-            base_query = base_query.join(UserModel).where(
-                UserModel.username.icontains(username)
+            base_query = base_query.where(
+                SnippetModel.user_id.in_(
+                    UserRepository.build_ids_by_username_query(
+                        username, username_mode
+                    )
+                )
             )
 
         if sort_by == "created_at":
@@ -105,6 +209,11 @@ class FavoritesRepository:
             base_query = base_query.order_by(SnippetModel.created_at.desc())
         elif sort_by == "title":
             base_query = base_query.order_by(SnippetModel.title.asc())
+        elif sort_by == "favorites_count":
+            base_query = base_query.order_by(
+                SnippetModel.favorites_count.desc(),
+                SnippetFavoritesModel.created_at.desc(),
+            )
         else:
             base_query = base_query.order_by(
                 SnippetFavoritesModel.created_at.desc()
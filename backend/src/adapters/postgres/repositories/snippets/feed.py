@@ -0,0 +1,268 @@
+from datetime import date, datetime, timedelta
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    select,
+    union_all,
+    func,
+    or_,
+    and_,
+    literal,
+    Text,
+    ColumnElement,
+    Select,
+)
+from sqlalchemy.dialects.postgresql import insert, Insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.adapters.postgres.models import (
+    SnippetFeedModel,
+    SnippetModel,
+    SnippetsTagsTable,
+    TagModel,
+    UserModel,
+    LanguageEnum,
+)
+from src.api.v1.schemas.snippets import (
+    SnippetSortingEnum,
+    TagMatchEnum,
+    UsernameMatchEnum,
+)
+from ..accounts import UserRepository
+
+
+class SnippetFeedRepository:
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    # --- Create ---
+    @staticmethod
+    def build_upsert_query(
+        snippet_id: int,
+        content: str,
+        description: str,
+        seen_updated_at: Optional[datetime] = None,
+    ) -> Insert:
+        # Everything but the Mongo fields is copied from the committed
+        # SQL state, so the same statement serves create, update and sync.
+        # With seen_updated_at nothing is written once the snippet has
+        # changed since the content was read, or the row would carry the
+        # new updated_at with the old content and never look stale again
+        tag_names = (
+            select(TagModel.name)
+            .join(SnippetsTagsTable, SnippetsTagsTable.c.tag_id == TagModel.id)
+            .where(SnippetsTagsTable.c.snippet_id == SnippetModel.id)
+            .order_by(TagModel.name)
+            .scalar_subquery()
+        )
+        source = (
+            select(
+                SnippetModel.id,
+                SnippetModel.uuid,
+                SnippetModel.user_id,
+                UserModel.username,
+                SnippetModel.title,
+                SnippetModel.language,
+                SnippetModel.is_private,
+                SnippetModel.favorites_count,
+                func.array(tag_names),
+                literal(content, Text),
+                literal(description, Text),
+                SnippetModel.created_at,
+                SnippetModel.updated_at,
+            )
+            .join(UserModel, UserModel.id == SnippetModel.user_id)
+            .where(SnippetModel.id == snippet_id)
+        )
+        if seen_updated_at is not None:
+            source = source.where(SnippetModel.updated_at == seen_updated_at)
+        columns = [
+            "snippet_id",
+            "uuid",
+            "user_id",
+            "username",
+            "title",
+            "language",
+            "is_private",
+            "favorites_count",
+            "tags",
+            "content",
+            "description",
+            "created_at",
+            "updated_at",
+        ]
+
+        query = insert(SnippetFeedModel).from_select(columns, source)
+        return query.on_conflict_do_update(
+            index_elements=[SnippetFeedModel.snippet_id],
+            set_={column: query.excluded[column] for column in columns[1:]},
+        )
+
+    async def upsert(
+        self, snippet_id: int, content: str, description: Optional[str]
+    ) -> None:
+        await self._db.execute(
+            self.build_upsert_query(snippet_id, content, description or "")
+        )
+
+    # --- Read ---
+    @staticmethod
+    def build_tags_filter(
+        tags: list[str], tag_mode: TagMatchEnum = TagMatchEnum.ANY
+    ) -> ColumnElement[bool]:
+        # && and @> are both served by the GIN index on tags
+        tag_names = list(set(tags))
+        if tag_mode == TagMatchEnum.ALL:
+            return SnippetFeedModel.tags.contains(tag_names)
+        return SnippetFeedModel.tags.overlap(tag_names)
+
+    @staticmethod
+    def build_visibility_filters(
+        current_user_id: int, visibility: Optional[str] = None
+    ) -> list[ColumnElement[bool]]:
+        # Disjoint branches, each one has an index in listing order
+        public = SnippetFeedModel.is_private.is_(False)
+        own_private = and_(
+            SnippetFeedModel.is_private.is_(True),
+            SnippetFeedModel.user_id == current_user_id,
+        )
+        if visibility == "private":
+            return [own_private]
+        if visibility == "public":
+            return [public]
+        return [public, own_private]
+
+    @classmethod
+    def build_filters(
+        cls,
+        language: Optional[LanguageEnum] = None,
+        tags: Optional[list[str]] = None,
+        created_before: Optional[date] = None,
+        created_after: Optional[date] = None,
+        username: Optional[str] = None,
+        tag_mode: TagMatchEnum = TagMatchEnum.ANY,
+        username_mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY,
+    ) -> list[ColumnElement[bool]]:
+        filters: list[ColumnElement[bool]] = []
+        if language:
+            filters.append(SnippetFeedModel.language == LanguageEnum(language))
+
+        if tags:
+            filters.append(cls.build_tags_filter(tags, tag_mode))
+
+        if created_before:
+            end_date = created_before + timedelta(days=1)
+            filters.append(SnippetFeedModel.created_at < end_date)
+
+        if created_after:
+            filters.append(SnippetFeedModel.created_at >= created_after)
+
+        if username:
+            # Semijoin on the matching author ids, the planner probes the
+            # lower(username) index and then (user_id, created_at)
+            filters.append(
+                SnippetFeedModel.user_id.in_(
+                    UserRepository.build_ids_by_username_query(
+                        username, username_mode
+                    )
+                )
+            )
+
+        return filters
+
+    @staticmethod
+    def build_count_query(
+        visibility_filters: list[ColumnElement[bool]],
+        filters: list[ColumnElement[bool]],
+    ) -> Select[Tuple[int]]:
+        return (
+            select(func.count())
+            .select_from(SnippetFeedModel)
+            .where(or_(*visibility_filters), *filters)
+        )
+
+    @staticmethod
+    def _ordering(
+        feed: type[SnippetFeedModel], sort_by: SnippetSortingEnum
+    ) -> tuple[ColumnElement, ...]:
+        if sort_by == SnippetSortingEnum.MOST_FAVORITED:
+            return (feed.favorites_count.desc(), feed.created_at.desc())
+        return (feed.created_at.desc(),)
+
+    @classmethod
+    def build_page_query(
+        cls,
+        visibility_filters: list[ColumnElement[bool]],
+        filters: list[ColumnElement[bool]],
+        offset: int,
+        limit: int,
+        sort_by: SnippetSortingEnum = SnippetSortingEnum.NEWEST,
+    ) -> Select[Tuple[SnippetFeedModel]]:
+        if len(visibility_filters) == 1:
+            return (
+                select(SnippetFeedModel)
+                .where(*visibility_filters, *filters)
+                .order_by(*cls._ordering(SnippetFeedModel, sort_by))
+                .offset(offset)
+                .limit(limit)
+            )
+
+        # "public OR mine" can only be answered by a scan and a sort.
+        # Each branch of the UNION ALL reads its own index in order up to
+        # the end of the page and Postgres merges the branches
+        branches = union_all(
+            *(
+                select(SnippetFeedModel)
+                .where(visibility, *filters)
+                .order_by(*cls._ordering(SnippetFeedModel, sort_by))
+                .limit(offset + limit)
+                for visibility in visibility_filters
+            )
+        ).subquery()
+        feed = aliased(SnippetFeedModel, branches)
+        return (
+            select(feed)
+            .order_by(*cls._ordering(feed, sort_by))
+            .offset(offset)
+            .limit(limit)
+        )
+
+    async def get_feed_paginated(
+        self,
+        offset: int,
+        limit: int,
+        current_user_id: int,
+        visibility: Optional[str] = None,
+        language: Optional[LanguageEnum] = None,
+        tags: Optional[list[str]] = None,
+        created_before: Optional[date] = None,
+        created_after: Optional[date] = None,
+        username: Optional[str] = None,
+        tag_mode: TagMatchEnum = TagMatchEnum.ANY,
+        username_mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY,
+        sort_by: SnippetSortingEnum = SnippetSortingEnum.NEWEST,
+    ) -> Tuple[Sequence[SnippetFeedModel], int]:
+        visibility_filters = self.build_visibility_filters(
+            current_user_id, visibility
+        )
+        filters = self.build_filters(
+            language,
+            tags,
+            created_before,
+            created_after,
+            username,
+            tag_mode,
+            username_mode,
+        )
+
+        total = await self._db.scalar(
+            self.build_count_query(visibility_filters, filters)
+        )
+
+        result = await self._db.execute(
+            self.build_page_query(
+                visibility_filters, filters, offset, limit, sort_by
+            )
+        )
+        return result.scalars().all(), total  # type: ignore
@@ -1,9 +1,16 @@
-from datetime import date, timedelta
-from typing import Optional, Tuple
+from typing import Optional, Sequence
 from uuid import UUID
 
 from beanie import PydanticObjectId
-from sqlalchemy import select, delete, Sequence, func, or_, and_
+from sqlalchemy import (
+    select,
+    delete,
+    exists,
+    func,
+    or_,
+    and_,
+    ColumnElement,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -12,8 +19,9 @@ from src.adapters.postgres.models import (
     SnippetModel,
     LanguageEnum,
     TagModel,
-    UserModel,
+    SnippetsTagsTable,
 )
+from src.api.v1.schemas.snippets import TagMatchEnum
 
 
 class SnippetRepository:
@@ -73,72 +81,30 @@ class SnippetRepository:
         return snippet
 
     # --- Read ---
-    async def get_snippets_paginated(
-        self,
-        offset: int,
-        limit: int,
-        current_user_id: int,
-        visibility: Optional[str] = None,
-        language: Optional[LanguageEnum] = None,
-        tags: Optional[list[str]] = None,
-        created_before: Optional[date] = None,
-        created_after: Optional[date] = None,
-        username: Optional[str] = None,
-    ) -> Tuple[Sequence, int]:
-        if visibility == "private":
-            visibility_filter = and_(
-                SnippetModel.is_private.is_(True),
-                SnippetModel.user_id == current_user_id,
-            )
-        elif visibility == "public":
-            visibility_filter = SnippetModel.is_private.is_(False)
-        else:
-            visibility_filter = or_(
-                SnippetModel.is_private.is_(False),
-                SnippetModel.user_id == current_user_id,
-            )
-        base_query = select(SnippetModel).where(visibility_filter)
-
-        if language:
-            language_enum_member = LanguageEnum(language)
-            base_query = base_query.where(
-                SnippetModel.language == language_enum_member
-            )
-
-        if tags:
-            base_query = (
-                base_query.join(SnippetModel.tags)
-                .where(TagModel.name.in_(tags))
-                .distinct()
-            )
-
-        if created_before:
-            end_date = created_before + timedelta(days=1)
-            base_query = base_query.where(SnippetModel.created_at < end_date)
-
-        if created_after:
-            base_query = base_query.where(
-                SnippetModel.created_at >= created_after
-            )
+    @staticmethod
+    def build_tags_filter(
+        tags: list[str], tag_mode: TagMatchEnum = TagMatchEnum.ANY
+    ) -> ColumnElement[bool]:
+        # Semijoins on snippets_tags keep one row per snippet, so listings
+        # need neither DISTINCT nor a join that multiplies wide rows
+        tag_names = set(tags)
+        matching = (
+            select(SnippetsTagsTable.c.snippet_id)
+            .join(TagModel, TagModel.id == SnippetsTagsTable.c.tag_id)
+            .where(TagModel.name.in_(tag_names))
+        )
 
-        if username:
-            base_query = base_query.join(UserModel).where(
-                UserModel.username.icontains(username)
+        if tag_mode == TagMatchEnum.ALL:
+            return SnippetModel.id.in_(
+                matching.group_by(SnippetsTagsTable.c.snippet_id).having(
+                    func.count() == len(tag_names)
+                )
             )
 
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = await self._db.scalar(count_query)
-
-        data_query = (
-            base_query.options(selectinload(SnippetModel.tags))
-            .order_by(SnippetModel.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+        return exists(
+            matching.where(SnippetsTagsTable.c.snippet_id == SnippetModel.id)
         )
 
-        result = await self._db.execute(data_query)
-        return result.scalars().all(), total  # type: ignore
-
     async def get_by_uuid(self, uuid: UUID) -> Optional[SnippetModel]:
         query = select(SnippetModel).where(SnippetModel.uuid == uuid)
         result = await self._db.execute(query)
@@ -0,0 +1,24 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.postgres.models import Base
+
+
+class StatsRepository:
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    # --- Read ---
+    async def estimate_count(self, model: type[Base]) -> int:
+        # reltuples is refreshed by autovacuum/ANALYZE and is -1 until the
+        # first one, n_live_tup covers that gap. Both are catalog lookups
+        # whose cost does not depend on the table size
+        query = text(
+            "SELECT CASE WHEN c.reltuples >= 0 "
+            "THEN c.reltuples::bigint ELSE coalesce(s.n_live_tup, 0) END "
+            "FROM pg_class c "
+            "LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid "
+            "WHERE c.oid = to_regclass(:table)"
+        )
+        result = await self._db.scalar(query, {"table": model.__tablename__})
+        return result or 0
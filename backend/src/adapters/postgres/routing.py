@@ -0,0 +1,57 @@
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+
+@dataclass
+class ReadRouting:
+    # Client wrote recently (sticky cookie) or wrote during this request
+    sticky: bool = False
+    wrote: bool = False
+
+
+_read_routing: ContextVar[Optional[ReadRouting]] = ContextVar(
+    "read_routing", default=None
+)
+
+
+def begin_read_routing(sticky: bool) -> tuple[ReadRouting, Token]:
+    state = ReadRouting(sticky=sticky)
+    return state, _read_routing.set(state)
+
+
+def end_read_routing(token: Token) -> None:
+    _read_routing.reset(token)
+
+
+def prefer_primary() -> bool:
+    state = _read_routing.get()
+    return state is not None and (state.sticky or state.wrote)
+
+
+def mark_write() -> None:
+    state = _read_routing.get()
+    if state is not None:
+        state.wrote = True
+
+
+class PrimarySession(Session):
+    """Session bound to the primary, records writes for read routing."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:  # noqa: ANN401
+    mark_write()
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mark_write()
@@ -4,10 +4,29 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from src.core.config import get_settings
+from .instrumentation import instrument_engine
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url_sync)
+connect_args: dict = {}
+if settings.POSTGRES_PGBOUNCER:
+    # psycopg prepares statements after 5 executions by default
+    connect_args["prepare_threshold"] = None
+elif settings.POSTGRES_STATEMENT_TIMEOUT_MS:
+    connect_args["options"] = (
+        f"-c statement_timeout={settings.POSTGRES_STATEMENT_TIMEOUT_MS}"
+    )
+
+engine = create_engine(
+    settings.database_url_sync,
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+    pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+    connect_args=connect_args,
+)
+instrument_engine(engine, settings, "sync")
 SessionLocal = sessionmaker(autoflush=False, bind=engine)
 
 
@@ -1 +1,8 @@
-from .client import get_redis_client
+from .client import (
+    get_redis_client,
+    get_sync_redis_pool,
+    create_redis_pool,
+    close_redis_client,
+    count_pool_connections,
+)
+from .unit_of_work import RedisUnitOfWork
@@ -1,8 +1,11 @@
+import asyncio
 from datetime import datetime, timezone
 from typing import cast
 
 from redis.asyncio.client import Redis
 
+from .unit_of_work import RedisUnitOfWork
+
 
 async def add_to_blacklist(redis: Redis, jti: str, exp: int) -> None:
     ttl = exp - int(datetime.now(timezone.utc).timestamp())
@@ -12,3 +15,13 @@ async def add_to_blacklist(redis: Redis, jti: str, exp: int) -> None:
 
 async def is_blacklisted(redis: Redis, jti: str) -> bool:
     return cast(bool, await redis.exists(f"bl:{jti}") == 1)
+
+
+def stage_add_to_blacklist(uow: RedisUnitOfWork, jti: str, exp: int) -> None:
+    ttl = exp - int(datetime.now(timezone.utc).timestamp())
+    if ttl > 0:
+        uow.add("setex", f"bl:{jti}", ttl, "true")
+
+
+def stage_is_blacklisted(uow: RedisUnitOfWork, jti: str) -> asyncio.Future:
+    return uow.add("exists", f"bl:{jti}")
@@ -1,19 +1,177 @@
-from typing import Optional
+from time import perf_counter
+from typing import Any, Optional, Union
 
-from redis.asyncio import Redis
+import redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.retry import Retry as SyncRetry
 
 from src.core.config.dbs import RedisSettings
+from src.middleware.prometheus import (
+    redis_command_duration_seconds,
+    redis_pool_connections,
+    redis_pool_max_connections,
+    set_gauge_function,
+)
+from src.middleware.server_timing import record_phase
 
 _redis_client: Optional[Redis] = None
+_sync_pool: Optional[redis.BlockingConnectionPool] = None
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list:
+        start = perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            duration = perf_counter() - start
+            record_phase("redis", duration)
+            redis_command_duration_seconds.labels(command="pipeline").observe(
+                duration
+            )
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args: Any, **options: Any) -> Any:  # noqa: ANN401
+        start = perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            duration = perf_counter() - start
+            record_phase("redis", duration)
+            redis_command_duration_seconds.labels(
+                command=str(args[0]).lower()
+            ).observe(duration)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Optional[str] = None
+    ) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
+
+
+def _connection_kwargs(
+    settings: RedisSettings, decode_responses: bool = True
+) -> dict:
+    return {
+        "host": settings.REDIS_HOST,
+        "port": settings.REDIS_PORT,
+        "db": settings.REDIS_DB,
+        "decode_responses": decode_responses,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": settings.REDIS_SOCKET_KEEPALIVE,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+    }
+
+
+def _backoff(settings: RedisSettings) -> ExponentialWithJitterBackoff:
+    return ExponentialWithJitterBackoff(
+        cap=settings.REDIS_RETRY_BACKOFF_CAP,
+        base=settings.REDIS_RETRY_BACKOFF_BASE,
+    )
+
+
+def _pool_usage(
+    pool: Union[BlockingConnectionPool, redis.BlockingConnectionPool],
+) -> tuple[int, int]:
+    if isinstance(pool, BlockingConnectionPool):
+        idle = len(pool._available_connections)
+        return len(pool._in_use_connections), idle
+
+    idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return len(pool._connections) - idle, idle
+
+
+def _register_pool_metrics(
+    name: str,
+    pool: Union[BlockingConnectionPool, redis.BlockingConnectionPool],
+) -> None:
+    redis_pool_max_connections.labels(pool=name).set(pool.max_connections)
+    set_gauge_function(
+        redis_pool_connections.labels(pool=name, state="in_use"),
+        lambda: _pool_usage(pool)[0],
+    )
+    set_gauge_function(
+        redis_pool_connections.labels(pool=name, state="idle"),
+        lambda: _pool_usage(pool)[1],
+    )
+
+
+def count_pool_connections() -> int:
+    pools: list[
+        Union[BlockingConnectionPool, redis.BlockingConnectionPool, None]
+    ] = [_sync_pool]
+    # get_redis_client always builds a blocking pool, the check narrows
+    # the ConnectionPool type of the attribute
+    if _redis_client is not None and isinstance(
+        _redis_client.connection_pool, BlockingConnectionPool
+    ):
+        pools.append(_redis_client.connection_pool)
+    return sum(sum(_pool_usage(pool)) for pool in pools if pool is not None)
+
+
+def create_redis_pool(settings: RedisSettings) -> BlockingConnectionPool:
+    # Blocking pool: callers wait up to REDIS_POOL_TIMEOUT for a free
+    # connection instead of failing with "Too many connections"
+    return BlockingConnectionPool(
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,  # type: ignore[arg-type]
+        retry=Retry(_backoff(settings), settings.REDIS_RETRY_ATTEMPTS),
+        **_connection_kwargs(settings),
+    )
 
 
 def get_redis_client(settings: RedisSettings) -> Redis:
     global _redis_client
     if _redis_client is None:
-        _redis_client = Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True,
-        )
+        pool = create_redis_pool(settings)
+        _register_pool_metrics("api", pool)
+        _redis_client = InstrumentedRedis(connection_pool=pool)
     return _redis_client
+
+
+def get_sync_redis_pool(
+    settings: RedisSettings,
+) -> redis.BlockingConnectionPool:
+    """
+    Synchronous pool for the rate limiter.
+
+    Every call blocks the event loop, so waits are capped by the
+    REDIS_LIMITER_* timeouts and failed commands are not retried.
+    """
+    global _sync_pool
+    if _sync_pool is None:
+        kwargs = _connection_kwargs(settings, decode_responses=False)
+        kwargs["socket_timeout"] = settings.REDIS_LIMITER_SOCKET_TIMEOUT
+        kwargs["socket_connect_timeout"] = min(
+            settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            settings.REDIS_LIMITER_SOCKET_TIMEOUT,
+        )
+        _sync_pool = redis.BlockingConnectionPool(
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_LIMITER_POOL_TIMEOUT,  # type: ignore[arg-type]
+            retry=SyncRetry(_backoff(settings), 0),
+            **kwargs,
+        )
+        _register_pool_metrics("limiter", _sync_pool)
+    return _sync_pool
+
+
+async def close_redis_client() -> None:
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        await _redis_client.connection_pool.disconnect()
+        _redis_client = None
+    # The limiter holds the sync pool for the life of the process, it is
+    # only emptied here and reconnects on the next check
+    if _sync_pool is not None:
+        _sync_pool.disconnect()
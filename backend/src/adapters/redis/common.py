@@ -1,12 +1,59 @@
+import asyncio
+from datetime import datetime, timezone
 from typing import cast
 
 from redis.asyncio import Redis
 
+from .unit_of_work import RedisUnitOfWork
+
+
+def _user_access_key(user_id: int) -> str:
+    return f"user_access:{user_id}"
+
 
 async def save_access_token(
     redis: Redis, jti: str, user_id: int, ttl: int
 ) -> None:
-    await redis.setex(f"access:{jti}", ttl, str(user_id))
+    async with RedisUnitOfWork(redis) as uow:
+        stage_save_access_token(uow, jti, user_id, ttl)
+
+
+def stage_save_access_token(
+    uow: RedisUnitOfWork, jti: str, user_id: int, ttl: int
+) -> None:
+    # The per-user index scores each jti with its expiry, so revoking a
+    # user's tokens reads one key instead of scanning every token
+    now = int(datetime.now(timezone.utc).timestamp())
+    user_key = _user_access_key(user_id)
+    uow.add("setex", f"access:{jti}", ttl, str(user_id))
+    uow.add("zadd", user_key, {jti: now + ttl})
+    uow.add("zremrangebyscore", user_key, "-inf", now)
+    uow.add("expire", user_key, ttl)
+
+
+# Blacklists every unexpired jti in a user's index until its expiry and
+# drops the index. Scripts run atomically, so no token can join the
+# index between the read and the delete and be lost with it
+_REVOKE_USER_ACCESS_TOKENS = """
+local now = tonumber(ARGV[1])
+local tokens = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], '(' .. now, '+inf', 'WITHSCORES'
+)
+for i = 1, #tokens, 2 do
+    redis.call('SETEX', 'bl:' .. tokens[i], tokens[i + 1] - now, 'true')
+end
+redis.call('DEL', KEYS[1])
+return #tokens / 2
+"""
+
+
+def stage_revoke_user_access_tokens(
+    uow: RedisUnitOfWork, user_id: int
+) -> asyncio.Future:
+    now = int(datetime.now(timezone.utc).timestamp())
+    return uow.add(
+        "eval", _REVOKE_USER_ACCESS_TOKENS, 1, _user_access_key(user_id), now
+    )
 
 
 async def get_access_token(redis: Redis, jti: str) -> str | None:
@@ -0,0 +1,68 @@
+import asyncio
+from types import TracebackType
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+
+
+class RedisUnitOfWork:
+    """
+    Buffers Redis commands and sends them in a single pipeline.
+
+    Each staged command returns a future that is resolved with the
+    command's reply once the unit of work is flushed, so callers can
+    stage reads alongside writes and inspect them after one round trip.
+    """
+
+    def __init__(self, redis: Redis, transaction: bool = False) -> None:
+        self._redis = redis
+        self._transaction = transaction
+        self._commands: list[tuple[str, tuple, asyncio.Future]] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def add(self, command: str, *args: Any) -> asyncio.Future:  # noqa: ANN401
+        future = asyncio.get_running_loop().create_future()
+        self._commands.append((command, args, future))
+        return future
+
+    async def flush(self) -> list:
+        if not self._commands:
+            return []
+
+        commands, self._commands = self._commands, []
+        try:
+            async with self._redis.pipeline(
+                transaction=self._transaction
+            ) as pipe:
+                for command, args, _ in commands:
+                    getattr(pipe, command)(*args)
+                results = await pipe.execute()
+        except BaseException:
+            for _, _, future in commands:
+                future.cancel()
+            raise
+
+        for (_, _, future), result in zip(commands, results, strict=True):
+            future.set_result(result)
+        return results
+
+    def discard(self) -> None:
+        for _, _, future in self._commands:
+            future.cancel()
+        self._commands.clear()
+
+    async def __aenter__(self) -> "RedisUnitOfWork":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            await self.flush()
+        else:
+            self.discard()
@@ -8,6 +8,7 @@ from .accounts import (
     profile_router,
 )
 from .docs import router as docs_router
+from .profiling import router as profiling_router
 from .snippets import snippets_router
 
 v1_router = APIRouter(prefix="/v1")
@@ -17,3 +18,4 @@ v1_router.include_router(oauth2_router)
 v1_router.include_router(password_router)
 v1_router.include_router(snippets_router)
 v1_router.include_router(profile_router)
+v1_router.include_router(profiling_router)
@@ -24,9 +24,12 @@ from src.core.dependencies.accounts import (
 )
 from src.core.security.jwt_manager import JWTAuthInterface
 from src.features.auth import AuthServiceInterface
+from src.middleware.server_timing import ServerTimingRoute
 from .utils import set_refresh_token
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(
+    prefix="/auth", tags=["Authentication"], route_class=ServerTimingRoute
+)
 
 
 @router.post(
@@ -28,8 +28,11 @@ from src.core.dependencies.accounts import (
 from src.core.dependencies.infrastructure import get_email_sender
 from src.core.email import EmailSenderInterface
 from src.features.auth import UserServiceInterface
+from src.middleware.server_timing import ServerTimingRoute
 
-router = APIRouter(prefix="/auth", tags=["Password Reset"])
+router = APIRouter(
+    prefix="/auth", tags=["Password Reset"], route_class=ServerTimingRoute
+)
 
 
 @router.post(
@@ -11,8 +11,11 @@ from src.core.app.limiter import limiter
 from src.core.dependencies.accounts import get_oauth_manager, get_oauth_service
 from src.core.security.oauth2 import OAuth2ManagerInterface
 from src.features.auth import OAuth2ServiceInterface
+from src.middleware.server_timing import ServerTimingRoute
 
-router = APIRouter(prefix="/auth", tags=["OAuth2"])
+router = APIRouter(
+    prefix="/auth", tags=["OAuth2"], route_class=ServerTimingRoute
+)
 
 
 @router.get(
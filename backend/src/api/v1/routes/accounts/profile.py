@@ -24,10 +24,16 @@ from src.core.app.limiter import limiter, key_func_per_user
 from src.core.dependencies.accounts import (
     get_current_user,
     get_profile_service,
+    get_profile_read_service,
 )
 from src.features.profile import ProfileServiceInterface
+from src.middleware.server_timing import ServerTimingRoute
 
-router = APIRouter(prefix="/profile", tags=["Profile Management"])
+router = APIRouter(
+    prefix="/profile",
+    tags=["Profile Management"],
+    route_class=ServerTimingRoute,
+)
 
 
 @router.get(
@@ -61,7 +67,9 @@ async def get_profile_details(
     request: Request,
     response: Response,
     user: Annotated[UserModel, Depends(get_current_user)],
-    service: Annotated[ProfileServiceInterface, Depends(get_profile_service)],
+    service: Annotated[
+        ProfileServiceInterface, Depends(get_profile_read_service)
+    ],
 ) -> ProfileResponseSchema:
     try:
         profile = await service.get_profile(user.id)
@@ -106,7 +114,9 @@ async def get_specific_user_profile(
     request: Request,
     response: Response,
     username: str,
-    service: Annotated[ProfileServiceInterface, Depends(get_profile_service)],
+    service: Annotated[
+        ProfileServiceInterface, Depends(get_profile_read_service)
+    ],
 ) -> ProfileResponseSchema:
     try:
         profile = await service.get_specific_user_profile(username)
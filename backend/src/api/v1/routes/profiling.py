@@ -0,0 +1,90 @@
+import os
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+import src.api.docs.auth_error_examples as exm
+import src.core.exceptions as exc
+from src.api.docs.openapi import create_error_examples
+from src.core.config import get_settings
+from src.core.dependencies.accounts import is_admin
+from src.core.profiling import profile_process
+from src.middleware.server_timing import ServerTimingRoute
+
+router = APIRouter(
+    prefix="/profiling",
+    tags=["Profiling"],
+    dependencies=[Depends(is_admin)],
+    route_class=ServerTimingRoute,
+)
+
+settings = get_settings()
+
+
+@router.get(
+    "/",
+    summary="Sample the stacks of this worker",
+    description="Samples every thread of the worker that handles the "
+    "request, the event loop included, for the given number of seconds "
+    "and returns collapsed stacks (`frame;frame;frame count` per line) "
+    "for flamegraph.pl or speedscope. With several workers, the "
+    "`X-Profile-PID` header tells which one was profiled.",
+    response_class=PlainTextResponse,
+    responses={
+        401: create_error_examples(
+            description="Unauthorized",
+            examples=exm.UNAUTHORIZED_ERROR_EXAMPLES,
+        ),
+        403: create_error_examples(
+            description="Forbidden",
+            examples={
+                "not_admin": "Access denied. Admin privileges required."
+            },
+        ),
+        409: create_error_examples(
+            description="Conflict",
+            examples={"busy": "A profile is already running"},
+        ),
+    },
+)
+async def profile_worker(
+    seconds: Annotated[
+        float,
+        Query(
+            gt=0,
+            le=settings.PROFILER_MAX_SECONDS,
+            description="How long to sample",
+        ),
+    ] = 10,
+    interval_ms: Annotated[
+        int,
+        Query(
+            ge=settings.PROFILER_MIN_INTERVAL_MS,
+            le=1000,
+            description="Milliseconds between samples",
+        ),
+    ] = 10,
+    include_idle: Annotated[
+        bool,
+        Query(description="Keep samples of threads waiting for work"),
+    ] = False,
+) -> PlainTextResponse:
+    try:
+        profiler = await profile_process(
+            seconds, interval_ms / 1000, include_idle=include_idle
+        )
+    except exc.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+    pid = os.getpid()
+    filename = f"profile-{pid}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-PID": str(pid),
+            "X-Profile-Samples": str(profiler.samples),
+        },
+    )
@@ -11,16 +11,28 @@ from src.adapters.postgres.models import UserModel, LanguageEnum
 from src.api.docs.openapi import create_error_examples, ErrorResponseSchema
 from src.api.v1.schemas.common import MessageResponseSchema
 from src.api.v1.schemas.snippets import (
+    FavoritesBulkResponseSchema,
+    FavoritesBulkSchema,
     FavoritesSchema,
     FavoritesSortingEnum,
     GetSnippetsResponseSchema,
+    TagMatchEnum,
+    UsernameMatchEnum,
 )
 from src.core.app.limiter import limiter, key_func_per_user
 from src.core.dependencies.accounts import get_current_user
-from src.core.dependencies.snippets import get_favorites_service
+from src.core.dependencies.snippets import (
+    get_favorites_service,
+    get_favorites_read_service,
+)
 from src.features.snippets import FavoritesServiceInterface
+from src.middleware.server_timing import ServerTimingRoute
 
-router = APIRouter(prefix="/favorites", tags=["Favorite Snippets"])
+router = APIRouter(
+    prefix="/favorites",
+    tags=["Favorite Snippets"],
+    route_class=ServerTimingRoute,
+)
 
 
 @router.post(
@@ -85,6 +97,49 @@ async def add_snippet(
     return MessageResponseSchema(message="Snippet added to favorites")
 
 
+@router.post(
+    "/bulk",
+    summary="Add or remove several snippets",
+    responses={
+        401: create_error_examples(
+            description="Unauthorized",
+            examples=exm.UNAUTHORIZED_ERROR_EXAMPLES,
+        ),
+        403: create_error_examples(
+            description="Forbidden",
+            examples=exm.FORBIDDEN_ERROR_EXAMPLES,
+        ),
+        429: create_error_examples(
+            description="Too many requests",
+            examples={"error": "Rate limit exceeded: 10 per 1 minute"},
+            model=ErrorResponseSchema,
+        ),
+        500: create_error_examples(
+            description="Internal Server Error",
+            examples={"internal_server": "Something went wrong"},
+        ),
+    },
+)
+@limiter.limit("10/minute", key_func=key_func_per_user)
+async def bulk_update_snippets(
+    request: Request,
+    response: Response,
+    user: Annotated[UserModel, Depends(get_current_user)],
+    service: Annotated[
+        FavoritesServiceInterface, Depends(get_favorites_service)
+    ],
+    data: FavoritesBulkSchema,
+) -> FavoritesBulkResponseSchema:
+    try:
+        return await service.bulk_update_favorites(
+            user, data.uuids, data.action
+        )
+    except SQLAlchemyError as e:
+        raise HTTPException(
+            status_code=500, detail="Something went wrong"
+        ) from e
+
+
 @router.delete(
     "/{uuid}",
     summary="Remove snippet from favorites",
@@ -176,7 +231,7 @@ async def get_favorites(
     response: Response,
     user: Annotated[UserModel, Depends(get_current_user)],
     service: Annotated[
-        FavoritesServiceInterface, Depends(get_favorites_service)
+        FavoritesServiceInterface, Depends(get_favorites_read_service)
     ],
     sort_by: Annotated[
         FavoritesSortingEnum, Query()
@@ -185,7 +240,18 @@ async def get_favorites(
     tags: Annotated[
         Optional[list[str]], Query(description="Filter snippets by tags")
     ] = None,
+    tag_mode: Annotated[
+        TagMatchEnum,
+        Query(description="Match snippets with any or all of the tags"),
+    ] = TagMatchEnum.ANY,
     username: Annotated[Optional[str], Query()] = None,
+    username_mode: Annotated[
+        UsernameMatchEnum,
+        Query(
+            description="Match username exactly, by prefix or anywhere"
+            " in it (default)"
+        ),
+    ] = UsernameMatchEnum.FUZZY,
     page: Annotated[
         int, Query(ge=1, description="Page number (1-based index)")
     ] = 1,
@@ -202,4 +268,6 @@ async def get_favorites(
         language=language,
         tags=tags,
         username=username,
+        tag_mode=tag_mode,
+        username_mode=username_mode,
     )
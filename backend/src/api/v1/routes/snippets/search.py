@@ -12,8 +12,11 @@ from src.core.dependencies.snippets import get_search_service
 from src.features.snippets.search.interface import (
     SnippetSearchServiceInterface,
 )
+from src.middleware.server_timing import ServerTimingRoute
 
-router = APIRouter(prefix="/search", tags=["Snippets Search"])
+router = APIRouter(
+    prefix="/search", tags=["Snippets Search"], route_class=ServerTimingRoute
+)
 
 
 @router.get(
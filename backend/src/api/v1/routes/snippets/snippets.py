@@ -19,17 +19,25 @@ from src.api.v1.schemas.snippets import (
     GetSnippetsResponseSchema,
     SnippetResponseSchema,
     SnippetUpdateRequestSchema,
+    SnippetSortingEnum,
+    TagMatchEnum,
+    UsernameMatchEnum,
     VisibilityFilterEnum,
 )
 from src.core.app.limiter import limiter, key_func_per_user
 from src.core.dependencies.accounts import get_current_user
-from src.core.dependencies.snippets import get_snippet_service
+from src.core.dependencies.snippets import (
+    get_snippet_service,
+    get_snippet_read_service,
+)
 from src.core.utils.logger import logger
 from src.features.snippets import SnippetServiceInterface
+from src.middleware.server_timing import ServerTimingRoute
 
 router = APIRouter(
     prefix="/snippets",
     tags=["Snippet Management"],
+    route_class=ServerTimingRoute,
 )
 
 
@@ -94,12 +102,12 @@ async def create_snippet(
             "Please choose a different name.",
         ) from e
     except ValidationError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(
             status_code=422, detail="Invalid input data"
         ) from e
     except (PyMongoError, SQLAlchemyError) as e:
-        logger.error(f"Database Error: {e}")
+        logger.error("Database Error: %s", e)
         raise HTTPException(
             status_code=500, detail="Failed to create snippet"
         ) from e
@@ -140,7 +148,7 @@ async def get_all_snippets(
     response: Response,
     user: Annotated[UserModel, Depends(get_current_user)],
     snippet_service: Annotated[
-        SnippetServiceInterface, Depends(get_snippet_service)
+        SnippetServiceInterface, Depends(get_snippet_read_service)
     ],
     language: Annotated[
         Optional[LanguageEnum],
@@ -160,6 +168,17 @@ async def get_all_snippets(
         Optional[str],
         Query(description="Filter snippets by username"),
     ] = None,
+    username_mode: Annotated[
+        UsernameMatchEnum,
+        Query(
+            description="Match username exactly, by prefix or anywhere"
+            " in it (default)"
+        ),
+    ] = UsernameMatchEnum.FUZZY,
+    sort_by: Annotated[
+        SnippetSortingEnum,
+        Query(description="Sort newest or most favorited first"),
+    ] = SnippetSortingEnum.NEWEST,
     visibility: Annotated[
         Optional[VisibilityFilterEnum],
         Query(description="Filter snippets by private flag"),
@@ -168,6 +187,10 @@ async def get_all_snippets(
         Optional[list[str]],
         Query(description="Filter snippets by tags"),
     ] = None,
+    tag_mode: Annotated[
+        TagMatchEnum,
+        Query(description="Match snippets with any or all of the tags"),
+    ] = TagMatchEnum.ANY,
     page: Annotated[
         int, Query(ge=1, description="Page number (1-based index)")
     ] = 1,
@@ -188,6 +211,9 @@ async def get_all_snippets(
             created_before=created_before,
             created_after=created_after,
             username=username,
+            tag_mode=tag_mode,
+            username_mode=username_mode,
+            sort_by=sort_by,
         )
     except SQLAlchemyError as e:
         raise HTTPException(
@@ -297,7 +323,7 @@ async def update_snippet(
     except exc.NoPermissionError as e:
         raise HTTPException(status_code=403, detail=str(e)) from e
     except (SQLAlchemyError, PyMongoError) as e:
-        logger.error(f"Database error: {e}")
+        logger.error("Database error: %s", e)
         raise HTTPException(
             status_code=500, detail="Failed to update snippet"
         ) from e
@@ -354,7 +380,7 @@ async def delete_snippet(
     except exc.NoPermissionError as e:
         raise HTTPException(status_code=403, detail=str(e)) from e
     except (SQLAlchemyError, PyMongoError) as e:
-        logger.error(f"Database error: {e}")
+        logger.error("Database error: %s", e)
         raise HTTPException(
             status_code=500, detail="Failed to delete snippet"
         ) from e
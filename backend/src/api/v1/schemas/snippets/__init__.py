@@ -1,4 +1,7 @@
 from .favorites import (
+    FavoritesBulkActionEnum,
+    FavoritesBulkResponseSchema,
+    FavoritesBulkSchema,
     FavoritesSchema,
     FavoritesSortingEnum,
 )
@@ -9,6 +12,9 @@ from .snippets import (
     SnippetCreateSchema,
     SnippetListItemSchema,
     SnippetResponseSchema,
+    SnippetSortingEnum,
     SnippetUpdateRequestSchema,
+    TagMatchEnum,
+    UsernameMatchEnum,
     VisibilityFilterEnum,
 )
@@ -1,14 +1,34 @@
 from enum import Enum
+from typing import List
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FavoritesSortingEnum(str, Enum):
     DATE_ADDED = "date_added"
     SNIPPET_DATE = "snippet_date"
     TITLE = "title"
+    FAVORITES_COUNT = "favorites_count"
 
 
+class FavoritesBulkActionEnum(str, Enum):
+    ADD = "add"
+    REMOVE = "remove"
+
+
+# --- Requests ---
 class FavoritesSchema(BaseModel):
     uuid: UUID
+
+
+class FavoritesBulkSchema(BaseModel):
+    action: FavoritesBulkActionEnum
+    uuids: List[UUID] = Field(..., min_length=1, max_length=100)
+
+
+# --- Responses ---
+class FavoritesBulkResponseSchema(BaseModel):
+    changed: List[UUID]
+    unchanged: List[UUID]
+    not_found: List[UUID]
@@ -61,6 +61,9 @@ class SnippetUpdateRequestSchema(BaseModel):
 # --- Responses ---
 class SnippetListItemSchema(BaseSnippetSchema):
     uuid: UUID
+    username: str
+    favorites_count: int
+    is_favorited: bool = False
 
 
 class GetSnippetsResponseSchema(BaseListSchema):
@@ -70,6 +73,8 @@ class GetSnippetsResponseSchema(BaseListSchema):
 class SnippetResponseSchema(BaseSnippetSchema):
     username: str
     uuid: UUID
+    favorites_count: int
+    is_favorited: bool = False
     created_at: datetime
     updated_at: datetime
 
@@ -77,3 +82,19 @@ class SnippetResponseSchema(BaseSnippetSchema):
 class VisibilityFilterEnum(str, Enum):
     PRIVATE = "private"
     PUBLIC = "public"
+
+
+class TagMatchEnum(str, Enum):
+    ANY = "any"
+    ALL = "all"
+
+
+class SnippetSortingEnum(str, Enum):
+    NEWEST = "newest"
+    MOST_FAVORITED = "most_favorited"
+
+
+class UsernameMatchEnum(str, Enum):
+    EXACT = "exact"
+    PREFIX = "prefix"
+    FUZZY = "fuzzy"
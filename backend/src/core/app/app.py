@@ -2,9 +2,15 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from src.admin import admin
+from src.adapters.postgres import async_db
 from src.api.v1.routes import v1_router, docs_router
-from src.middleware.prometheus import metrics_endpoint
+from src.middleware.prometheus import (
+    METRICS_PATH,
+    PrometheusMiddleware,
+    metrics_endpoint,
+)
 from src.core.config import get_settings
+from src.core.tracing import instrument_app, setup_tracing
 from .lifespan import lifespan
 from .limiter import setup_limiter
 from .middleware import setup_middlewares
@@ -12,6 +18,16 @@ from .middleware import setup_middlewares
 
 def create_app() -> FastAPI:
     settings = get_settings()
+    # Before the Mongo client exists, see src.core.tracing
+    setup_tracing(
+        settings,
+        "snippetly-api",
+        engines=[
+            engine.sync_engine
+            for engine in (async_db.engine, async_db.replica_engine)
+            if engine is not None
+        ],
+    )
 
     app = FastAPI(
         title="Snippetly - API",
@@ -24,7 +40,10 @@ def create_app() -> FastAPI:
     )
 
     setup_middlewares(app, settings)
-    setup_limiter(app, settings)
+    setup_limiter(app)
+    # Added last so it wraps every other middleware
+    app.add_middleware(PrometheusMiddleware)
+    instrument_app(app)
 
     admin.mount_to(app)
 
@@ -37,7 +56,7 @@ def create_app() -> FastAPI:
     app.include_router(docs_router, prefix="/api")
     app.include_router(v1_router, prefix="/api")
 
-    app.get("/api/metrics")(metrics_endpoint)
+    app.get(METRICS_PATH)(metrics_endpoint)
 
     @app.get("/api/health")
     def health() -> dict:
@@ -1,18 +1,48 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 
 from src.adapters.mongo.client import init_mongo_client
-from src.core.utils.logger import setup_logger, logger
+from src.adapters.redis import get_redis_client, close_redis_client
+from src.core.config import get_settings
+from src.core.security.jwt_manager import get_jwt_auth_manager
+from src.core.tracing import shutdown_tracing
+from src.core.utils.logger import setup_logger, shutdown_logger, logger
+from src.middleware.prometheus import mark_process_dead
+from .loop_monitor import LoopLagMonitor
+from .metrics import MetricsCollector
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    setup_logger()
+    settings = get_settings()
+    setup_logger(settings)
     logger.info("Logger Initialized")
 
     await init_mongo_client()
     logger.info("MongoDB Initialized")
 
+    get_jwt_auth_manager(settings, get_redis_client(settings))
+    logger.info("JWT signing keys loaded")
+
+    collector = asyncio.create_task(MetricsCollector(settings).run())
+    logger.info("Metrics collector started")
+
+    loop_monitor = LoopLagMonitor(settings)
+    loop_monitor.start()
+
     yield
+
+    await loop_monitor.stop()
+    collector.cancel()
+    with suppress(asyncio.CancelledError):
+        await collector
+    mark_process_dead()
+
+    await close_redis_client()
+    logger.info("Redis pool closed")
+
+    shutdown_tracing()
+    shutdown_logger()
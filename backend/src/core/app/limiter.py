@@ -4,13 +4,31 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-from src.core.config import Settings
+from src.adapters.redis import get_sync_redis_pool
+from src.core.config import Settings, get_settings
 
-limiter = Limiter(key_func=get_remote_address, headers_enabled=True)
 
+def create_limiter(settings: Settings) -> Limiter:
+    # slowapi only has synchronous storage, so each check is a blocking
+    # round trip on the event loop. The shared pool keeps that short with
+    # tight timeouts, trading exact limits under a slow Redis for latency.
+    # While Redis fails or times out per-process memory limits take over
+    return Limiter(
+        key_func=get_remote_address,
+        headers_enabled=True,
+        storage_uri=settings.redis_url,
+        storage_options={
+            "connection_pool": get_sync_redis_pool(settings)  # type: ignore[dict-item]
+        },
+        in_memory_fallback_enabled=True,
+    )
 
-def setup_limiter(app: FastAPI, settings: Settings) -> None:
-    limiter._storage_uri = settings.redis_url
+
+# Routes are decorated at import, so the limiter is built with them
+limiter = create_limiter(get_settings())
+
+
+def setup_limiter(app: FastAPI) -> None:
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore
 
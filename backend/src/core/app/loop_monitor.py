@@ -0,0 +1,86 @@
+"""
+Event loop lag monitor and blocking call detector.
+
+A task sleeps for a fixed interval and measures how late it wakes up,
+the delay every other callback on the loop sees too. In debug mode a
+watchdog thread also notices when that task stops ticking and logs the
+stack of the loop thread at that moment, which is the blocking call
+itself (bcrypt, Pillow, a sync SDK call) and not just the coroutine
+that made it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from contextlib import suppress
+from time import monotonic
+from typing import Optional
+
+from src.core.config import Settings
+from src.middleware.prometheus import event_loop_lag_seconds
+
+logger = logging.getLogger("snippetly.loop")
+
+
+class LoopLagMonitor:
+    def __init__(self, settings: Settings) -> None:
+        self._threshold = settings.LOOP_BLOCKING_THRESHOLD_MS / 1000
+        self._debug = settings.LOOP_BLOCKING_DEBUG
+        self._interval = settings.LOOP_LAG_INTERVAL
+        if self._debug:
+            # Tick often enough to catch stalls just above the threshold
+            self._interval = min(self._interval, self._threshold / 2)
+
+        self._last_tick = monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def _measure(self) -> None:
+        while True:
+            start = monotonic()
+            await asyncio.sleep(self._interval)
+            self._last_tick = now = monotonic()
+            event_loop_lag_seconds.observe(
+                max(now - start - self._interval, 0.0)
+            )
+
+    def _watch(self, loop_thread_id: int) -> None:
+        reported_tick = None
+        while not self._stopped.wait(self._threshold / 4):
+            last_tick = self._last_tick
+            stalled = monotonic() - last_tick - self._interval
+            if stalled < self._threshold or last_tick == reported_tick:
+                continue
+            frame = sys._current_frames().get(loop_thread_id)
+            if frame is None:
+                continue
+            # Once per stall, the stack stays the same until it ends
+            reported_tick = last_tick
+            logger.warning(
+                "Event loop blocked for %.0fms so far, loop thread stack:\n%s",
+                stalled * 1000,
+                "".join(traceback.format_stack(frame)),
+            )
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._measure())
+        if self._debug:
+            self._watchdog = threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(),),
+                name="snippetly-loop-watchdog",
+                daemon=True,
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        if self._watchdog is not None:
+            self._watchdog.join()
@@ -0,0 +1,132 @@
+"""
+Background collector for the application gauges.
+
+Pool gauges are read from in-process pool state every few seconds, the
+Postgres totals come from planner statistics on a slower interval. A
+scrape only reads gauge values, so its cost does not grow with the data.
+
+With several workers the totals are the same for all of them, so only
+the worker holding a lock in the multiprocess directory queries
+Postgres. The lock is released when that worker exits or dies and the
+next worker to try takes over.
+"""
+
+import asyncio
+import fcntl
+import os
+from time import monotonic
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.mongo.monitoring import pool_metrics_listener
+from src.adapters.postgres import async_db
+from src.adapters.postgres.models import SnippetModel
+from src.adapters.postgres.pool import count_open_connections
+from src.adapters.postgres.repositories import (
+    RefreshTokenRepository,
+    StatsRepository,
+)
+from src.adapters.redis import count_pool_connections
+from src.core.config import Settings
+from src.core.utils.logger import logger
+from src.middleware.prometheus import (
+    GAUGE_REFRESH_SECONDS,
+    active_users,
+    database_connections,
+    get_multiprocess_dir,
+    refresh_gauge_functions,
+    total_snippets,
+)
+
+# Lives next to the worker files, MultiProcessCollector only reads *.db
+COLLECTOR_LOCK_FILE = "collector.lock"
+
+
+class MetricsCollector:
+    def __init__(
+        self,
+        settings: Settings,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self._settings = settings
+        self._session_factory = session_factory or async_db.SessionLocal
+        self._lock_fd: Optional[int] = None
+
+    def is_leader(self) -> bool:
+        # A single process exports its own registry and always collects
+        path = get_multiprocess_dir()
+        if path is None or self._lock_fd is not None:
+            return True
+
+        fd = os.open(
+            os.path.join(path, COLLECTOR_LOCK_FILE), os.O_CREAT | os.O_RDWR
+        )
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    @staticmethod
+    def collect_pools() -> None:
+        engines = [async_db.engine, async_db.replica_engine]
+        database_connections.labels(database="postgres").set(
+            sum(count_open_connections(e) for e in engines if e is not None)
+        )
+        database_connections.labels(database="mongo").set(
+            pool_metrics_listener.open_connections
+        )
+        database_connections.labels(database="redis").set(
+            count_pool_connections()
+        )
+        refresh_gauge_functions()
+
+    async def collect_database(self, db: AsyncSession) -> None:
+        total_snippets.set(
+            await StatsRepository(db).estimate_count(SnippetModel)
+        )
+        active_users.set(
+            await RefreshTokenRepository(db).count_active_users(
+                self._settings.REFRESH_TOKEN_LIFE
+            )
+        )
+
+    async def run(self) -> None:
+        # Failures are logged and retried on the next tick, a dead task
+        # would freeze every gauge for the life of the worker. asyncpg
+        # connect errors (OSError) are not wrapped by SQLAlchemy.
+        next_database_run = 0.0
+        try:
+            while True:
+                try:
+                    self.collect_pools()
+                except Exception:
+                    logger.warning(
+                        "Metrics collector failed to read the pools",
+                        exc_info=True,
+                    )
+
+                if monotonic() >= next_database_run and self.is_leader():
+                    next_database_run = (
+                        monotonic() + self._settings.METRICS_COLLECT_INTERVAL
+                    )
+                    try:
+                        async with self._session_factory() as db:
+                            await self.collect_database(db)
+                    except Exception:
+                        logger.warning(
+                            "Metrics collector failed to query Postgres",
+                            exc_info=True,
+                        )
+
+                await asyncio.sleep(GAUGE_REFRESH_SECONDS)
+        finally:
+            self.release()
@@ -3,6 +3,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.core.config import Settings
+from src.middleware.read_routing import ReadRoutingMiddleware
+from src.middleware.request_id import RequestIdMiddleware
+from src.middleware.server_timing import ServerTimingMiddleware
 
 
 def setup_middlewares(app: FastAPI, settings: Settings) -> None:
@@ -17,3 +20,13 @@ def setup_middlewares(app: FastAPI, settings: Settings) -> None:
         SessionMiddleware,
         secret_key=settings.SECRET_KEY_ACCESS.get_secret_value(),
     )
+    if settings.replica_database_url:
+        app.add_middleware(
+            ReadRoutingMiddleware,
+            sticky_seconds=settings.POSTGRES_READ_STICKY_SECONDS,
+        )
+    app.add_middleware(
+        ServerTimingMiddleware, always_emit=settings.SERVER_TIMING_ENABLED
+    )
+    # Outermost of these, so everything below logs with the request id
+    app.add_middleware(RequestIdMiddleware)
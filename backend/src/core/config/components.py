@@ -1,6 +1,7 @@
 import secrets
+from pathlib import Path
 
-from pydantic import SecretStr
+from pydantic import Field, SecretStr
 
 from .base import BaseAppSettings
 
@@ -13,6 +14,45 @@ class APISettings(BaseAppSettings):
     REDOC_URL: str = "/redoc"
     OPENAPI_URL: str = "/openapi.json"
 
+    # Seconds between refreshes of the Postgres-backed Prometheus gauges
+    METRICS_COLLECT_INTERVAL: float = 60.0
+    # Send the Server-Timing header to everyone, admins always get it
+    SERVER_TIMING_ENABLED: bool = False
+    # Upper bounds for the admin profiling endpoint
+    PROFILER_MAX_SECONDS: int = 30
+    PROFILER_MIN_INTERVAL_MS: int = 5
+
+    # Seconds between event loop lag measurements
+    LOOP_LAG_INTERVAL: float = 0.5
+    # Log the loop thread stack whenever the loop is blocked longer
+    # than LOOP_BLOCKING_THRESHOLD_MS
+    LOOP_BLOCKING_DEBUG: bool = False
+    LOOP_BLOCKING_THRESHOLD_MS: int = 100
+
+
+class TracingSettings(BaseAppSettings):
+    TRACING_ENABLED: bool = False
+    # Share of root spans (requests, beat tasks) kept, children follow
+    TRACING_SAMPLE_RATE: float = Field(default=0.1, ge=0, le=1)
+    TRACING_OTLP_ENDPOINT: str = "http://otel-collector:4317"
+    TRACING_OTLP_INSECURE: bool = True
+
+
+class LoggingSettings(BaseAppSettings):
+    LOG_LEVEL: str = "INFO"
+    # JSON lines, one object per record, the plain text format otherwise
+    LOG_JSON: bool = True
+    # Repeats of a message from these loggers are sampled, ERROR and up
+    # always pass: first LOG_SAMPLING_INITIAL per second, then one in
+    # LOG_SAMPLING_THEREAFTER
+    LOG_SAMPLED_LOGGERS: list[str] = [
+        "uvicorn.access",
+        "snippetly.sql",
+        "snippetly.mongo",
+    ]
+    LOG_SAMPLING_INITIAL: int = 20
+    LOG_SAMPLING_THEREAFTER: int = 100
+
 
 class EmailSettings(BaseAppSettings):
     EMAIL_APP_PASSWORD: SecretStr | None = None
@@ -27,6 +67,9 @@ class SecuritySettings(BaseAppSettings):
     SECRET_KEY_REFRESH: SecretStr = SecretStr(secrets.token_urlsafe(32))
     SECRET_KEY_ACCESS: SecretStr = SecretStr(secrets.token_urlsafe(32))
     ALGORITHM: str = "HS256"
+    # PEM key pair for EdDSA/ES256 access tokens, unused for HS* algorithms
+    JWT_PRIVATE_KEY_PATH: Path | None = None
+    JWT_PUBLIC_KEY_PATH: Path | None = None
 
     REFRESH_TOKEN_LIFE: int = 7
     ACCESS_TOKEN_LIFE_MINUTES: int = 15
@@ -10,6 +10,34 @@ class PostgresSQLSettings(BaseAppSettings):
     POSTGRES_HOST: str = "db"
     POSTGRES_PORT: int = 5432
 
+    # Engine pool, sized per worker process
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache, forced to 0 in PgBouncer mode
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    # Server-side statement_timeout in milliseconds, 0 disables it.
+    # Sent as a startup parameter, so in PgBouncer mode it has to be set
+    # on the role instead (ALTER ROLE ... SET statement_timeout)
+    POSTGRES_STATEMENT_TIMEOUT_MS: int = 30000
+    # PgBouncer transaction pooling: no server-side prepared statement
+    # reuse and no startup parameters
+    POSTGRES_PGBOUNCER: bool = False
+
+    # Streaming replica for listing/search reads, unset = primary only
+    POSTGRES_REPLICA_HOST: str | None = None
+    POSTGRES_REPLICA_PORT: int = 5432
+    # How long a client keeps reading from the primary after a write
+    POSTGRES_READ_STICKY_SECONDS: int = 10
+
+    # Share of statements recorded in the query metrics, 0 disables them
+    POSTGRES_QUERY_METRICS_SAMPLE_RATE: float = 1.0
+    # Statements slower than this are logged with the request id,
+    # 0 disables the slow query log
+    POSTGRES_SLOW_QUERY_MS: int = 500
+
     @property
     def database_url(self) -> str:
         return str(
@@ -23,6 +51,21 @@ class PostgresSQLSettings(BaseAppSettings):
             )
         )
 
+    @property
+    def replica_database_url(self) -> str | None:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return str(
+            PostgresDsn.build(
+                scheme="postgresql+asyncpg",
+                path=self.POSTGRES_DB,
+                username=self.POSTGRES_USER,
+                password=self.POSTGRES_PASSWORD,
+                port=self.POSTGRES_REPLICA_PORT,
+                host=self.POSTGRES_REPLICA_HOST,
+            )
+        )
+
     @property
     def database_url_sync(self) -> str:
         return str(
@@ -43,6 +86,9 @@ class MongoDBSettings(BaseAppSettings):
     MONGO_PASSWORD: str = "mongodb"
     MONGODB_HOST: str = "localhost"
     MONGODB_PORT: int = 27017
+    # Commands slower than this are logged with their filter shape,
+    # 0 disables the slow command log
+    MONGO_SLOW_COMMAND_MS: int = 100
 
     @property
     def mongodb_url(self) -> str:
@@ -65,6 +111,23 @@ class RedisSettings(BaseAppSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
 
+    # Connection pool shared by the API, rate limiter and caches
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5.0
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    REDIS_SOCKET_KEEPALIVE: bool = True
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_RETRY_ATTEMPTS: int = 3
+    REDIS_RETRY_BACKOFF_BASE: float = 0.05
+    REDIS_RETRY_BACKOFF_CAP: float = 1.0
+    # The rate limiter's pool is synchronous and used on the event loop,
+    # slowapi has no async storage. It waits very little for a free
+    # connection or a reply and does not retry, on a timeout the limiter
+    # falls back to per-process in-memory limits
+    REDIS_LIMITER_POOL_TIMEOUT: float = 0.05
+    REDIS_LIMITER_SOCKET_TIMEOUT: float = 0.1
+
     @property
     def redis_url(self) -> str:
         return str(
@@ -6,6 +6,8 @@ from .components import (
     SecuritySettings,
     OAuthSettings,
     AzureStorageSettings,
+    TracingSettings,
+    LoggingSettings,
 )
 from .dbs import MongoDBSettings, PostgresSQLSettings, RedisSettings
 
@@ -18,6 +20,8 @@ class Settings(
     OAuthSettings,
     APISettings,
     MongoDBSettings,
+    TracingSettings,
+    LoggingSettings,
 ):
     pass
 
@@ -30,6 +34,7 @@ class DevelopmentSettings(Settings):
     )
 
     DEBUG: bool = True
+    LOG_JSON: bool = False
 
 
 class ProductionSettings(Settings, AzureStorageSettings):
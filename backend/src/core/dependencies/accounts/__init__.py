@@ -6,5 +6,5 @@ from .auth import (
     get_user_service,
 )
 from .oauth import get_oauth_manager, get_oauth_service
-from .profile import get_profile_service
+from .profile import get_profile_service, get_profile_read_service
 from .token_manager import get_jwt_manager
@@ -4,7 +4,7 @@ from fastapi import Request, HTTPException, Depends
 from jwt import PyJWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.adapters.postgres.async_db import get_db
+from src.adapters.postgres.async_db import get_db, release_connection
 from src.adapters.postgres.models import UserModel
 from src.adapters.postgres.repositories import UserRepository, TokenRepository
 from src.core.config import Settings, get_settings
@@ -15,6 +15,8 @@ from src.features.auth import (
     UserServiceInterface,
     UserService,
 )
+from src.middleware.request_id import set_user_id
+from src.middleware.server_timing import enable_server_timing
 from .repositories import (
     get_user_repo,
     get_refresh_token_repo,
@@ -61,7 +63,11 @@ async def get_current_user(
         raise HTTPException(
             status_code=403, detail="User account is not activated"
         )
+    await release_connection(db)
 
+    if user.is_admin:
+        enable_server_timing()
+    set_user_id(user.id)
     request.state.current_user = user
     return user
 
@@ -80,6 +86,7 @@ async def is_admin(
             status_code=403,
             detail="Access denied. Admin privileges required.",
         )
+    enable_server_timing()
 
 
 def get_auth_service(
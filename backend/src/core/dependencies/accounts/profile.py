@@ -8,7 +8,7 @@ from src.adapters.postgres.repositories import UserProfileRepository
 from src.adapters.storage import StorageInterface
 from src.features.profile import ProfileServiceInterface, ProfileService
 from .repositories import get_profile_repo
-from ..infrastructure import get_storage
+from ..infrastructure import get_storage, get_read_db
 
 
 def get_profile_service(
@@ -17,3 +17,10 @@ def get_profile_service(
     profile_repo: Annotated[UserProfileRepository, Depends(get_profile_repo)],
 ) -> ProfileServiceInterface:
     return ProfileService(db, storage, profile_repo)
+
+
+def get_profile_read_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    storage: Annotated[StorageInterface, Depends(get_storage)],
+) -> ProfileServiceInterface:
+    return ProfileService(db, storage, UserProfileRepository(db))
@@ -7,12 +7,12 @@ from src.adapters.postgres.async_db import get_db
 from src.adapters.postgres.models import (
     ActivationTokenModel,
     PasswordResetTokenModel,
-    RefreshTokenModel,
 )
 from src.adapters.postgres.repositories import (
     UserRepository,
     UserProfileRepository,
     TokenRepository,
+    RefreshTokenRepository,
 )
 
 db_param = Annotated[AsyncSession, Depends(get_db)]
@@ -40,5 +40,5 @@ async def get_password_reset_token_repo(
 
 async def get_refresh_token_repo(
     db: db_param,
-) -> TokenRepository[RefreshTokenModel]:
-    return TokenRepository(db, RefreshTokenModel)
+) -> RefreshTokenRepository:
+    return RefreshTokenRepository(db)
@@ -1,3 +1,4 @@
+from .database import get_read_db
 from .email import get_email_sender
 from .redis import get_redis_client
 from .storage import get_storage
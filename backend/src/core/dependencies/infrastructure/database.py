@@ -0,0 +1,24 @@
+from typing import Annotated, AsyncGenerator
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.postgres import async_db
+from src.adapters.postgres.async_db import get_db
+from src.adapters.postgres.routing import prefer_primary
+
+
+async def get_read_db(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    # Falls back to the request's primary session when no replica is
+    # configured or the client is inside its read-after-write window
+    if async_db.ReadSessionLocal is None or prefer_primary():
+        yield db
+        return
+
+    read_db = async_db.ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        await read_db.close()
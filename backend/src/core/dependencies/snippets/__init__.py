@@ -1,5 +1,7 @@
 from .snippets import (
     get_snippet_service,
+    get_snippet_read_service,
     get_search_service,
     get_favorites_service,
+    get_favorites_read_service,
 )
@@ -8,6 +8,7 @@ from src.adapters.postgres.async_db import get_db
 from src.adapters.postgres.repositories import (
     SnippetRepository,
     FavoritesRepository,
+    SnippetFeedRepository,
 )
 
 db_param = Annotated[AsyncSession, Depends(get_db)]
@@ -21,5 +22,9 @@ def get_snippet_doc_repo() -> SnippetDocumentRepository:
     return SnippetDocumentRepository()
 
 
+def get_snippet_feed_repo(db: db_param) -> SnippetFeedRepository:
+    return SnippetFeedRepository(db)
+
+
 def get_favorites_repo(db: db_param) -> FavoritesRepository:
     return FavoritesRepository(db)
@@ -9,6 +9,7 @@ from src.adapters.postgres.async_db import get_db
 from src.adapters.postgres.repositories import (
     SnippetRepository,
     FavoritesRepository,
+    SnippetFeedRepository,
 )
 from src.features.snippets import (
     SnippetServiceInterface,
@@ -22,8 +23,9 @@ from .repositories import (
     get_snippet_repo,
     get_snippet_doc_repo,
     get_favorites_repo,
+    get_snippet_feed_repo,
 )
-from ..infrastructure import get_redis_client
+from ..infrastructure import get_redis_client, get_read_db
 
 
 def get_snippet_service(
@@ -32,8 +34,29 @@ def get_snippet_service(
     doc_repo: Annotated[
         SnippetDocumentRepository, Depends(get_snippet_doc_repo)
     ],
+    feed_repo: Annotated[
+        SnippetFeedRepository, Depends(get_snippet_feed_repo)
+    ],
+    favorites_repo: Annotated[
+        FavoritesRepository, Depends(get_favorites_repo)
+    ],
+) -> SnippetServiceInterface:
+    return SnippetService(db, model_repo, doc_repo, feed_repo, favorites_repo)
+
+
+def get_snippet_read_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    doc_repo: Annotated[
+        SnippetDocumentRepository, Depends(get_snippet_doc_repo)
+    ],
 ) -> SnippetServiceInterface:
-    return SnippetService(db, model_repo, doc_repo)
+    return SnippetService(
+        db,
+        SnippetRepository(db),
+        doc_repo,
+        SnippetFeedRepository(db),
+        FavoritesRepository(db),
+    )
 
 
 def get_favorites_service(
@@ -46,9 +69,17 @@ def get_favorites_service(
     return FavoritesService(db, repo, doc_repo)
 
 
+def get_favorites_read_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    doc_repo: Annotated[
+        SnippetDocumentRepository, Depends(get_snippet_doc_repo)
+    ],
+) -> FavoritesServiceInterface:
+    return FavoritesService(db, FavoritesRepository(db), doc_repo)
+
+
 def get_search_service(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     redis_client: Annotated[Redis, Depends(get_redis_client)],
-    repo: Annotated[SnippetRepository, Depends(get_snippet_repo)],
 ) -> SnippetSearchServiceInterface:
-    return SnippetSearchService(db, redis_client, repo)
+    return SnippetSearchService(db, redis_client, SnippetRepository(db))
@@ -51,16 +51,16 @@ class EmailSenderManager(EmailSenderInterface):
                 timeout=10.0,
             )
         except aiosmtplib.SMTPAuthenticationError as e:
-            logger.error(f"SMTP auth failed: {e}")
+            logger.error("SMTP auth failed: %s", e)
             raise
         except aiosmtplib.SMTPRecipientsRefused as e:
-            logger.warning(f"Recipient refused: {e.recipients}")
+            logger.warning("Recipient refused: %s", e.recipients)
             raise
         except (aiosmtplib.SMTPConnectError, OSError, TimeoutError) as e:
-            logger.error(f"SMTP connection error: {e}")
+            logger.error("SMTP connection error: %s", e)
             raise
         except aiosmtplib.SMTPException as e:
-            logger.error(f"SMTP general error: {e}")
+            logger.error("SMTP general error: %s", e)
             raise
 
     async def send_activation_email(self, email: str, token: str) -> None:
@@ -11,4 +11,5 @@ from .exceptions import (
     NoPermissionError,
     ProfileNotFoundError,
     FavoritesAlreadyError,
+    ProfilerBusyError,
 )
@@ -44,3 +44,7 @@ class ProfileNotFoundError(Exception):
 
 class FavoritesAlreadyError(Exception):
     pass
+
+
+class ProfilerBusyError(Exception):
+    pass
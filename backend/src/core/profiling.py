@@ -0,0 +1,178 @@
+"""
+Sampling profiler for a live worker.
+
+A background thread reads the stack of every thread with
+sys._current_frames() at a fixed interval and counts identical stacks.
+Nothing is hooked into the interpreter, the profiled code runs
+unchanged and the cost is one stack walk per thread per sample, so it
+can be pointed at a production worker. Output is the collapsed stack
+format read by flamegraph.pl, speedscope and inferno:
+
+    MainThread;task Task-12;run (uvicorn/server.py:68);... 42
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter
+from time import monotonic
+from types import FrameType
+from typing import Optional
+
+from src.core.exceptions import ProfilerBusyError
+
+# Deeper stacks are cut at the root side, the leaf frames matter most
+MAX_STACK_DEPTH = 128
+
+# Leaf frames of a thread that is waiting, not working
+_IDLE_FRAMES = frozenset(
+    {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),
+    }
+)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    # Shorten site-packages and repo paths to module-ish paths
+    for marker in ("site-packages/", "/src/"):
+        index = path.rfind(marker)
+        if index != -1:
+            path = path[index + len(marker) :]
+            break
+    return f"{code.co_name} ({path}:{frame.f_lineno})"
+
+
+def _is_idle(frame: FrameType) -> bool:
+    code = frame.f_code
+    return (
+        os.path.basename(code.co_filename),
+        code.co_name,
+    ) in _IDLE_FRAMES
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        interval: float,
+        include_idle: bool = False,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        loop_thread_id: Optional[int] = None,
+    ) -> None:
+        """
+        :param interval: Seconds between samples
+        :type interval: float
+        :param include_idle: Keep samples of threads waiting for work
+        :type include_idle: bool
+        :param loop: Event loop whose running task is added to stacks
+        :type loop: Optional[asyncio.AbstractEventLoop]
+        :param loop_thread_id: Thread the event loop runs in
+        :type loop_thread_id: Optional[int]
+        """
+        self._interval = interval
+        self._include_idle = include_idle
+        self._loop = loop
+        self._loop_thread_id = loop_thread_id
+        self._stopped = threading.Event()
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    def _thread_root(self, thread_id: int, names: dict[int, str]) -> str:
+        root = names.get(thread_id, f"thread-{thread_id}")
+        if self._loop is not None and thread_id == self._loop_thread_id:
+            task = asyncio.current_task(self._loop)
+            if task is not None:
+                root = f"{root};task {task.get_name()}"
+        return root
+
+    def sample(self) -> None:
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate() if t.ident}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if not self._include_idle and _is_idle(frame):
+                continue
+
+            labels = []
+            current: Optional[FrameType] = frame
+            while current is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(current))
+                current = current.f_back
+            labels.append(self._thread_root(thread_id, names))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def run(self, duration: float) -> None:
+        """Sample the process for duration seconds, blocking the caller."""
+        deadline = monotonic() + duration
+        next_sample = monotonic()
+        while next_sample < deadline and not self._stopped.is_set():
+            self.sample()
+            next_sample += self._interval
+            # Skip missed ticks instead of bursting to catch up
+            delay = next_sample - monotonic()
+            if delay > 0:
+                self._stopped.wait(delay)
+            else:
+                next_sample = monotonic()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+# One profile per process, parallel runs would skew each other
+_profile_lock = asyncio.Lock()
+
+
+async def profile_process(
+    duration: float, interval: float, include_idle: bool = False
+) -> SamplingProfiler:
+    """
+    Profile this worker for duration seconds without blocking the loop.
+
+    :param duration: Seconds to sample
+    :type duration: float
+    :param interval: Seconds between samples
+    :type interval: float
+    :param include_idle: Keep samples of threads waiting for work
+    :type include_idle: bool
+    :return: The finished profiler
+    :rtype: SamplingProfiler
+    :raises ProfilerBusyError: If a profile is already running
+    """
+    if _profile_lock.locked():
+        raise ProfilerBusyError("A profile is already running")
+    async with _profile_lock:
+        profiler = SamplingProfiler(
+            interval,
+            include_idle=include_idle,
+            loop=asyncio.get_running_loop(),
+            loop_thread_id=threading.get_ident(),
+        )
+        # A dedicated thread, the default executor may be saturated
+        # by the very work we want to see
+        thread = threading.Thread(
+            target=profiler.run,
+            args=(duration,),
+            name="snippetly-profiler",
+            daemon=True,
+        )
+        thread.start()
+        try:
+            while thread.is_alive():
+                await asyncio.sleep(min(interval * 10, 0.1))
+        finally:
+            # The request may be cancelled, the thread must not outlive it
+            profiler.stop()
+        return profiler
@@ -1,2 +1,2 @@
 from .password import hash_password, verify_password
-from .utils import generate_secure_token
+from .utils import generate_secure_token, hash_token
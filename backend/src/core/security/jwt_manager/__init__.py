@@ -1,2 +1,3 @@
 from .interface import JWTAuthInterface
 from .jwt_manager import JWTAuthManager
+from .factory import get_jwt_auth_manager
@@ -0,0 +1,41 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from src.core.config.components import SecuritySettings
+from .jwt_manager import JWTAuthManager, ASYMMETRIC_ALGORITHMS
+
+_jwt_manager: Optional[JWTAuthManager] = None
+
+
+def get_jwt_auth_manager(
+    settings: SecuritySettings, redis_client: Redis
+) -> JWTAuthManager:
+    global _jwt_manager
+    # close_redis_client drops the client it closes, a manager holding
+    # that client after a lifespan restart would fail every check. The
+    # keys are prepared again only when the client changes
+    if _jwt_manager is None or _jwt_manager.redis_client is not redis_client:
+        private_key = public_key = None
+        if settings.ALGORITHM in ASYMMETRIC_ALGORITHMS:
+            if not (
+                settings.JWT_PRIVATE_KEY_PATH and settings.JWT_PUBLIC_KEY_PATH
+            ):
+                raise ValueError(
+                    f"JWT_PRIVATE_KEY_PATH and JWT_PUBLIC_KEY_PATH are "
+                    f"required for {settings.ALGORITHM}"
+                )
+            private_key = settings.JWT_PRIVATE_KEY_PATH.read_bytes()
+            public_key = settings.JWT_PUBLIC_KEY_PATH.read_bytes()
+
+        _jwt_manager = JWTAuthManager(
+            redis_client=redis_client,
+            secret_key_access=settings.SECRET_KEY_ACCESS,
+            secret_key_refresh=settings.SECRET_KEY_REFRESH,
+            algorithm=settings.ALGORITHM,
+            refresh_token_life=settings.REFRESH_TOKEN_LIFE,
+            access_token_life=settings.ACCESS_TOKEN_LIFE_MINUTES,
+            private_key=private_key,
+            public_key=public_key,
+        )
+    return _jwt_manager
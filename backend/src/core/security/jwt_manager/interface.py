@@ -3,16 +3,34 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.adapters.redis import RedisUnitOfWork
+
 
 class JWTAuthInterface(ABC):
     @abstractmethod
-    async def create_access_token(self, user_data: dict) -> str:
+    def unit_of_work(self) -> RedisUnitOfWork:
+        """
+        Create a Redis unit of work bound to the manager's client.
+
+        :return: Unit of work that flushes staged commands
+                in a single pipeline
+        :rtype: RedisUnitOfWork
+        """
+        pass
+
+    @abstractmethod
+    async def create_access_token(
+        self, user_data: dict, uow: Optional[RedisUnitOfWork] = None
+    ) -> str:
         """
         Generate a JWT access token for a user.
 
         :param user_data: Dictionary containing user information
                 (id, username, email, is_admin)
         :type user_data: dict
+        :param uow: Unit of work to stage the Redis write in instead
+                of executing it immediately
+        :type uow: RedisUnitOfWork | None
         :return: JWT access token string
         :rtype: str
         """
@@ -88,7 +106,9 @@ class JWTAuthInterface(ABC):
         pass
 
     @abstractmethod
-    async def add_to_blacklist(self, jti: str, exp: int) -> None:
+    async def add_to_blacklist(
+        self, jti: str, exp: int, uow: Optional[RedisUnitOfWork] = None
+    ) -> None:
         """
         Add an access token JTI to the Redis blacklist until its expiration.
 
@@ -96,6 +116,9 @@ class JWTAuthInterface(ABC):
         :type jti: str
         :param exp: Unix timestamp when token expires
         :type exp: int
+        :param uow: Unit of work to stage the Redis write in instead
+                of executing it immediately
+        :type uow: RedisUnitOfWork | None
         :return: None
         :rtype: None
         """
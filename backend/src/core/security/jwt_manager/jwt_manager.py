@@ -3,21 +3,30 @@ from datetime import timedelta, datetime, timezone
 from typing import Optional, cast
 
 import jwt
+from cryptography.hazmat.primitives import serialization
 from pydantic import SecretStr
-from redis import RedisError
 from redis.asyncio.client import Redis
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.core.exceptions as exc
-from src.adapters.postgres.models import RefreshTokenModel
-from src.adapters.postgres.repositories import UserRepository, TokenRepository
+from src.adapters.postgres.repositories import (
+    UserRepository,
+    RefreshTokenRepository,
+)
+from src.adapters.redis import RedisUnitOfWork
 from src.adapters.redis import blacklist as redis_blacklist
 from src.adapters.redis import common as redis_common
 from src.core.utils.logger import logger
+from src.middleware.server_timing import timed_phase
 from .interface import JWTAuthInterface
 
 
+ASYMMETRIC_ALGORITHMS = frozenset({"EdDSA", "ES256"})
+
+_UNVERIFIED_OPTIONS = {"verify_signature": False, "verify_exp": False}
+
+
 class JWTAuthManager(JWTAuthInterface):
     def __init__(
         self,
@@ -27,27 +36,76 @@ class JWTAuthManager(JWTAuthInterface):
         algorithm: str,
         refresh_token_life: int,
         access_token_life: int,
+        private_key: Optional[bytes] = None,
+        public_key: Optional[bytes] = None,
     ):
         self._redis_client = redis_client
-        self._secret_key_access = secret_key_access.get_secret_value()
-        self._secret_key_refresh = secret_key_refresh.get_secret_value()
         self._algorithm = algorithm
         self._refresh_token_life = timedelta(days=refresh_token_life)
         self._access_token_life = timedelta(minutes=access_token_life)
 
-    def __create_token(self, data: dict, secret_key: str) -> str:
-        encoded_jwt = jwt.encode(data, secret_key, algorithm=self._algorithm)
-        return encoded_jwt
+        # Keys are prepared once so PEM parsing and str -> bytes
+        # conversion don't happen on every encode/decode
+        if algorithm in ASYMMETRIC_ALGORITHMS:
+            if private_key is None or public_key is None:
+                raise ValueError(
+                    f"{algorithm} requires both a private and a public key"
+                )
+            algorithm_obj = jwt.get_algorithm_by_name(algorithm)
+            self._signing_key_access = algorithm_obj.prepare_key(private_key)
+            self._verifying_key_access = algorithm_obj.prepare_key(public_key)
+            # Refresh tokens never leave the API, they stay on HMAC
+            self._refresh_algorithm = "HS256"
+        else:
+            secret = secret_key_access.get_secret_value().encode()
+            self._signing_key_access = secret
+            self._verifying_key_access = secret
+            self._refresh_algorithm = algorithm
+
+        self._secret_key_refresh = (
+            secret_key_refresh.get_secret_value().encode()
+        )
+        self._access_algorithms = [algorithm]
+        self._refresh_algorithms = [self._refresh_algorithm]
+        self._decode_algorithms = list(
+            dict.fromkeys((algorithm, self._refresh_algorithm))
+        )
+        self._jwt = jwt.PyJWT()
+
+    @property
+    def redis_client(self) -> Redis:
+        return self._redis_client
+
+    @property
+    def public_key(self) -> Optional[bytes]:
+        if self._algorithm not in ASYMMETRIC_ALGORITHMS:
+            return None
+        return self._verifying_key_access.public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+
+    def __create_token(self, data: dict, is_refresh: bool = False) -> str:
+        if is_refresh:
+            return self._jwt.encode(
+                data,
+                self._secret_key_refresh,
+                algorithm=self._refresh_algorithm,
+            )
+        return self._jwt.encode(
+            data, self._signing_key_access, algorithm=self._algorithm
+        )
 
     def __parse_user_data(self, user_data: dict, exp_delta: timedelta) -> dict:
+        now = datetime.now(timezone.utc)
         return {
             "sub": str(user_data["id"]),
             "user_id": user_data["id"],
             "username": user_data["username"],
             "email": user_data["email"],
             "is_admin": user_data["is_admin"],
-            "iat": datetime.now(timezone.utc),
-            "exp": datetime.now(timezone.utc) + exp_delta,
+            "iat": now,
+            "exp": now + exp_delta,
             "jti": self.__generate_jti(),
         }
 
@@ -55,28 +113,43 @@ class JWTAuthManager(JWTAuthInterface):
     def __generate_jti(length: int = 16) -> str:
         return secrets.token_hex(length)
 
+    def unit_of_work(self) -> RedisUnitOfWork:
+        return RedisUnitOfWork(self._redis_client)
+
     async def is_blacklisted(self, jti: str) -> bool:
         return await redis_blacklist.is_blacklisted(self._redis_client, jti)
 
     def decode_token(self, token: str) -> Optional[dict]:
         try:
-            payload = jwt.decode(
+            payload = self._jwt.decode(
                 token,
-                options={"verify_signature": False, "verify_exp": False},
-                algorithms=[self._algorithm],
+                options=_UNVERIFIED_OPTIONS,
+                algorithms=self._decode_algorithms,
             )
             return cast(dict, payload)
         except jwt.PyJWTError:
             return None
 
-    async def add_to_blacklist(self, jti: str, exp: int) -> None:
+    async def add_to_blacklist(
+        self, jti: str, exp: int, uow: Optional[RedisUnitOfWork] = None
+    ) -> None:
+        if uow is not None:
+            redis_blacklist.stage_add_to_blacklist(uow, jti, exp)
+            return
         await redis_blacklist.add_to_blacklist(self._redis_client, jti, exp)
 
-    async def create_access_token(self, user_data: dict) -> str:
+    async def create_access_token(
+        self, user_data: dict, uow: Optional[RedisUnitOfWork] = None
+    ) -> str:
         payload = self.__parse_user_data(user_data, self._access_token_life)
-        token = self.__create_token(payload, self._secret_key_access)
+        token = self.__create_token(payload)
         ttl = int(self._access_token_life.total_seconds())
         jti = payload["jti"]
+        if uow is not None:
+            redis_common.stage_save_access_token(
+                uow, jti, user_data["id"], ttl
+            )
+            return token
         await redis_common.save_access_token(
             self._redis_client, jti, user_data["id"], ttl
         )
@@ -84,38 +157,48 @@ class JWTAuthManager(JWTAuthInterface):
 
     def create_refresh_token(self, user_data: dict) -> str:
         payload = self.__parse_user_data(user_data, self._refresh_token_life)
-        return self.__create_token(payload, self._secret_key_refresh)
-
-    async def verify_token(self, token: str, is_refresh: bool = False) -> dict:
-        key = (
-            self._secret_key_refresh if is_refresh else self._secret_key_access
-        )
+        return self.__create_token(payload, is_refresh=True)
+
+    def __decode_verified(self, token: str, is_refresh: bool) -> dict:
+        if is_refresh:
+            key = self._secret_key_refresh
+            algorithms = self._refresh_algorithms
+        else:
+            key = self._verifying_key_access
+            algorithms = self._access_algorithms
         try:
-            payload = jwt.decode(token, key=key, algorithms=[self._algorithm])
+            payload = self._jwt.decode(token, key=key, algorithms=algorithms)
         except jwt.ExpiredSignatureError as e:
             raise jwt.InvalidTokenError("Token has expired") from e
         except jwt.InvalidTokenError as e:
             raise jwt.InvalidTokenError("Invalid token") from e
 
-        jti = payload.get("jti")
-        if not jti:
+        if not payload.get("jti"):
             logger.error("Token missing jti claim")
             raise jwt.InvalidTokenError("Invalid token")
 
-        if await self.is_blacklisted(jti):
+        return cast(dict, payload)
+
+    async def verify_token(self, token: str, is_refresh: bool = False) -> dict:
+        with timed_phase("auth"):
+            payload = self.__decode_verified(token, is_refresh)
+            blacklisted = await self.is_blacklisted(payload["jti"])
+
+        if blacklisted:
             logger.error("Token is blacklisted")
             raise jwt.InvalidTokenError("Invalid token")
 
-        return cast(dict, payload)
+        return payload
 
     async def refresh_tokens(
         self, db: AsyncSession, refresh_token: str
     ) -> dict:
         user_repo = UserRepository(db)
         try:
-            payload = await self.verify_token(
-                token=refresh_token, is_refresh=True
-            )
+            with timed_phase("auth"):
+                payload = self.__decode_verified(
+                    refresh_token, is_refresh=True
+                )
         except jwt.InvalidTokenError as e:
             raise exc.AuthenticationError("Invalid refresh token") from e
 
@@ -130,54 +213,42 @@ class JWTAuthManager(JWTAuthInterface):
             "is_admin": user.is_admin,
         }
 
-        new_access_token = await self.create_access_token(user_data)
+        # The blacklist check and the new access token record share one
+        # pipeline. If the refresh token turns out to be revoked the new
+        # token is never returned and its record simply expires.
+        with timed_phase("auth"):
+            async with self.unit_of_work() as uow:
+                blacklisted = redis_blacklist.stage_is_blacklisted(
+                    uow, payload["jti"]
+                )
+                new_access_token = await self.create_access_token(
+                    user_data, uow
+                )
+
+        if blacklisted.result():
+            logger.error("Token is blacklisted")
+            raise exc.AuthenticationError("Invalid refresh token")
 
         return {"access_token": new_access_token}
 
     async def revoke_all_user_tokens(
         self, db: AsyncSession, user_id: int
     ) -> None:
-        refresh_repo = TokenRepository(db, RefreshTokenModel)
-
-        tokens = await refresh_repo.list_by_user(user_id)
-
-        for t in tokens:
-            payload = self.decode_token(t.token)
-            if (
-                payload
-                and payload.get("jti")
-                and payload.get("exp") is not None
-            ):
-                try:
-                    await self.add_to_blacklist(
-                        payload["jti"], int(payload["exp"])
-                    )
-                except RedisError:
-                    pass
+        refresh_repo = RefreshTokenRepository(db)
 
         try:
-            await refresh_repo.delete_by_user_id(user_id)
+            revoked = await refresh_repo.delete_by_user_id_returning(user_id)
             await db.commit()
         except SQLAlchemyError:
             await db.rollback()
             raise
 
-        keys = await self._redis_client.keys("access:*")
-        for key in keys:
-            jti = key.split("access:")[1]
-
-            token_user_id = await redis_common.get_access_token(
-                self._redis_client, jti
-            )
-            if token_user_id is not None:
-                token_user_id = (
-                    token_user_id.decode()
-                    if isinstance(token_user_id, bytes)
-                    else token_user_id
-                )
-
-            if token_user_id == str(user_id):
-                ttl = await self._redis_client.ttl(key)
-                if ttl > 0:
-                    exp = int(datetime.now(timezone.utc).timestamp()) + ttl
-                    await self.add_to_blacklist(jti, exp)
+        # One pipeline, the access tokens are read and blacklisted by a
+        # script in the same exchange as the refresh token writes
+        async with self.unit_of_work() as uow:
+            for jti, expires_at in revoked:
+                if jti is not None:
+                    redis_blacklist.stage_add_to_blacklist(
+                        uow, jti, int(expires_at.timestamp())
+                    )
+            redis_common.stage_revoke_user_access_tokens(uow, user_id)
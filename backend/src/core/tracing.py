@@ -0,0 +1,164 @@
+"""
+Optional OpenTelemetry tracing.
+
+Off unless TRACING_ENABLED is set, and then it needs the "tracing"
+dependency group (uv sync --group tracing). Without the packages the
+app logs a warning and runs untraced.
+
+Sampling is head-based: the root span, an API request or a task
+started by beat, is kept with TRACING_SAMPLE_RATE probability. Every
+span below it, including the Celery tasks a request enqueues, follows
+that decision through the propagated parent context, so a trace is
+either complete or absent.
+"""
+
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from sqlalchemy.engine import Engine
+
+from src.core.config import Settings
+from src.core.utils.logger import logger
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+    from opentelemetry.sdk.trace.sampling import Sampler
+
+# Scrapes and probes would be most of the traces
+EXCLUDED_URLS = "/api/metrics,/api/health"
+
+_provider: Optional["TracerProvider"] = None
+_instrumentors: list[Any] = []
+
+
+def build_sampler(sample_rate: float) -> "Sampler":
+    from opentelemetry.sdk.trace.sampling import (
+        ParentBased,
+        TraceIdRatioBased,
+    )
+
+    return ParentBased(TraceIdRatioBased(sample_rate))
+
+
+def _instrument_libraries(
+    provider: "TracerProvider", engines: Sequence[Engine]
+) -> None:
+    from opentelemetry.instrumentation.aiohttp_client import (
+        AioHttpClientInstrumentor,
+    )
+    from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+    from opentelemetry.instrumentation.redis import RedisInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import (
+        SQLAlchemyInstrumentor,
+    )
+
+    sqlalchemy = SQLAlchemyInstrumentor()
+    sqlalchemy.instrument(engines=list(engines), tracer_provider=provider)
+    _instrumentors.append(sqlalchemy)
+
+    # Mongo listeners are registered globally and only picked up by
+    # clients created afterwards, tracing is set up before init_beanie
+    for instrumentor in (
+        PymongoInstrumentor(),
+        RedisInstrumentor(),
+        AioHttpClientInstrumentor(),
+        # Publishing side injects the trace context into the task
+        # headers, the worker side continues it
+        CeleryInstrumentor(),
+    ):
+        instrumentor.instrument(tracer_provider=provider)
+        _instrumentors.append(instrumentor)
+
+
+def setup_tracing(
+    settings: Settings,
+    service_name: str,
+    engines: Sequence[Engine] = (),
+    exporter: Optional["SpanExporter"] = None,
+) -> bool:
+    """
+    Install the tracer provider and instrument the client libraries.
+
+    Safe to call more than once, only the first call configures
+    anything. Returns whether tracing is active.
+
+    :param settings: Application settings
+    :type settings: Settings
+    :param service_name: service.name resource attribute
+    :type service_name: str
+    :param engines: SQLAlchemy (sync) engines to trace
+    :type engines: Sequence[Engine]
+    :param exporter: Span exporter, OTLP/gRPC to the collector by default
+    :type exporter: Optional[SpanExporter]
+    :return: True if tracing is active
+    :rtype: bool
+    """
+    global _provider
+    if _provider is not None:
+        return True
+    if not settings.TRACING_ENABLED:
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "TRACING_ENABLED is set but the OpenTelemetry packages are "
+            "not installed, install the tracing dependency group"
+        )
+        return False
+
+    if exporter is None:
+        exporter = OTLPSpanExporter(
+            endpoint=settings.TRACING_OTLP_ENDPOINT,
+            insecure=settings.TRACING_OTLP_INSECURE,
+        )
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=build_sampler(settings.TRACING_SAMPLE_RATE),
+    )
+    # Spans are exported in batches from a background thread, the
+    # request path only appends to a queue
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+
+    _instrument_libraries(provider, engines)
+    logger.info(
+        "Tracing enabled, sampling %.0f%% of traces to %s",
+        settings.TRACING_SAMPLE_RATE * 100,
+        settings.TRACING_OTLP_ENDPOINT,
+    )
+    return True
+
+
+def instrument_app(app: "FastAPI") -> None:
+    """Trace incoming requests of app, a no-op while tracing is off."""
+    if _provider is None:
+        return
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+    FastAPIInstrumentor.instrument_app(
+        app, tracer_provider=_provider, excluded_urls=EXCLUDED_URLS
+    )
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and remove the library instrumentation."""
+    global _provider
+    if _provider is None:
+        return
+    for instrumentor in reversed(_instrumentors):
+        instrumentor.uninstrument()
+    _instrumentors.clear()
+    _provider.shutdown()
+    _provider = None
@@ -1,14 +1,260 @@
+"""
+Logging pipeline.
+
+Every logger feeds a QueueHandler on the root logger. The calling
+thread, often the event loop, only runs the filters and puts the record
+on a queue. A QueueListener thread formats the records, JSON lines by
+default, and writes them to stdout, so a slow pipe never stalls a
+request.
+
+The filters run in the calling thread because that is where the
+request context lives. They attach the request id and user id to the
+record and drop repeats of noisy messages. A kept record then has its
+message rendered in the calling thread too, while its arguments still
+hold the values they had at the call. Pass values as arguments instead
+of f-strings, so records that are dropped never render:
+
+    logger.info("Synced %s rows", count)
+"""
+
+import copy
+import json
 import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from time import monotonic
+from typing import IO, Optional
+
+from src.core.config.components import LoggingSettings
+from src.middleware.request_id import get_request_id, get_user_id
+
+TEXT_FORMAT = "%(levelname)s\t| %(message)s\t| %(asctime)s"
+
+# Loggers whose handlers are replaced by the shared pipeline
+_ADOPTED_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# Attributes every LogRecord has, anything else came in through extra=
+_RECORD_ATTRIBUTES = frozenset(
+    logging.makeLogRecord({}).__dict__.keys()
+    | {"message", "asctime", "request_id", "user_id"}
+)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the request context onto the record before it is queued."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = get_request_id()
+        record.user_id = get_user_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps the first `initial` records of a message per window, then one
+    in every `thereafter`.
+
+    Records are grouped by logger, level and message template, so "Slow
+    query %s" is sampled as one message whatever its arguments. Only the
+    listed loggers are sampled and ERROR and above always pass. The next
+    kept record carries the number dropped before it as `sampled_out`.
+    """
+
+    def __init__(
+        self,
+        loggers: list[str],
+        initial: int,
+        thereafter: int,
+        window: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self._loggers = tuple(loggers)
+        # Logger name -> sampled, resolved once per name
+        self._sampled_names: dict[str, bool] = {}
+        self._initial = initial
+        self._thereafter = max(thereafter, 1)
+        self._window = window
+        # (logger, level, template) -> [window start, seen, dropped]
+        self._counters: dict[tuple, list] = {}
+        self._next_eviction = monotonic() + window
+
+    def _is_sampled(self, name: str) -> bool:
+        sampled = self._sampled_names.get(name)
+        if sampled is None:
+            sampled = self._sampled_names[name] = any(
+                name == logger or name.startswith(f"{logger}.")
+                for logger in self._loggers
+            )
+        return sampled
+
+    def _evict_expired(self, now: float) -> None:
+        # A message that stopped repeating, or an f-string that makes a
+        # new template per call, would otherwise keep its entry forever.
+        # A pending dropped count is kept for one more window
+        self._counters = {
+            key: counter
+            for key, counter in self._counters.items()
+            if now - counter[0]
+            < (self._window * 2 if counter[2] else self._window)
+        }
+        self._next_eviction = now + self._window
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR or not self._is_sampled(
+            record.name
+        ):
+            return True
+
+        now = monotonic()
+        if now >= self._next_eviction:
+            self._evict_expired(now)
+        key = (record.name, record.levelno, record.msg)
+        counter = self._counters.get(key)
+        if counter is None or now - counter[0] >= self._window:
+            dropped = counter[2] if counter else 0
+            counter = self._counters[key] = [now, 0, dropped]
+
+        counter[1] += 1
+        seen = counter[1]
+        if seen > self._initial and (
+            (seen - self._initial) % self._thereafter
+        ):
+            counter[2] += 1
+            return False
+
+        if counter[2]:
+            record.sampled_out = counter[2]
+            counter[2] = 0
+        return True
+
 
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": "%s.%03dZ"
+            % (
+                time.strftime(
+                    "%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)
+                ),
+                record.msecs,
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        user_id = getattr(record, "user_id", None)
+        if user_id is not None:
+            entry["user_id"] = user_id
 
-def setup_logger() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(levelname)s\t| %(message)s\t| %(asctime)s",
-        handlers=[
-            logging.StreamHandler(),
-        ],
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _LazyQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler formats the whole line here so the record can be
+        # pickled. This queue never leaves the process, so only the
+        # message is rendered now, before the caller can change the
+        # arguments. The line itself is built in the writer thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_handler: Optional[_LazyQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener(stream_handler: logging.Handler) -> None:
+    global _listener
+    assert _handler is not None
+    _listener = QueueListener(
+        _handler.queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def _restart_after_fork() -> None:
+    # Threads do not survive a fork, a prefork Celery child would
+    # queue records that nobody writes
+    if _handler is None or _listener is None:
+        return
+    _handler.queue = queue.SimpleQueue()
+    _start_listener(_listener.handlers[0])
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def setup_logger(
+    settings: LoggingSettings, stream: Optional[IO[str]] = None
+) -> None:
+    """
+    Route all logging through the queue pipeline.
+
+    Calling it again replaces the previous pipeline.
+
+    :param settings: Logging settings
+    :type settings: LoggingSettings
+    :param stream: Output stream, stdout by default
+    :type stream: Optional[IO[str]]
+    """
+    global _handler
+    shutdown_logger()
+
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    stream_handler.setFormatter(
+        JsonFormatter()
+        if settings.LOG_JSON
+        else logging.Formatter(TEXT_FORMAT)
     )
 
+    _handler = _LazyQueueHandler(queue.SimpleQueue())
+    # Sampling first, a dropped record costs nothing more
+    if settings.LOG_SAMPLED_LOGGERS:
+        _handler.addFilter(
+            SamplingFilter(
+                settings.LOG_SAMPLED_LOGGERS,
+                settings.LOG_SAMPLING_INITIAL,
+                settings.LOG_SAMPLING_THEREAFTER,
+            )
+        )
+    _handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+    root.addHandler(_handler)
+    for name in _ADOPTED_LOGGERS:
+        adopted = logging.getLogger(name)
+        adopted.handlers.clear()
+        adopted.propagate = True
+
+    _start_listener(stream_handler)
+
+
+def shutdown_logger() -> None:
+    """Write out the queued records and remove the pipeline."""
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+
 
 logger = logging.getLogger("snippetly")
@@ -77,6 +77,10 @@ class AuthService(AuthServiceInterface):
         self, refresh_token: str | None, access_token: str
     ) -> None:
         access_payload = self._jwt_manager.decode_token(access_token)
+        access_staged = False
+
+        # Both blacklist writes go out in a single pipeline
+        uow = self._jwt_manager.unit_of_work()
         if (
             access_payload
             and access_payload.get("jti")
@@ -84,7 +88,8 @@ class AuthService(AuthServiceInterface):
         ):
             jti = access_payload["jti"]
             exp = access_payload["exp"]
-            await self._jwt_manager.add_to_blacklist(jti, exp)
+            await self._jwt_manager.add_to_blacklist(jti, exp, uow)
+            access_staged = True
 
         if refresh_token:
             payload = self._jwt_manager.decode_token(refresh_token)
@@ -93,13 +98,21 @@ class AuthService(AuthServiceInterface):
                 and payload.get("jti")
                 and payload.get("exp") is not None
             ):
-                try:
-                    await self._jwt_manager.add_to_blacklist(
-                        payload["jti"],
-                        int(payload["exp"]),  # type: ignore[arg-type]
-                    )
-                except RedisError:
-                    pass
+                await self._jwt_manager.add_to_blacklist(
+                    payload["jti"],
+                    int(payload["exp"]),  # type: ignore[arg-type]
+                    uow,
+                )
+
+        try:
+            await uow.flush()
+        except RedisError:
+            # Failing to blacklist the refresh token alone is tolerated,
+            # it is deleted from the database below
+            if access_staged:
+                raise
+
+        if refresh_token:
             try:
                 await self._refresh_token_repo.delete(refresh_token)
                 await self._db.commit()
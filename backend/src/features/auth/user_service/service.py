@@ -38,14 +38,11 @@ class UserService(UserServiceInterface):
     async def register_user(
         self, email: str, username: str, password: str
     ) -> Tuple[UserModel, str]:
-        existing_user = await self._user_repo.get_by_email_or_username(
-            email, username
-        )
-        if existing_user:
-            if existing_user.email == email:
-                raise exc.UserAlreadyExistsError("This email is taken.")
-            if existing_user.username == username:
-                raise exc.UserAlreadyExistsError("This username is taken.")
+        taken = await self._user_repo.get_taken_field(email, username)
+        if taken == "email":
+            raise exc.UserAlreadyExistsError("This email is taken.")
+        if taken == "username":
+            raise exc.UserAlreadyExistsError("This username is taken.")
 
         profile_repo = UserProfileRepository(self._db)
         token = generate_secure_token()
@@ -59,7 +59,7 @@ class ProfileService(ProfileServiceInterface):
             await self._db.commit()
         except SQLAlchemyError:
             await self._db.rollback()
-            logger.error(f"Failed to delete avatar URL for user {user_id}")
+            logger.error("Failed to delete avatar URL for user %s", user_id)
             raise
         await self._delete_from_storage_with_retry(file_url)
 
@@ -73,13 +73,16 @@ class ProfileService(ProfileServiceInterface):
                 return
             except Exception as e:
                 logger.warning(
-                    f"Attempt {attempt}/{retries} failed to "
-                    f"delete {file_url}: {e}"
+                    "Attempt %s/%s failed to delete %s: %s",
+                    attempt,
+                    retries,
+                    file_url,
+                    e,
                 )
                 if attempt < retries:
                     await asyncio.sleep(delay)
         logger.error(
-            f"Failed to delete file {file_url} after {retries} attempts"
+            "Failed to delete file %s after %s attempts", file_url, retries
         )
 
     async def set_profile_avatar(
@@ -108,7 +111,7 @@ class ProfileService(ProfileServiceInterface):
             await self._db.commit()
         except SQLAlchemyError:
             await self._db.rollback()
-            logger.error(f"Failed to update avatar for user {user_id}")
+            logger.error("Failed to update avatar for user %s", user_id)
             raise
 
         if old_url:
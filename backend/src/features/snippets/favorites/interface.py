@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
 from fastapi.requests import Request
@@ -7,7 +7,11 @@ from fastapi.requests import Request
 from src.adapters.postgres.models import UserModel, LanguageEnum
 from src.api.v1.schemas.snippets import (
     GetSnippetsResponseSchema,
+    FavoritesBulkActionEnum,
+    FavoritesBulkResponseSchema,
     FavoritesSortingEnum,
+    TagMatchEnum,
+    UsernameMatchEnum,
 )
 
 
@@ -42,6 +46,27 @@ class FavoritesServiceInterface(ABC):
                 SQLAlchemyError: If database error occurred
         """
 
+    @abstractmethod
+    async def bulk_update_favorites(
+        self,
+        user: UserModel,
+        uuids: Sequence[UUID],
+        action: FavoritesBulkActionEnum,
+    ) -> FavoritesBulkResponseSchema:
+        """
+        Method for adding or removing several Snippets at once
+
+        :param user: User requesting the change
+        :type: UserModel
+        :param uuids: UUIDs of SnippetModel
+        :type: Sequence[UUID]
+        :param action: Whether to add or remove the snippets
+        :type: FavoritesBulkActionEnum
+        :return: UUIDs split into changed, unchanged and not found
+        :rtype: FavoritesBulkResponseSchema
+        :raises SQLAlchemyError: If database error occurred
+        """
+
     @abstractmethod
     async def get_favorites(
         self,
@@ -53,6 +78,8 @@ class FavoritesServiceInterface(ABC):
         language: Optional[LanguageEnum] = None,
         tags: Optional[list[str]] = None,
         username: Optional[str] = None,
+        tag_mode: TagMatchEnum = TagMatchEnum.ANY,
+        username_mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY,
     ) -> GetSnippetsResponseSchema:
         """
         Method for getting favorite Snippets with pagination
@@ -73,6 +100,11 @@ class FavoritesServiceInterface(ABC):
         :type: list[str] | None
         :param username: Optional param snippet's author username
         :type: str | None
+        :param tag_mode: Match snippets having any or all of the tags
+        :type: TagMatchEnum
+        :param username_mode: Exact, prefix or substring (default) username
+            match
+        :type: UsernameMatchEnum
         :return: Schema of favorite snippets with pagination
         :rtype: GetSnippetsResponseSchema
         """
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy.exc import SQLAlchemyError
@@ -7,11 +7,16 @@ from starlette.requests import Request
 
 import src.core.exceptions as exc
 from src.adapters.mongo.repo import SnippetDocumentRepository
+from src.adapters.postgres.async_db import release_connection
 from src.adapters.postgres.models import UserModel, LanguageEnum
 from src.adapters.postgres.repositories import FavoritesRepository
 from src.api.v1.schemas.snippets import (
+    FavoritesBulkActionEnum,
+    FavoritesBulkResponseSchema,
     FavoritesSortingEnum,
     GetSnippetsResponseSchema,
+    TagMatchEnum,
+    UsernameMatchEnum,
 )
 from src.core.utils import Paginator
 from .interface import FavoritesServiceInterface
@@ -51,6 +56,36 @@ class FavoritesService(FavoritesServiceInterface):
             await self._db.rollback()
             raise
 
+    async def bulk_update_favorites(
+        self,
+        user: UserModel,
+        uuids: Sequence[UUID],
+        action: FavoritesBulkActionEnum,
+    ) -> FavoritesBulkResponseSchema:
+        if action == FavoritesBulkActionEnum.ADD:
+            toggle = self._repo.add_many_to_favorites
+        else:
+            toggle = self._repo.remove_many_from_favorites
+
+        try:
+            result = await toggle(user, uuids)
+            await self._db.commit()
+        except SQLAlchemyError:
+            await self._db.rollback()
+            raise
+
+        response = FavoritesBulkResponseSchema(
+            changed=[], unchanged=[], not_found=[]
+        )
+        for uuid in dict.fromkeys(uuids):
+            if uuid not in result:
+                response.not_found.append(uuid)
+            elif result[uuid]:
+                response.changed.append(uuid)
+            else:
+                response.unchanged.append(uuid)
+        return response
+
     async def get_favorites(
         self,
         request: Request,
@@ -61,19 +96,33 @@ class FavoritesService(FavoritesServiceInterface):
         language: Optional[LanguageEnum] = None,
         tags: Optional[list[str]] = None,
         username: Optional[str] = None,
+        tag_mode: TagMatchEnum = TagMatchEnum.ANY,
+        username_mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY,
     ) -> GetSnippetsResponseSchema:
         offset = self._paginator.calculate_offset(page, per_page)
 
         favorites, total = await self._repo.get_favorites_paginated(
-            offset, per_page, user_id, sort_by, language, tags, username
+            offset,
+            per_page,
+            user_id,
+            sort_by,
+            language,
+            tags,
+            username,
+            tag_mode,
+            username_mode,
         )
+        await release_connection(self._db)
 
         prev_page, next_page = self._paginator.build_links(
             request, page, per_page, total
         )
 
+        # Every snippet on this page is one of the user's favorites
         snippet_list = await SnippetDataMerger.merge_with_documents(
-            favorites, self._doc_repo
+            favorites,
+            self._doc_repo,
+            favorited_ids={snippet.id for snippet in favorites},
         )
 
         return GetSnippetsResponseSchema(
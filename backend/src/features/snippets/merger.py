@@ -1,14 +1,17 @@
-from typing import Sequence, Any
+from typing import Sequence, Any, Container
 
 from src.adapters.mongo.documents import SnippetDocument
 from src.adapters.mongo.repo import SnippetDocumentRepository
 from src.api.v1.schemas.snippets import SnippetListItemSchema
+from src.middleware.server_timing import timed_phase
 
 
 class SnippetDataMerger:
     @staticmethod
     async def merge_with_documents(
-        snippets: Sequence[Any], doc_repo: SnippetDocumentRepository
+        snippets: Sequence[Any],
+        doc_repo: SnippetDocumentRepository,
+        favorited_ids: Container[int] = frozenset(),
     ) -> list[SnippetListItemSchema]:
         mongo_ids = [
             snippet.mongodb_id for snippet in snippets if snippet.mongodb_id
@@ -17,22 +20,26 @@ class SnippetDataMerger:
         documents_map = {str(doc.id): doc for doc in documents}
 
         merged: list[SnippetListItemSchema] = []
-        for snippet in snippets:
-            document: SnippetDocument | None = documents_map.get(
-                snippet.mongodb_id
-            )
-            content = document.content if document else ""
-            description = document.description if document else ""
+        with timed_phase("serialize"):
+            for snippet in snippets:
+                document: SnippetDocument | None = documents_map.get(
+                    snippet.mongodb_id
+                )
+                content = document.content if document else ""
+                description = document.description if document else ""
 
-            merged.append(
-                SnippetListItemSchema(
-                    title=snippet.title,
-                    language=snippet.language,
-                    is_private=snippet.is_private,
-                    content=content,
-                    description=description,  # type: ignore
-                    uuid=snippet.uuid,
-                    tags=[tag.name for tag in snippet.tags],
+                merged.append(
+                    SnippetListItemSchema(
+                        title=snippet.title,
+                        language=snippet.language,
+                        is_private=snippet.is_private,
+                        content=content,
+                        description=description,  # type: ignore
+                        uuid=snippet.uuid,
+                        username=snippet.user.username,
+                        favorites_count=snippet.favorites_count,
+                        is_favorited=snippet.id in favorited_ids,
+                        tags=[tag.name for tag in snippet.tags],
+                    )
                 )
-            )
         return merged
@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.adapters.postgres.async_db import release_connection
 from src.adapters.postgres.repositories import SnippetRepository
 from src.api.v1.schemas.snippets import (
     SnippetSearchResponseSchema,
@@ -28,6 +29,7 @@ class SnippetSearchService(SnippetSearchServiceInterface):
             return SnippetSearchResponseSchema(**cached)
 
         snippets = await self._repo.get_by_title_list(title, user_id, limit)
+        await release_connection(self._db)
 
         snippet_list = []
         for snippet in snippets:  # type: ignore
@@ -11,6 +11,9 @@ from src.api.v1.schemas.snippets import (
     SnippetResponseSchema,
     GetSnippetsResponseSchema,
     SnippetUpdateRequestSchema,
+    SnippetSortingEnum,
+    TagMatchEnum,
+    UsernameMatchEnum,
 )
 
 
@@ -49,6 +52,9 @@ class SnippetServiceInterface(ABC):
         created_before: Optional[date],
         created_after: Optional[date],
         username: Optional[str],
+        tag_mode: TagMatchEnum = TagMatchEnum.ANY,
+        username_mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY,
+        sort_by: SnippetSortingEnum = SnippetSortingEnum.NEWEST,
     ) -> GetSnippetsResponseSchema:
         """
         Method that gets data from PostgreSQL & MongoDB and returns
@@ -74,13 +80,19 @@ class SnippetServiceInterface(ABC):
         :type: date | None
         :param username: Optional param - username
         :type: str | None
+        :param tag_mode: Match snippets having any or all of the tags
+        :type: TagMatchEnum
+        :param username_mode: Exact, prefix or substring (default) username
+            match
+        :type: UsernameMatchEnum
+        :param sort_by: Newest first or most favorited first
+        :type: SnippetSortingEnum
         :return: Snippets with pagination
         :rtype: GetSnippetsResponseSchema
         :raises SQLAlchemyError: If error occurred during SnippetModel get
         """
         pass
 
-    # TODO: total favorites
     @abstractmethod
     async def get_snippet_by_uuid(
         self, uuid: UUID, user: UserModel
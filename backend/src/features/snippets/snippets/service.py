@@ -4,29 +4,38 @@ from uuid import UUID
 
 from fastapi.requests import Request
 from pymongo.errors import PyMongoError
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.core.exceptions as exc
 from src.adapters.mongo.documents import SnippetDocument
 from src.adapters.mongo.repo import SnippetDocumentRepository
+from src.adapters.postgres.async_db import release_connection
 from src.adapters.postgres.models import (
     SnippetModel,
     UserModel,
     TagModel,
     LanguageEnum,
 )
-from src.adapters.postgres.repositories import SnippetRepository
+from src.adapters.postgres.repositories import (
+    SnippetRepository,
+    SnippetFeedRepository,
+    FavoritesRepository,
+)
 from src.api.v1.schemas.snippets import (
     SnippetCreateSchema,
     SnippetResponseSchema,
     GetSnippetsResponseSchema,
     SnippetUpdateRequestSchema,
+    SnippetListItemSchema,
+    SnippetSortingEnum,
+    TagMatchEnum,
+    UsernameMatchEnum,
 )
 from src.core.utils import Paginator
+from src.middleware.server_timing import timed_phase
 from .interface import SnippetServiceInterface
-from ..merger import SnippetDataMerger
 
 
 class SnippetService(SnippetServiceInterface):
@@ -35,16 +44,22 @@ class SnippetService(SnippetServiceInterface):
         db: AsyncSession,
         model_repo: SnippetRepository,
         doc_repo: SnippetDocumentRepository,
+        feed_repo: SnippetFeedRepository,
+        favorites_repo: FavoritesRepository,
     ):
         self._db = db
         self._doc_repo = doc_repo
         self._model_repo = model_repo
+        self._feed_repo = feed_repo
+        self._favorites_repo = favorites_repo
 
         self._paginator = Paginator
 
     @staticmethod
     def _build_snippet_response(
-        snippet: SnippetModel, document: SnippetDocument
+        snippet: SnippetModel,
+        document: SnippetDocument,
+        is_favorited: bool = False,
     ) -> SnippetResponseSchema:
         description = document.description if document else None
         content = document.content if document else None
@@ -52,6 +67,8 @@ class SnippetService(SnippetServiceInterface):
         return SnippetResponseSchema(
             uuid=cast(UUID, snippet.uuid),
             username=snippet.user.username,
+            favorites_count=snippet.favorites_count,
+            is_favorited=is_favorited,
             title=snippet.title,
             language=snippet.language,
             is_private=snippet.is_private,
@@ -93,6 +110,9 @@ class SnippetService(SnippetServiceInterface):
                 if hasattr(snippet, field) and value is not None:
                     setattr(snippet, field, value)
 
+            # Content lives in Mongo, a content-only edit still has to
+            # move updated_at or the feed sync never sees a lost upsert
+            snippet.updated_at = func.now()
             await self._db.flush()
             await self._db.commit()
             await self._db.refresh(snippet)
@@ -153,6 +173,10 @@ class SnippetService(SnippetServiceInterface):
                 user_id=data.user_id,
                 mongodb_id=document.id,
             )
+            await self._db.flush()
+            await self._feed_repo.upsert(
+                snippet_model.id, data.content, data.description
+            )
             await self._db.commit()
             await self._db.refresh(snippet_model)
         except SQLAlchemyError:
@@ -174,10 +198,13 @@ class SnippetService(SnippetServiceInterface):
         created_before: Optional[date],
         created_after: Optional[date],
         username: Optional[str],
+        tag_mode: TagMatchEnum = TagMatchEnum.ANY,
+        username_mode: UsernameMatchEnum = UsernameMatchEnum.FUZZY,
+        sort_by: SnippetSortingEnum = SnippetSortingEnum.NEWEST,
     ) -> GetSnippetsResponseSchema:
         try:
             offset = self._paginator.calculate_offset(page, per_page)
-            snippets, total = await self._model_repo.get_snippets_paginated(
+            snippets, total = await self._feed_repo.get_feed_paginated(
                 offset,
                 per_page,
                 current_user_id,
@@ -187,19 +214,37 @@ class SnippetService(SnippetServiceInterface):
                 created_before,
                 created_after,
                 username,
+                tag_mode,
+                username_mode,
+                sort_by,
             )
-
-            prev_page, next_page = self._paginator.build_links(
-                request, page, per_page, total
-            )
-
-            snippet_list = await SnippetDataMerger.merge_with_documents(
-                snippets,  # type: ignore
-                self._doc_repo,
+            favorited_ids = await self._favorites_repo.get_favorited_ids(
+                current_user_id, [snippet.snippet_id for snippet in snippets]
             )
+            await release_connection(self._db)
         except SQLAlchemyError:
             raise
 
+        prev_page, next_page = self._paginator.build_links(
+            request, page, per_page, total
+        )
+        with timed_phase("serialize"):
+            snippet_list = [
+                SnippetListItemSchema(
+                    uuid=cast(UUID, snippet.uuid),
+                    username=snippet.username,
+                    favorites_count=snippet.favorites_count,
+                    is_favorited=snippet.snippet_id in favorited_ids,
+                    title=snippet.title,
+                    language=snippet.language,
+                    is_private=snippet.is_private,
+                    content=snippet.content,
+                    description=snippet.description,
+                    tags=snippet.tags,
+                )
+                for snippet in snippets
+            ]
+
         return GetSnippetsResponseSchema(
             page=page,
             per_page=per_page,
@@ -226,6 +271,10 @@ class SnippetService(SnippetServiceInterface):
             raise exc.NoPermissionError(
                 "User have no permission to get snippet"
             )
+        favorited_ids = await self._favorites_repo.get_favorited_ids(
+            user.id, [snippet.id]
+        )
+        await release_connection(self._db)
 
         document = await self._doc_repo.get_by_id(snippet.mongodb_id)
 
@@ -234,7 +283,9 @@ class SnippetService(SnippetServiceInterface):
                 "Snippet with this UUID was not found"
             )
 
-        return self._build_snippet_response(snippet, document)
+        return self._build_snippet_response(
+            snippet, document, is_favorited=snippet.id in favorited_ids
+        )
 
     async def update_snippet(
         self, uuid: UUID, data: SnippetUpdateRequestSchema, user: UserModel
@@ -252,7 +303,23 @@ class SnippetService(SnippetServiceInterface):
         await self._update_sql_snippet(snippet, data)
         document = await self._update_mongo_document(snippet, data)
 
-        return self._build_snippet_response(snippet, document)
+        try:
+            await self._feed_repo.upsert(
+                snippet.id, document.content, document.description
+            )
+            # Read before the commit, a query after it would open a new
+            # transaction that holds a connection until the session ends
+            favorited_ids = await self._favorites_repo.get_favorited_ids(
+                user.id, [snippet.id]
+            )
+            await self._db.commit()
+        except SQLAlchemyError:
+            await self._db.rollback()
+            raise
+
+        return self._build_snippet_response(
+            snippet, document, is_favorited=snippet.id in favorited_ids
+        )
 
     async def delete_snippet(self, uuid: UUID, user: UserModel) -> None:
         snippet = await self._model_repo.get_by_uuid(uuid)
@@ -2,24 +2,39 @@
 Prometheus metrics middleware for FastAPI
 
 Tracks HTTP requests, response times, and custom application metrics.
+
+With several workers, set PROMETHEUS_MULTIPROC_DIR to a directory shared
+by them (and emptied on deploy). prometheus_client then keeps every
+value in per-process files and the metrics endpoint aggregates them, so
+a scrape reports the whole pod rather than the worker that answered.
 """
 
+import os
+import re
 from collections.abc import Callable
-from time import time
-import logging
+from time import perf_counter
 
 from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
     Counter,
     Histogram,
     Gauge,
     generate_latest,
+    multiprocess,
     CONTENT_TYPE_LATEST,
 )
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_PATH = "/api/metrics"
+
+# How often the metrics collector refreshes in-process pool gauges
+GAUGE_REFRESH_SECONDS = 5.0
 
-logger = logging.getLogger(__name__)
+# Label for requests no route matched (404s, 405s), kept as one series
+# so scanners probing random paths cannot grow the label set
+UNMATCHED_ENDPOINT = "<unmatched>"
 
 # HTTP Metrics
 http_requests_total = Counter(
@@ -49,122 +64,431 @@ http_request_duration_seconds = Histogram(
     ),
 )
 
+request_phase_seconds = Histogram(
+    "snippetly_request_phase_seconds",
+    "Time one request spent in a phase (db, mongo, redis, auth, serialize)",
+    ["phase"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+    ),
+)
+
+http_time_to_first_byte_seconds = Histogram(
+    "http_time_to_first_byte_seconds",
+    "Time until the response headers were sent in seconds",
+    ["method", "endpoint"],
+    buckets=(
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.075,
+        0.1,
+        0.25,
+        0.5,
+        0.75,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    ),
+)
+
+http_response_size_bytes = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes",
+    ["method", "endpoint"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+# The route is only known after routing, so in-flight requests are
+# counted by method alone
 http_requests_in_progress = Gauge(
     "http_requests_in_progress",
     "HTTP requests currently being processed",
-    ["method", "endpoint"],
+    ["method"],
+    multiprocess_mode="livesum",
 )
 
-# Application Metrics
+# Application Metrics, written only by the collector leader
 active_users = Gauge(
     "snippetly_active_users",
     "Number of active users (logged in last 24h)",
+    multiprocess_mode="mostrecent",
 )
 
 total_snippets = Gauge(
     "snippetly_total_snippets",
     "Total number of code snippets",
+    multiprocess_mode="mostrecent",
 )
 
 database_connections = Gauge(
     "snippetly_database_connections",
     "Number of active database connections",
     ["database"],
+    multiprocess_mode="livesum",
 )
 
+# Database Pool Metrics
+db_pool_checkout_seconds = Histogram(
+    "snippetly_db_pool_checkout_seconds",
+    "Time to check out a connection from the SQLAlchemy pool "
+    "(queue wait, connect and pre-ping)",
+    ["engine"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+    ),
+)
+
+db_pool_checked_out = Gauge(
+    "snippetly_db_pool_checked_out",
+    "Connections currently checked out of the SQLAlchemy pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_size = Gauge(
+    "snippetly_db_pool_size",
+    "Configured SQLAlchemy pool size (without overflow)",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
+# Database Query Metrics
+db_query_duration_seconds = Histogram(
+    "snippetly_db_query_duration_seconds",
+    "SQL statement execution time in seconds by statement fingerprint",
+    ["engine", "operation", "fingerprint"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+    ),
+)
+
+db_query_rows_total = Counter(
+    "snippetly_db_query_rows",
+    "Rows returned or affected by SQL statements",
+    ["engine", "operation", "fingerprint"],
+)
+
+# Mongo Metrics
+mongo_command_duration_seconds = Histogram(
+    "snippetly_mongo_command_duration_seconds",
+    "Mongo command round-trip duration in seconds",
+    ["command"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+    ),
+)
+
+mongo_command_failures_total = Counter(
+    "snippetly_mongo_command_failures",
+    "Mongo commands that returned an error",
+    ["command"],
+)
+
+mongo_pool_checkout_seconds = Histogram(
+    "snippetly_mongo_pool_checkout_seconds",
+    "Time to check out a connection from the Mongo pool "
+    "(queue wait and connection setup)",
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+    ),
+)
+
+mongo_pool_connections = Gauge(
+    "snippetly_mongo_pool_connections",
+    "Mongo pool connections by state",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+# Redis Metrics
+redis_pool_connections = Gauge(
+    "snippetly_redis_pool_connections",
+    "Redis pool connections by state",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+
+redis_pool_max_connections = Gauge(
+    "snippetly_redis_pool_max_connections",
+    "Configured Redis pool size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+redis_command_duration_seconds = Histogram(
+    "snippetly_redis_command_duration_seconds",
+    "Redis command round-trip duration in seconds",
+    ["command"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+    ),
+)
+
+event_loop_lag_seconds = Histogram(
+    "snippetly_event_loop_lag_seconds",
+    "How late a timer on the event loop fired, in seconds",
+    buckets=(
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+    ),
+)
+
+
+def get_route_template(scope: Scope) -> str:
     """
-    Middleware to track HTTP requests with Prometheus metrics.
+    Path template of the route that handled the request.
 
-    Tracks:
-    - Request count by method, endpoint, and status code
-    - Request duration histogram
-    - Requests in progress gauge
+    Examples:
+        /api/v1/snippets/<uuid> -> /api/v1/snippets/{uuid}
+        /static/css/app.css -> /static/{path}
     """
+    # Routing writes the matched route and mount root_path into the
+    # scope, so this is only meaningful once the app has run
+    root_path = scope.get("root_path", "")
+    mount_path = root_path[len(scope.get("app_root_path", root_path)) :]
+
+    route = scope.get("route")
+    if route is not None:
+        return mount_path + route.path
+    if mount_path:
+        return f"{mount_path}/{{path}}"
+    return UNMATCHED_ENDPOINT
 
-    async def dispatch(
-        self, request: Request, call_next: Callable
-    ) -> Response:
-        # Skip metrics endpoint itself to avoid recursion
-        if request.url.path == "/api/metrics":
-            return await call_next(request)
 
-        # Extract endpoint pattern (remove IDs and dynamic parts)
-        endpoint = self._get_endpoint_pattern(request)
-        method = request.method
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware to track HTTP requests with Prometheus metrics.
+
+    Tracks:
+    - Request count by method, route template, and status code
+    - Request duration and time to first byte histograms
+    - Response size histogram
+    - Requests in progress gauge
+    """
 
-        # Track request in progress
-        http_requests_in_progress.labels(
-            method=method, endpoint=endpoint
-        ).inc()
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        # Start timer
-        start_time = time()
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        # Skip metrics endpoint itself to avoid recursion
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+        time_to_first_byte = None
+
+        in_progress = http_requests_in_progress.labels(method=method)
+        in_progress.inc()
+        start_time = perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size, time_to_first_byte
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                time_to_first_byte = perf_counter() - start_time
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
 
         try:
-            # Process request
-            response = await call_next(request)
-
-            # Record metrics
-            duration = time() - start_time
-            status_code = response.status_code
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = perf_counter() - start_time
+            in_progress.dec()
 
+            endpoint = get_route_template(scope)
             http_requests_total.labels(
                 method=method, endpoint=endpoint, status_code=status_code
             ).inc()
-
             http_request_duration_seconds.labels(
                 method=method, endpoint=endpoint
             ).observe(duration)
+            if time_to_first_byte is not None:
+                http_time_to_first_byte_seconds.labels(
+                    method=method, endpoint=endpoint
+                ).observe(time_to_first_byte)
+                http_response_size_bytes.labels(
+                    method=method, endpoint=endpoint
+                ).observe(response_size)
+
+
+def get_multiprocess_dir() -> str | None:
+    return os.environ.get(
+        "PROMETHEUS_MULTIPROC_DIR", os.environ.get("prometheus_multiproc_dir")
+    )
 
-            return response
 
-        except Exception as e:
-            # Record error
-            http_requests_total.labels(
-                method=method, endpoint=endpoint, status_code=500
-            ).inc()
+# Per-process files of the "live" gauge modes, e.g. gauge_livesum_42.db
+_LIVE_GAUGE_FILE = re.compile(r"^gauge_live\w*_(\d+)\.db$")
 
-            logger.error(f"Request failed: {method} {endpoint} - {str(e)}")
-            raise
+_gauge_functions: list[tuple[Gauge, Callable[[], float]]] = []
 
-        finally:
-            # Decrement in-progress counter
-            http_requests_in_progress.labels(
-                method=method, endpoint=endpoint
-            ).dec()
 
-    def _get_endpoint_pattern(self, request: Request) -> str:
-        """
-        Extract endpoint pattern from request path.
+def set_gauge_function(gauge: Gauge, func: Callable[[], float]) -> None:
+    """
+    Bind a gauge to a callback, like Gauge.set_function.
 
-        Examples:
-            /api/v1/snippets/123 -> /api/v1/snippets/{id}
-            /api/v1/users/abc-def -> /api/v1/users/{id}
-        """
-        path = request.url.path
+    Multiprocess mode only exports values written to the worker files,
+    so there the callback is stored and evaluated by
+    refresh_gauge_functions (called by the metrics collector) instead.
+    """
+    if get_multiprocess_dir() is None:
+        gauge.set_function(func)
+    else:
+        _gauge_functions.append((gauge, func))
 
-        # Common patterns
-        patterns = [
-            ("/api/v1/snippets/", "/api/v1/snippets/{id}"),
-            ("/api/v1/users/", "/api/v1/users/{id}"),
-            ("/api/v1/auth/verify/", "/api/v1/auth/verify/{token}"),
-        ]
 
-        for prefix, pattern in patterns:
-            if path.startswith(prefix) and len(path) > len(prefix):
-                return pattern
+def refresh_gauge_functions() -> None:
+    for gauge, func in _gauge_functions:
+        gauge.set(func())
 
-        return path
+
+def mark_process_dead() -> None:
+    """
+    Drop the live gauge files of the current worker on exit.
+
+    Counters and histograms of dead workers are kept so totals never go
+    backwards, "live" gauge modes must not keep reporting its pools.
+    """
+    path = get_multiprocess_dir()
+    if path is not None:
+        multiprocess.mark_process_dead(os.getpid(), path)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        pass
+    return True
+
+
+def sweep_dead_processes() -> None:
+    """
+    Drop the live gauge files of workers that are no longer running.
+
+    mark_process_dead only runs on a clean shutdown, a crashed or killed
+    worker leaves its pools behind. Workers share the PID namespace of
+    the pod, so a file whose PID is gone belongs to a dead worker.
+    """
+    path = get_multiprocess_dir()
+    if path is None:
+        return
+    pids = {
+        int(match.group(1))
+        for name in os.listdir(path)
+        if (match := _LIVE_GAUGE_FILE.match(name))
+    }
+    for pid in pids:
+        if not _is_alive(pid):
+            multiprocess.mark_process_dead(pid, path)
 
 
 def metrics_endpoint() -> Response:
     """
     Prometheus metrics endpoint.
 
-    Returns metrics in Prometheus format for scraping.
+    Returns metrics in Prometheus format for scraping, aggregated over
+    all workers in multiprocess mode.
     """
+    path = get_multiprocess_dir()
+    if path is None:
+        registry = REGISTRY
+    else:
+        refresh_gauge_functions()
+        sweep_dead_processes()
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=path)
     return Response(
-        content=generate_latest(), media_type=CONTENT_TYPE_LATEST
+        content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST
     )
@@ -0,0 +1,59 @@
+"""
+Read-after-write routing for the Postgres read replica.
+
+A client that wrote to the primary gets a short-lived cookie, and reads
+go to the primary until it expires so replica lag is never observed.
+"""
+
+from time import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.adapters.postgres.routing import begin_read_routing, end_read_routing
+
+STICKY_COOKIE = "pg_primary_until"
+
+
+class ReadRoutingMiddleware:
+    def __init__(self, app: ASGIApp, sticky_seconds: int) -> None:
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        now = time()
+        state, token = begin_read_routing(self._sticky_until(scope) > now)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.wrote:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{STICKY_COOKIE}={int(now) + self.sticky_seconds}; "
+                    f"Max-Age={self.sticky_seconds}; Path=/; HttpOnly; "
+                    f"SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_read_routing(token)
+
+    @staticmethod
+    def _sticky_until(scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookies = cookie_parser(value.decode("latin-1"))
+                try:
+                    return float(cookies.get(STICKY_COOKIE, 0))
+                except ValueError:
+                    return 0
+        return 0
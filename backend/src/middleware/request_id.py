@@ -0,0 +1,70 @@
+"""
+Request id propagation.
+
+Takes the X-Request-ID sent by the proxy or client, or generates one,
+keeps it in a context variable for logs and echoes it in the response.
+The authenticated user id is kept next to it once known.
+"""
+
+import re
+from contextvars import ContextVar
+from typing import Optional
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Client supplied ids end up in logs, anything else is replaced
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_user_id: ContextVar[Optional[int]] = ContextVar("user_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def get_user_id() -> Optional[int]:
+    return _user_id.get()
+
+
+def set_user_id(user_id: int) -> None:
+    _user_id.set(user_id)
+
+
+class RequestIdMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._incoming_request_id(scope) or uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_id.reset(token)
+
+    @staticmethod
+    def _incoming_request_id(scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(request_id):
+                    return request_id
+        return None
@@ -0,0 +1,173 @@
+"""
+Per-request phase timing.
+
+Adapters record how long they spent in a phase (db, mongo, redis, auth,
+serialize) into a request-scoped context. The totals are observed as
+Prometheus histograms for every request and sent back as a Server-Timing
+header when enabled in settings or when the caller is an admin.
+
+Phases can overlap, auth includes the Redis blacklist lookup, so they
+are not expected to add up to the total. Routers that use
+ServerTimingRoute also record response rendering as serialize.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, Coroutine, Iterator, Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .prometheus import request_phase_seconds
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class RequestTimings:
+    __slots__ = ("phases", "emit", "endpoint_returned")
+
+    def __init__(self, emit: bool) -> None:
+        # phase -> [total seconds, number of calls]
+        self.phases: dict[str, list[float]] = {}
+        self.emit = emit
+        # Set by ServerTimingRoute, sync endpoints set it from a worker
+        # thread, so it lives on the shared object, not in a ContextVar
+        self.endpoint_returned: Optional[float] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        entry = self.phases.get(phase)
+        if entry is None:
+            self.phases[phase] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def header_value(self, total: float) -> str:
+        metrics = [
+            f'{phase};dur={seconds * 1000:.1f};desc="{count:g} calls"'
+            for phase, (seconds, count) in self.phases.items()
+        ]
+        metrics.append(f"app;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, perf_counter() - start)
+
+
+def enable_server_timing() -> None:
+    """Send the Server-Timing header for the current request."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.emit = True
+
+
+def _mark_endpoint_return(call: Callable[..., Any]) -> Callable[..., Any]:
+    def mark() -> None:
+        timings = _timings.get()
+        if timings is not None:
+            timings.endpoint_returned = perf_counter()
+
+    # FastAPI runs sync endpoints in a thread pool, the wrapper has to
+    # stay sync for them
+    if iscoroutinefunction(call):
+
+        @wraps(call)
+        async def async_marked(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            result = await call(*args, **kwargs)
+            mark()
+            return result
+
+        return async_marked
+
+    @wraps(call)
+    def marked(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        result = call(*args, **kwargs)
+        mark()
+        return result
+
+    return marked
+
+
+class ServerTimingRoute(APIRoute):
+    """
+    Records response rendering as the serialize phase.
+
+    The phase runs from the endpoint returning to the response being
+    built: response model validation, JSON encoding and rendering.
+    """
+
+    def get_route_handler(
+        self,
+    ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        assert self.dependant.call is not None
+        self.dependant.call = _mark_endpoint_return(self.dependant.call)
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = _timings.get()
+            if timings is not None:
+                timings.endpoint_returned = None
+            response = await handler(request)
+            if timings is not None and timings.endpoint_returned is not None:
+                timings.add(
+                    "serialize", perf_counter() - timings.endpoint_returned
+                )
+            return response
+
+        return timed_handler
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp, always_emit: bool = False) -> None:
+        self.app = app
+        self.always_emit = always_emit
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(emit=self.always_emit)
+        token = _timings.set(timings)
+        start = perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and timings.emit:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    SERVER_TIMING_HEADER,
+                    timings.header_value(perf_counter() - start),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _timings.reset(token)
+            for phase, (seconds, _) in timings.phases.items():
+                request_phase_seconds.labels(phase=phase).observe(seconds)
@@ -1,7 +1,17 @@
+from typing import Any
+
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import (
+    setup_logging,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_ready,
+)
 
 from src.core.config import get_settings
+from src.core.tracing import setup_tracing, shutdown_tracing
+from src.core.utils.logger import setup_logger
 
 settings = get_settings()
 
@@ -11,6 +21,25 @@ app.conf.update(
     result_backend=settings.redis_url,
     timezone="UTC",
     result_expires=3600,
+    # Mirror the API pool limits and timeouts, a worker can't share the
+    # API process pool but shouldn't open unbounded connections either
+    broker_pool_limit=settings.REDIS_MAX_CONNECTIONS,
+    redis_max_connections=settings.REDIS_MAX_CONNECTIONS,
+    redis_socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    redis_socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+    redis_socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
+    redis_retry_on_timeout=True,
+    redis_backend_health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    broker_transport_options={
+        "max_retries": settings.REDIS_RETRY_ATTEMPTS,
+        "interval_start": 0,
+        "interval_step": settings.REDIS_RETRY_BACKOFF_BASE,
+        "interval_max": settings.REDIS_RETRY_BACKOFF_CAP,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": settings.REDIS_SOCKET_KEEPALIVE,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+    },
 )
 
 app.conf.beat_schedule = {
@@ -26,6 +55,38 @@ app.conf.beat_schedule = {
         "task": "tags.delete_unused_tags",
         "schedule": crontab(minute=0, hour=0),
     },
+    "sync_snippet_feed": {
+        "task": "snippets.sync_feed",
+        "schedule": crontab(minute="*/10"),
+    },
 }
 
-from .tasks import tags, tokens  # noqa
+
+# Connecting this signal keeps Celery from configuring logging itself,
+# worker and task logs go through the same JSON pipeline as the API
+@setup_logging.connect
+def init_logging(**kwargs: Any) -> None:  # noqa: ANN401
+    setup_logger(settings)
+
+
+# Per pool process, the span export thread does not survive a fork
+@worker_process_init.connect
+def init_tracing(**kwargs: Any) -> None:  # noqa: ANN401
+    from src.adapters.postgres.sync_db import engine
+
+    setup_tracing(settings, "snippetly-worker", engines=[engine])
+
+
+@worker_process_shutdown.connect
+def flush_tracing(**kwargs: Any) -> None:  # noqa: ANN401
+    shutdown_tracing()
+
+
+# The migration creates snippet_feed empty, backfill it on deploy instead
+# of waiting for the first beat run. Rows already in sync are skipped.
+@worker_ready.connect
+def backfill_snippet_feed(**kwargs: Any) -> None:  # noqa: ANN401
+    app.send_task("snippets.sync_feed")
+
+
+from .tasks import snippets, tags, tokens  # noqa
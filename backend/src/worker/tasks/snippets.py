@@ -0,0 +1,103 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import PyMongoError
+from sqlalchemy import select, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.adapters.mongo.sync_client import get_sync_snippet_collection
+from src.adapters.postgres.models import SnippetModel, SnippetFeedModel
+from src.adapters.postgres.repositories import SnippetFeedRepository
+from src.adapters.postgres.sync_db import get_db_sync
+from src.core.utils import logger
+from ..app import app
+
+FEED_SYNC_BATCH_SIZE = 500
+
+
+def _load_documents(mongodb_ids: list[str]) -> dict[str, dict]:
+    object_ids = []
+    for mongodb_id in mongodb_ids:
+        try:
+            object_ids.append(ObjectId(mongodb_id))
+        except InvalidId:
+            continue
+
+    cursor = get_sync_snippet_collection().find(
+        {"_id": {"$in": object_ids}}, {"content": 1, "description": 1}
+    )
+    return {str(document["_id"]): document for document in cursor}
+
+
+def _sync_feed_batch(session: Session, after_id: int) -> tuple[int, int]:
+    # Snippets without a feed row or changed since the row was written.
+    # Every snippet update moves snippets.updated_at, content-only edits
+    # included, so a feed upsert lost after the Mongo write shows here
+    stale = session.execute(
+        select(
+            SnippetModel.id,
+            SnippetModel.mongodb_id,
+            SnippetModel.updated_at,
+        )
+        .outerjoin(
+            SnippetFeedModel,
+            SnippetFeedModel.snippet_id == SnippetModel.id,
+        )
+        .where(
+            SnippetModel.id > after_id,
+            or_(
+                SnippetFeedModel.snippet_id.is_(None),
+                SnippetFeedModel.updated_at < SnippetModel.updated_at,
+            ),
+        )
+        .order_by(SnippetModel.id)
+        .limit(FEED_SYNC_BATCH_SIZE)
+    ).all()
+    if not stale:
+        return after_id, 0
+
+    documents = _load_documents([row.mongodb_id for row in stale])
+    for row in stale:
+        document = documents.get(row.mongodb_id)
+        if document is None:
+            logger.warning("Snippet %s has no document, not synced", row.id)
+            continue
+        # An update committed after the read above is skipped, its own
+        # upsert or the next sync writes the newer content
+        session.execute(
+            SnippetFeedRepository.build_upsert_query(
+                row.id,
+                document["content"],
+                document.get("description") or "",
+                seen_updated_at=row.updated_at,
+            )
+        )
+    return stale[-1].id, len(stale)
+
+
+def _sync_feed(session: Session) -> int:
+    after_id, synced = 0, 0
+    while True:
+        after_id, count = _sync_feed_batch(session, after_id)
+        # One transaction per batch, a failure keeps the earlier ones
+        session.commit()
+        synced += count
+        if count < FEED_SYNC_BATCH_SIZE:
+            return synced
+
+
+@app.task(
+    name="snippets.sync_feed",
+    autoretry_for=(SQLAlchemyError, PyMongoError),
+    retry_kwargs={"max_retries": 3, "countdown": 10},
+    retry_backoff=True,
+)
+def sync_snippet_feed() -> None:
+    for session in get_db_sync():
+        try:
+            synced = _sync_feed(session)
+            logger.info("Snippet feed synced, %s rows refreshed", synced)
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Database error occurred during feed sync: %s", e)
+            raise e
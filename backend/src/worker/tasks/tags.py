@@ -27,5 +27,5 @@ def delete_unused_tags() -> None:
             logger.info("Tags has been deleted successfully")
         except SQLAlchemyError as e:
             session.rollback()
-            logger.error(f"Database error occurred during tags cleanup: {e}")
+            logger.error("Database error occurred during tags cleanup: %s", e)
             raise e
@@ -32,7 +32,7 @@ def delete_expired_activation_reset_tokens() -> None:
             logger.info("Expired tokens successfully deleted")
         except SQLAlchemyError as e:
             session.rollback()
-            logger.error(f"Database error occurred during token cleanup: {e}")
+            logger.error("Database error occurred during token cleanup: %s", e)
             raise e
 
 
@@ -50,5 +50,5 @@ def delete_expired_refresh_tokens() -> None:
             logger.info("Expired tokens successfully deleted")
         except SQLAlchemyError as e:
             session.rollback()
-            logger.error(f"Database error occurred during token cleanup: {e}")
+            logger.error("Database error occurred during token cleanup: %s", e)
             raise e
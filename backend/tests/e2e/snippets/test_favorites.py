@@ -4,7 +4,7 @@ import pytest
 
 from src.adapters.postgres.models import LanguageEnum
 from src.core.exceptions import FavoritesAlreadyError
-from .routes import favorites_url
+from .routes import favorites_url, snippet_url
 
 
 async def test_add_favorite_success(
@@ -27,6 +27,89 @@ async def test_add_favorite_success(
     await db.rollback()
 
 
+async def test_favorites_count_in_responses(auth_client, setup_snippets):
+    client, _ = auth_client
+    target_snippet = setup_snippets["u2_public_py"]
+
+    resp = await client.post(
+        favorites_url, json={"uuid": str(target_snippet.uuid)}
+    )
+    assert resp.status_code == 201
+
+    detail = await client.get(f"{snippet_url}{target_snippet.uuid}")
+    assert detail.json()["favorites_count"] == 1
+
+    feed = await client.get(
+        snippet_url, params={"sort_by": "most_favorited", "per_page": 1}
+    )
+    assert feed.json()["snippets"][0]["uuid"] == str(target_snippet.uuid)
+    assert feed.json()["snippets"][0]["favorites_count"] == 1
+
+    resp = await client.delete(f"{favorites_url}{target_snippet.uuid}")
+    assert resp.status_code == 200
+
+    detail = await client.get(f"{snippet_url}{target_snippet.uuid}")
+    assert detail.json()["favorites_count"] == 0
+
+
+async def test_is_favorited_in_responses(auth_client, setup_snippets):
+    client, _ = auth_client
+    target_snippet = setup_snippets["u2_public_py"]
+    await client.post(favorites_url, json={"uuid": str(target_snippet.uuid)})
+
+    feed = await client.get(snippet_url)
+    flags = {it["uuid"]: it["is_favorited"] for it in feed.json()["snippets"]}
+    assert flags.pop(str(target_snippet.uuid)) is True
+    assert not any(flags.values())
+
+    detail = await client.get(f"{snippet_url}{target_snippet.uuid}")
+    assert detail.json()["is_favorited"] is True
+
+    favorites = await client.get(favorites_url)
+    assert all(it["is_favorited"] for it in favorites.json()["snippets"])
+
+
+async def test_bulk_favorites(auth_client, setup_snippets):
+    client, _ = auth_client
+    first = setup_snippets["u1_public_py"]
+    second = setup_snippets["u2_public_py"]
+    missing = uuid4()
+
+    resp = await client.post(
+        f"{favorites_url}bulk",
+        json={
+            "action": "add",
+            "uuids": [str(first.uuid), str(second.uuid), str(missing)],
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "changed": [str(first.uuid), str(second.uuid)],
+        "unchanged": [],
+        "not_found": [str(missing)],
+    }
+
+    resp = await client.post(
+        f"{favorites_url}bulk",
+        json={"action": "remove", "uuids": [str(first.uuid)]},
+    )
+    assert resp.json()["changed"] == [str(first.uuid)]
+
+    favorites = await client.get(favorites_url)
+    assert [s["uuid"] for s in favorites.json()["snippets"]] == [
+        str(second.uuid)
+    ]
+
+
+async def test_bulk_favorites_invalid_payload(auth_client):
+    client, _ = auth_client
+
+    resp = await client.post(
+        f"{favorites_url}bulk", json={"action": "toggle", "uuids": []}
+    )
+    assert resp.status_code == 422
+
+
 async def test_add_favorite_unauthorized(client, setup_snippets):
     target_snippet = setup_snippets["u1_public_py"]
 
@@ -134,6 +217,31 @@ async def test_get_favorites_filter_tag(auth_client, setup_snippets):
     )
 
 
+async def test_get_favorites_filter_all_tags(auth_client, setup_snippets):
+    client, _ = auth_client
+    await _add_favorites_for(auth_client, setup_snippets)
+
+    resp = await client.get(
+        favorites_url,
+        params=[("tags", "test"), ("tags", "python"), ("tag_mode", "all")],
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert data["total_items"] == len(data["snippets"])
+    assert all(
+        {"test", "python"} <= set(it.get("tags", []))
+        for it in data["snippets"]
+    )
+
+
+async def test_get_favorites_invalid_tag_mode(auth_client):
+    client, _ = auth_client
+
+    resp = await client.get(favorites_url, params={"tag_mode": "some"})
+    assert resp.status_code == 422
+
+
 async def test_get_favorites_filter_username(auth_client, setup_snippets):
     client, _ = auth_client
     await _add_favorites_for(auth_client, setup_snippets)
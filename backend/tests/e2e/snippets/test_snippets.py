@@ -89,6 +89,24 @@ async def test_get_all_snippets_basic(auth_client, setup_snippets):
     assert all(item["is_private"] is False for item in items)
 
 
+async def test_get_all_snippets_times_serialization(
+    auth_client, db, setup_snippets
+):
+    client, user = auth_client
+    user.is_admin = True
+    await db.commit()
+
+    response = await client.get(snippet_url)
+    assert response.status_code == 200
+
+    metrics = {
+        metric.split(";")[0]: metric
+        for metric in response.headers["Server-Timing"].split(", ")
+    }
+    # Building the list in the service, then rendering the response
+    assert 'desc="2 calls"' in metrics["serialize"]
+
+
 async def test_get_all_snippets_filter_language(auth_client, setup_snippets):
     client, _ = auth_client
 
@@ -121,6 +139,41 @@ async def test_get_all_snippets_filter_username(auth_client, setup_snippets):
     assert len(data["snippets"]) == 2
 
 
+async def test_get_all_snippets_filter_username_substring_by_default(
+    auth_client, setup_snippets
+):
+    client, _ = auth_client
+    user1 = setup_snippets["user1"]
+
+    response = await client.get(
+        snippet_url, params={"username": user1.username[1:].upper()}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["total_items"] == 2
+
+
+async def test_get_all_snippets_filter_username_exact(
+    auth_client, setup_snippets
+):
+    client, _ = auth_client
+    user1 = setup_snippets["user1"]
+
+    exact = await client.get(
+        snippet_url,
+        params={"username": user1.username.upper(), "username_mode": "exact"},
+    )
+    partial = await client.get(
+        snippet_url,
+        params={"username": user1.username[:-1], "username_mode": "exact"},
+    )
+
+    assert exact.status_code == 200
+    assert exact.json()["total_items"] == 2
+    assert partial.status_code == 200
+    assert partial.json()["total_items"] == 0
+
+
 async def test_get_all_snippets_filter_tags(auth_client, setup_snippets):
     client, _ = auth_client
 
@@ -6,7 +6,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.adapters.mongo.documents import SnippetDocument
 from src.adapters.mongo.repo import SnippetDocumentRepository
 from src.adapters.postgres.models import SnippetModel, UserModel, LanguageEnum
-from src.adapters.postgres.repositories import SnippetRepository
+from src.adapters.postgres.repositories import (
+    SnippetRepository,
+    SnippetFeedRepository,
+)
 
 
 class SnippetFactory:
@@ -20,6 +23,7 @@ class SnippetFactory:
         self.db = db
         self.model_repo = model_repo
         self.doc_repo = doc_repo
+        self.feed_repo = SnippetFeedRepository(db)
         self.fake = faker
 
     async def create_document(
@@ -78,6 +82,9 @@ class SnippetFactory:
                 user_id=user.id,
             )
         await self.db.flush()
+        await self.feed_repo.upsert(
+            snippet.id, document.content, document.description
+        )
         return snippet
 
     async def create(
@@ -101,4 +101,5 @@ class UserFactory:
         user = await UserFactory.create(db, is_active=True)
         profile = await profile_repo.create(user.id)
         await db.flush()
+        await db.refresh(user, ["profile"])
         return user, profile
@@ -19,6 +19,7 @@ from .profile import (
 from .snippet import (
     snippet_model_repo,
     snippet_doc_repo,
+    snippet_feed_repo,
     snippet_factory,
     snippet_service,
     favorites_repo,
@@ -62,6 +63,7 @@ __all__ = [
     "user_with_profile",
     "snippet_model_repo",
     "snippet_doc_repo",
+    "snippet_feed_repo",
     "snippet_factory",
     "snippet_service",
     "setup_snippets",
@@ -3,9 +3,11 @@ import pytest_asyncio
 from src.adapters.postgres.models import (
     ActivationTokenModel,
     PasswordResetTokenModel,
-    RefreshTokenModel,
 )
-from src.adapters.postgres.repositories import TokenRepository
+from src.adapters.postgres.repositories import (
+    TokenRepository,
+    RefreshTokenRepository,
+)
 from src.core.security.jwt_manager import JWTAuthManager
 from src.features.auth import AuthService
 
@@ -34,7 +36,7 @@ async def password_reset_token_repo(db):
 
 @pytest_asyncio.fixture
 async def refresh_token_repo(db):
-    return TokenRepository(db, RefreshTokenModel)
+    return RefreshTokenRepository(db)
 
 
 @pytest_asyncio.fixture
@@ -4,6 +4,7 @@ from src.adapters.mongo.repo import SnippetDocumentRepository
 from src.adapters.postgres.repositories import (
     SnippetRepository,
     FavoritesRepository,
+    SnippetFeedRepository,
 )
 from src.features.snippets import (
     SnippetService,
@@ -23,6 +24,11 @@ async def snippet_doc_repo():
     return SnippetDocumentRepository()
 
 
+@pytest_asyncio.fixture
+async def snippet_feed_repo(db):
+    return SnippetFeedRepository(db)
+
+
 @pytest_asyncio.fixture
 async def favorites_repo(db):
     return FavoritesRepository(db)
@@ -44,5 +50,13 @@ async def snippet_factory(db, snippet_model_repo, snippet_doc_repo, faker):
 
 
 @pytest_asyncio.fixture
-async def snippet_service(db, snippet_model_repo, snippet_doc_repo):
-    return SnippetService(db, snippet_model_repo, snippet_doc_repo)
+async def snippet_service(
+    db, snippet_model_repo, snippet_doc_repo, snippet_feed_repo, favorites_repo
+):
+    return SnippetService(
+        db,
+        snippet_model_repo,
+        snippet_doc_repo,
+        snippet_feed_repo,
+        favorites_repo,
+    )
@@ -3,7 +3,11 @@ from datetime import datetime, timedelta, timezone
 import pytest_asyncio
 from sqlalchemy import update, delete
 
-from src.adapters.postgres.models import SnippetModel, LanguageEnum
+from src.adapters.postgres.models import (
+    SnippetModel,
+    SnippetFeedModel,
+    LanguageEnum,
+)
 
 
 @pytest_asyncio.fixture
@@ -52,6 +56,11 @@ async def setup_snippets(
         .values(created_at=datetime.now(timezone.utc) - timedelta(days=5))
     )
     await db.execute(old_snippet_stmt)
+    await db.execute(
+        update(SnippetFeedModel)
+        .where(SnippetFeedModel.snippet_id == u1_pub_js.id)
+        .values(created_at=datetime.now(timezone.utc) - timedelta(days=5))
+    )
     await db.commit()
 
     return {
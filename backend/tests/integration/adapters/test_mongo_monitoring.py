@@ -0,0 +1,74 @@
+import logging
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from src.adapters.mongo.documents import SnippetDocument
+from src.adapters.mongo.monitoring import (
+    CommandMetricsListener,
+    command_shape,
+    pool_metrics_listener,
+    query_shape,
+)
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_query_shape_hides_values():
+    shape = query_shape(
+        {"_id": {"$in": ["a", "b"]}, "$or": [{"x": 1}, {"y": "z"}]}
+    )
+
+    assert shape == {"_id": {"$in": "?"}, "$or": [{"x": "?"}, {"y": "?"}]}
+    assert command_shape(
+        "update", {"update": "snippets", "updates": [{"q": {"_id": 1}}]}
+    ) == [{"_id": "?"}]
+
+
+async def test_command_and_pool_metrics_recorded():
+    find_before = _sample(
+        "snippetly_mongo_command_duration_seconds_count", command="find"
+    )
+    checkout_before = _sample("snippetly_mongo_pool_checkout_seconds_count")
+
+    await SnippetDocument.find_one({"title": "missing"})
+
+    assert (
+        _sample(
+            "snippetly_mongo_command_duration_seconds_count", command="find"
+        )
+        == find_before + 1
+    )
+    assert (
+        _sample("snippetly_mongo_pool_checkout_seconds_count")
+        > checkout_before
+    )
+    assert pool_metrics_listener.open_connections >= 1
+    assert pool_metrics_listener.in_use_connections == 0
+
+
+def test_slow_command_logged_with_shape(caplog):
+    listener = CommandMetricsListener(slow_command_ms=50)
+    common = {"request_id": 7, "connection_id": ("mongo", 27017)}
+    listener.started(
+        SimpleNamespace(
+            database_name="snippetly",
+            command={"find": "snippets", "filter": {"title": "secret"}},
+            **common,
+        )
+    )
+
+    with caplog.at_level(logging.WARNING, logger="snippetly.mongo"):
+        listener.succeeded(
+            SimpleNamespace(
+                command_name="find", duration_micros=80_000, **common
+            )
+        )
+
+    (record,) = caplog.records
+    message = record.getMessage()
+    assert "collection=snippetly.snippets" in message
+    assert "{'title': '?'}" in message
+    assert "secret" not in message
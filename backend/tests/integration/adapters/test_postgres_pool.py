@@ -0,0 +1,110 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.adapters.postgres.async_db import release_connection
+from src.adapters.postgres.models import TagModel
+from src.adapters.postgres.pool import (
+    InstrumentedAsyncPool,
+    build_connect_args,
+    create_db_engine,
+)
+
+
+def _sample(name: str, engine: str) -> float:
+    return REGISTRY.get_sample_value(name, {"engine": engine}) or 0.0
+
+
+async def test_engine_uses_pool_settings(settings):
+    tuned = settings.model_copy(
+        update={
+            "POSTGRES_POOL_SIZE": 3,
+            "POSTGRES_MAX_OVERFLOW": 1,
+            "POSTGRES_STATEMENT_TIMEOUT_MS": 1500,
+        }
+    )
+    engine = create_db_engine(tuned, tuned.database_url, name="test")
+    try:
+        pool = engine.sync_engine.pool
+        assert isinstance(pool, InstrumentedAsyncPool)
+        assert pool.size() == 3
+        assert pool._max_overflow == 1
+        assert pool._pre_ping is True
+
+        async with engine.connect() as conn:
+            timeout = await conn.scalar(text("SHOW statement_timeout"))
+        assert timeout == "1500ms"
+    finally:
+        await engine.dispose()
+
+
+async def test_engine_pool_metrics(settings):
+    engine = create_db_engine(settings, settings.database_url, name="test")
+    checkouts = "snippetly_db_pool_checkout_seconds_count"
+    before = _sample(checkouts, "test")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert _sample("snippetly_db_pool_checked_out", "test") == 1
+
+        assert _sample(checkouts, "test") == before + 1
+        assert _sample("snippetly_db_pool_checked_out", "test") == 0
+        assert (
+            _sample("snippetly_db_pool_size", "test")
+            == settings.POSTGRES_POOL_SIZE
+        )
+    finally:
+        await engine.dispose()
+
+
+async def test_pgbouncer_mode_disables_prepared_statement_reuse(settings):
+    bouncer = settings.model_copy(update={"POSTGRES_PGBOUNCER": True})
+
+    connect_args = build_connect_args(bouncer)
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert "server_settings" not in connect_args
+    first = connect_args["prepared_statement_name_func"]()
+    assert first != connect_args["prepared_statement_name_func"]()
+
+    engine = create_db_engine(bouncer, bouncer.database_url, name="test")
+    try:
+        async with engine.connect() as conn:
+            for value in range(3):
+                query = text("SELECT :value").bindparams(value=value)
+                assert await conn.scalar(query) == value
+    finally:
+        await engine.dispose()
+
+
+async def test_session_checks_out_lazily_and_releases_after_reads(settings):
+    engine = create_db_engine(settings, settings.database_url, name="test")
+    session_local = async_sessionmaker(bind=engine, expire_on_commit=False)
+    try:
+        async with session_local() as session:
+            assert engine.sync_engine.pool.checkedout() == 0
+
+            await session.execute(text("SELECT 1"))
+            assert engine.sync_engine.pool.checkedout() == 1
+
+            await release_connection(session)
+            assert not session.in_transaction()
+            assert engine.sync_engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
+
+
+async def test_release_connection_keeps_pending_writes(settings):
+    engine = create_db_engine(settings, settings.database_url, name="test")
+    session_local = async_sessionmaker(bind=engine, expire_on_commit=False)
+    try:
+        async with session_local() as session:
+            await session.execute(text("SELECT 1"))
+            session.add(TagModel(name="pending"))
+
+            await release_connection(session)
+            assert session.in_transaction()
+            assert engine.sync_engine.pool.checkedout() == 1
+            await session.rollback()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,69 @@
+from prometheus_client import REGISTRY
+from redis.asyncio import BlockingConnectionPool
+
+from src.adapters.redis import get_redis_client, get_sync_redis_pool
+from src.adapters.redis.client import InstrumentedRedis
+from src.core.app.limiter import create_limiter
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_redis_client_uses_configured_pool(settings, redis_client):
+    pool = redis_client.connection_pool
+
+    assert get_redis_client(settings) is redis_client
+    assert isinstance(redis_client, InstrumentedRedis)
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == settings.REDIS_MAX_CONNECTIONS
+    assert pool.timeout == settings.REDIS_POOL_TIMEOUT
+    kwargs = pool.connection_kwargs
+    assert kwargs["socket_timeout"] == settings.REDIS_SOCKET_TIMEOUT
+    assert kwargs["socket_keepalive"] == settings.REDIS_SOCKET_KEEPALIVE
+    assert (
+        kwargs["health_check_interval"] == settings.REDIS_HEALTH_CHECK_INTERVAL
+    )
+    assert kwargs["retry"].get_retries() == settings.REDIS_RETRY_ATTEMPTS
+
+
+async def test_redis_command_latency_is_recorded(redis_client):
+    name = "snippetly_redis_command_duration_seconds_count"
+    ping_before = _sample(name, {"command": "ping"})
+    pipeline_before = _sample(name, {"command": "pipeline"})
+
+    await redis_client.ping()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.exists("metrics:test")
+        await pipe.execute()
+
+    assert _sample(name, {"command": "ping"}) == ping_before + 1
+    assert _sample(name, {"command": "pipeline"}) == pipeline_before + 1
+
+
+async def test_redis_pool_utilization_is_exported(settings, redis_client):
+    await redis_client.ping()
+
+    max_connections = _sample(
+        "snippetly_redis_pool_max_connections", {"pool": "api"}
+    )
+    idle = _sample(
+        "snippetly_redis_pool_connections", {"pool": "api", "state": "idle"}
+    )
+
+    assert max_connections == settings.REDIS_MAX_CONNECTIONS
+    assert idle >= 1
+
+
+def test_limiter_shares_sync_pool(settings):
+    storage = create_limiter(settings)._storage
+    pool = get_sync_redis_pool(settings)
+
+    assert storage.storage.connection_pool is pool
+    assert storage.check() is True
+    # Checks run on the event loop, waits stay short
+    assert pool.timeout == settings.REDIS_LIMITER_POOL_TIMEOUT
+    assert (
+        pool.connection_kwargs["socket_timeout"]
+        == settings.REDIS_LIMITER_SOCKET_TIMEOUT
+    )
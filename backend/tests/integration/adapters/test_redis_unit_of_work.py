@@ -0,0 +1,49 @@
+import pytest
+
+from src.adapters.redis import RedisUnitOfWork
+
+
+async def test_flush_sends_single_pipeline(redis_client, mocker):
+    spy = mocker.spy(redis_client, "pipeline")
+    uow = RedisUnitOfWork(redis_client)
+
+    written = uow.add("setex", "uow:test:key", 60, "value")
+    exists = uow.add("exists", "uow:test:key")
+    assert len(uow) == 2
+    assert not exists.done()
+
+    results = await uow.flush()
+
+    spy.assert_called_once()
+    assert results == [True, 1]
+    assert written.result() is True
+    assert exists.result() == 1
+    assert len(uow) == 0
+    await redis_client.delete("uow:test:key")
+
+
+async def test_flush_without_commands_is_noop(redis_client, mocker):
+    spy = mocker.spy(redis_client, "pipeline")
+
+    assert await RedisUnitOfWork(redis_client).flush() == []
+    spy.assert_not_called()
+
+
+async def test_context_manager_discards_on_error(redis_client):
+    future = None
+    with pytest.raises(RuntimeError):
+        async with RedisUnitOfWork(redis_client) as uow:
+            future = uow.add("setex", "uow:test:discarded", 60, "value")
+            raise RuntimeError
+
+    assert future is not None and future.cancelled()
+    assert await redis_client.exists("uow:test:discarded") == 0
+
+
+async def test_context_manager_flushes_on_exit(redis_client):
+    async with RedisUnitOfWork(redis_client) as uow:
+        future = uow.add("setex", "uow:test:flushed", 60, "value")
+
+    assert future.result() is True
+    assert await redis_client.get("uow:test:flushed") == "value"
+    await redis_client.delete("uow:test:flushed")
@@ -2,11 +2,19 @@ from datetime import timezone, datetime, timedelta
 
 import jwt
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from redis.asyncio import Redis
 from sqlalchemy.exc import SQLAlchemyError
 
 import src.core.exceptions as exc
 from src.adapters.postgres.models import UserModel
+from src.adapters.redis.client import create_redis_pool
 from src.adapters.redis.common import get_access_token
+from src.core.security.jwt_manager import (
+    JWTAuthManager,
+    get_jwt_auth_manager,
+)
 
 user_data = {
     "id": 1,
@@ -100,7 +108,7 @@ async def test_verify_token_missing_jti(jwt_manager):
     }
     token = jwt.encode(
         payload,
-        jwt_manager._secret_key_access,
+        jwt_manager._signing_key_access,
         algorithm=jwt_manager._algorithm,
     )
 
@@ -119,7 +127,7 @@ async def test_verify_token_expired(jwt_manager):
     }
     token = jwt.encode(
         payload,
-        jwt_manager._secret_key_access,
+        jwt_manager._signing_key_access,
         algorithm=jwt_manager._algorithm,
     )
 
@@ -166,6 +174,35 @@ async def test_refresh_tokens_valid(db, jwt_manager, user_factory):
     assert payload["iat"] <= datetime.now(timezone.utc).timestamp()
 
 
+async def test_refresh_tokens_single_redis_round_trip(
+    db, jwt_manager, user_factory, redis_client, mocker
+):
+    user = await user_factory.create(db)
+    refresh_token = jwt_manager.create_refresh_token(parse_user_data(user))
+    spy = mocker.spy(redis_client, "pipeline")
+    exists = mocker.spy(redis_client, "exists")
+
+    result = await jwt_manager.refresh_tokens(db, refresh_token)
+
+    spy.assert_called_once()
+    exists.assert_not_called()
+    payload = jwt.decode(
+        result["access_token"], options={"verify_signature": False}
+    )
+    assert await get_access_token(redis_client, payload["jti"]) == str(user.id)
+
+
+async def test_refresh_tokens_blacklisted(db, jwt_manager, user_factory):
+    user = await user_factory.create(db)
+    refresh_token = jwt_manager.create_refresh_token(parse_user_data(user))
+    payload = jwt_manager.decode_token(refresh_token)
+    await jwt_manager.add_to_blacklist(payload["jti"], payload["exp"])
+
+    with pytest.raises(exc.AuthenticationError) as e:
+        await jwt_manager.refresh_tokens(db, refresh_token)
+    assert "Invalid refresh token" in str(e.value)
+
+
 async def test_refresh_tokens_invalid_token(db, jwt_manager):
     invalid_token = "not.a.valid.token"
 
@@ -191,7 +228,7 @@ async def test_refresh_tokens_expired_token(db, jwt_manager, user_factory):
     expired_token = jwt.encode(
         payload,
         jwt_manager._secret_key_refresh,
-        algorithm=jwt_manager._algorithm,
+        algorithm=jwt_manager._refresh_algorithm,
     )
 
     with pytest.raises(exc.AuthenticationError) as e:
@@ -212,7 +249,7 @@ async def test_refresh_tokens_user_not_found(db, jwt_manager):
     token = jwt.encode(
         payload,
         jwt_manager._secret_key_refresh,
-        algorithm=jwt_manager._algorithm,
+        algorithm=jwt_manager._refresh_algorithm,
     )
 
     with pytest.raises(exc.UserNotFoundError):
@@ -241,6 +278,73 @@ async def test_revoke_all_user_tokens(
     assert await refresh_token_repo.get_by_user(user.id) is None
 
 
+async def test_revoke_all_user_tokens_reads_only_user_index(
+    db, jwt_manager, user_factory, mocker
+):
+    user = await user_factory.create(db)
+    other = await user_factory.create(db)
+    async with jwt_manager.unit_of_work() as uow:
+        token = await jwt_manager.create_access_token(
+            parse_user_data(user), uow
+        )
+    other_token = await jwt_manager.create_access_token(parse_user_data(other))
+
+    keys = mocker.spy(jwt_manager._redis_client, "keys")
+    pipeline = mocker.spy(jwt_manager._redis_client, "pipeline")
+    await jwt_manager.revoke_all_user_tokens(db, user.id)
+
+    keys.assert_not_called()
+    # Read and blacklist in one exchange
+    pipeline.assert_called_once()
+    payload = jwt_manager.decode_token(token)
+    other_payload = jwt_manager.decode_token(other_token)
+    assert await jwt_manager.is_blacklisted(payload["jti"]) is True
+    # Blacklisted until the token would have expired
+    assert (
+        0
+        < await jwt_manager._redis_client.ttl(f"bl:{payload['jti']}")
+        <= payload["exp"] - payload["iat"]
+    )
+    assert await jwt_manager.is_blacklisted(other_payload["jti"]) is False
+    assert (
+        await jwt_manager._redis_client.exists(f"user_access:{user.id}") == 0
+    )
+
+
+async def test_access_token_index_drops_expired_tokens(
+    db, jwt_manager, user_factory
+):
+    user = await user_factory.create(db)
+    index = f"user_access:{user.id}"
+    # User ids restart with every test database, Redis keeps the keys
+    await jwt_manager._redis_client.delete(index)
+    await jwt_manager._redis_client.zadd(index, {"expired": 1})
+
+    token = await jwt_manager.create_access_token(parse_user_data(user))
+
+    members = await jwt_manager._redis_client.zrange(index, 0, -1)
+    assert members == [jwt_manager.decode_token(token)["jti"]]
+    assert await jwt_manager._redis_client.ttl(index) > 0
+
+
+async def test_revoke_all_user_tokens_blacklists_refresh_tokens(
+    db, jwt_manager, user_factory, refresh_token_repo, mocker
+):
+    user = await user_factory.create(db)
+    refresh_token = jwt_manager.create_refresh_token(parse_user_data(user))
+    await refresh_token_repo.create(user.id, refresh_token, 7)
+    await db.commit()
+
+    decode = mocker.spy(jwt_manager, "decode_token")
+    await jwt_manager.revoke_all_user_tokens(db, user.id)
+
+    decode.assert_not_called()
+    payload = jwt.decode(refresh_token, options={"verify_signature": False})
+    assert await jwt_manager.is_blacklisted(payload["jti"]) is True
+    with pytest.raises(exc.AuthenticationError):
+        await jwt_manager.refresh_tokens(db, refresh_token)
+
+
 async def test_revoke_all_user_tokens_db_error(
     db, jwt_manager, user_factory, mocker
 ):
@@ -258,3 +362,87 @@ async def test_revoke_all_user_tokens_db_error(
         await jwt_manager.revoke_all_user_tokens(db, user.id)
 
     mock_delete.assert_called_once()
+
+
+def _generate_key_pair(algorithm: str) -> tuple[bytes, bytes]:
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem, public_pem
+
+
+@pytest.mark.parametrize("algorithm", ["EdDSA", "ES256"])
+async def test_asymmetric_access_token(settings, redis_client, algorithm):
+    private_pem, public_pem = _generate_key_pair(algorithm)
+    manager = JWTAuthManager(
+        redis_client,
+        settings.SECRET_KEY_ACCESS,
+        settings.SECRET_KEY_REFRESH,
+        algorithm,
+        settings.REFRESH_TOKEN_LIFE,
+        settings.ACCESS_TOKEN_LIFE_MINUTES,
+        private_key=private_pem,
+        public_key=public_pem,
+    )
+
+    token = await manager.create_access_token(user_data)
+
+    # Verifiable with the public key alone
+    payload = jwt.decode(token, public_pem, algorithms=[algorithm])
+    assert payload["user_id"] == user_data["id"]
+    assert manager.public_key == public_pem
+    assert (await manager.verify_token(token))["jti"] == payload["jti"]
+
+    refresh_token = manager.create_refresh_token(user_data)
+    header = jwt.get_unverified_header(refresh_token)
+    assert header["alg"] == "HS256"
+    assert await manager.verify_token(refresh_token, is_refresh=True)
+    with pytest.raises(jwt.InvalidTokenError):
+        await manager.verify_token(refresh_token)
+
+
+async def test_asymmetric_requires_key_pair(settings, redis_client):
+    with pytest.raises(ValueError):
+        JWTAuthManager(
+            redis_client,
+            settings.SECRET_KEY_ACCESS,
+            settings.SECRET_KEY_REFRESH,
+            "EdDSA",
+            settings.REFRESH_TOKEN_LIFE,
+            settings.ACCESS_TOKEN_LIFE_MINUTES,
+        )
+
+
+async def test_get_jwt_auth_manager_is_singleton(settings, redis_client):
+    manager = get_jwt_auth_manager(settings, redis_client)
+
+    assert get_jwt_auth_manager(settings, redis_client) is manager
+
+
+async def test_get_jwt_auth_manager_follows_new_redis_client(
+    settings, redis_client
+):
+    manager = get_jwt_auth_manager(settings, redis_client)
+    # What get_redis_client returns after close_redis_client
+    restarted_client = Redis(connection_pool=create_redis_pool(settings))
+
+    try:
+        restarted = get_jwt_auth_manager(settings, restarted_client)
+
+        assert restarted is not manager
+        assert restarted.redis_client is restarted_client
+        assert await restarted.is_blacklisted("unknown") is False
+    finally:
+        await restarted_client.aclose()
+        # Back to the shared client for the other tests
+        get_jwt_auth_manager(settings, redis_client)
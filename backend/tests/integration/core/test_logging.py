@@ -0,0 +1,186 @@
+import contextvars
+import importlib
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from src.core.utils.logger import setup_logger, shutdown_logger
+from src.middleware.request_id import _request_id, set_user_id
+
+# The package re-exports the "snippetly" logger under the module's name
+log_module = importlib.import_module("src.core.utils.logger")
+
+
+@pytest.fixture
+def log_stream(settings):
+    root = logging.getLogger()
+    level, handlers = root.level, root.handlers[:]
+    stream = io.StringIO()
+
+    def _setup(**overrides) -> io.StringIO:
+        setup_logger(settings.model_copy(update=overrides), stream=stream)
+        # Only the pipeline under test, pytest's capture handlers format
+        # records in the calling thread
+        root.handlers[:] = [log_module._handler]
+        return stream
+
+    yield _setup
+    shutdown_logger()
+    root.setLevel(level)
+    root.handlers[:] = handlers
+
+
+def _lines(stream: io.StringIO) -> list[dict]:
+    shutdown_logger()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_carry_request_context(log_stream):
+    stream = log_stream(LOG_JSON=True)
+
+    def handle_request() -> None:
+        _request_id.set("req-1")
+        set_user_id(42)
+        logging.getLogger("snippetly").info(
+            "Snippet %s created", "abc", extra={"snippet_id": 7}
+        )
+
+    contextvars.copy_context().run(handle_request)
+    logging.getLogger("snippetly").warning("Outside a request")
+
+    inside, outside = _lines(stream)
+    assert inside["message"] == "Snippet abc created"
+    assert inside["level"] == "INFO"
+    assert inside["logger"] == "snippetly"
+    assert inside["request_id"] == "req-1"
+    assert inside["user_id"] == 42
+    assert inside["snippet_id"] == 7
+    assert "request_id" not in outside
+
+
+def test_messages_are_rendered_in_calling_thread(log_stream):
+    stream = log_stream(LOG_JSON=True)
+    rendered_in = []
+
+    class Value:
+        def __str__(self) -> str:
+            rendered_in.append(threading.current_thread().name)
+            return "value"
+
+    tags = ["python"]
+    logging.getLogger("snippetly").info("Got %s %s", Value(), tags)
+    # Changed after the call, the message keeps the logged value
+    tags.append("late")
+
+    assert _lines(stream)[0]["message"] == "Got value ['python']"
+    assert rendered_in == [threading.current_thread().name]
+
+
+def test_lines_are_formatted_in_writer_thread(log_stream, monkeypatch):
+    formatted_in = []
+    format_record = log_module.JsonFormatter.format
+
+    def spy(self, record: logging.LogRecord) -> str:
+        formatted_in.append(threading.current_thread().name)
+        return format_record(self, record)
+
+    monkeypatch.setattr(log_module.JsonFormatter, "format", spy)
+    stream = log_stream(LOG_JSON=True)
+
+    logging.getLogger("snippetly").info("Got %s", "value")
+
+    assert _lines(stream)[0]["message"] == "Got value"
+    assert formatted_in and threading.current_thread().name not in (
+        formatted_in
+    )
+
+
+def test_exceptions_are_logged(log_stream):
+    stream = log_stream(LOG_JSON=True)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("snippetly").exception("Failed")
+
+    (line,) = _lines(stream)
+    assert "ValueError: boom" in line["exception"]
+
+
+def test_noisy_logger_is_sampled(log_stream):
+    stream = log_stream(
+        LOG_JSON=True,
+        LOG_SAMPLED_LOGGERS=["snippetly.sql"],
+        LOG_SAMPLING_INITIAL=5,
+        LOG_SAMPLING_THEREAFTER=10,
+    )
+    sql_logger = logging.getLogger("snippetly.sql")
+
+    for i in range(30):
+        sql_logger.warning("Slow query %s", i)
+        logging.getLogger("snippetly").warning("Not sampled %s", i)
+    sql_logger.error("Always kept")
+
+    lines = _lines(stream)
+    sql = [line for line in lines if line["logger"] == "snippetly.sql"]
+    # First 5, then the 15th and 25th, then the error
+    assert [line["message"] for line in sql] == [
+        *(f"Slow query {i}" for i in range(5)),
+        "Slow query 14",
+        "Slow query 24",
+        "Always kept",
+    ]
+    assert sql[5]["sampled_out"] == 9
+    assert len(lines) - len(sql) == 30
+
+
+def test_sampling_evicts_expired_counters(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(log_module, "monotonic", lambda: clock[0])
+    sampling = log_module.SamplingFilter(["noisy"], 1, 10, window=1.0)
+
+    def log(message: str) -> bool:
+        return sampling.filter(
+            logging.makeLogRecord(
+                {"name": "noisy", "levelno": logging.INFO, "msg": message}
+            )
+        )
+
+    for i in range(3):
+        log(f"Query {i} was slow")
+    log("Repeated")
+    log("Repeated")
+    assert len(sampling._counters) == 4
+
+    clock[0] += 1.5
+    log("Fresh")
+    # "Repeated" dropped one record, its count waits for the next one
+    assert {key[2] for key in sampling._counters} == {"Repeated", "Fresh"}
+
+    clock[0] += 1.5
+    log("Fresh")
+    assert {key[2] for key in sampling._counters} == {"Fresh"}
+
+
+def test_text_format(log_stream):
+    stream = log_stream(LOG_JSON=False)
+
+    logging.getLogger("snippetly").info("Plain %s", "text")
+    shutdown_logger()
+
+    assert stream.getvalue().startswith("INFO\t| Plain text\t| ")
+
+
+def test_pipeline_restarts_after_fork(log_stream):
+    stream = log_stream(LOG_JSON=True)
+    old_queue = log_module._handler.queue
+
+    # What a forked child runs, the parent's writer thread is gone there
+    log_module._restart_after_fork()
+    logging.getLogger("snippetly").info("From the child")
+
+    assert log_module._handler.queue is not old_queue
+    assert _lines(stream)[-1]["message"] == "From the child"
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+
+from prometheus_client import REGISTRY
+
+from src.core.app.loop_monitor import LoopLagMonitor
+
+
+def _lag(suffix: str) -> float:
+    return (
+        REGISTRY.get_sample_value(f"snippetly_event_loop_lag_seconds_{suffix}")
+        or 0
+    )
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def _monitor(settings, **overrides) -> LoopLagMonitor:
+    return LoopLagMonitor(
+        settings.model_copy(update={"LOOP_LAG_INTERVAL": 0.01, **overrides})
+    )
+
+
+async def test_loop_lag_histogram_records_blocked_loop(settings):
+    count_before, sum_before = _lag("count"), _lag("sum")
+    monitor = _monitor(settings)
+    monitor.start()
+
+    await asyncio.sleep(0.05)
+    _block_loop(0.2)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert _lag("count") > count_before + 1
+    assert _lag("sum") - sum_before >= 0.15
+
+
+async def test_blocking_debug_logs_stack_of_blocking_call(settings, caplog):
+    monitor = _monitor(
+        settings,
+        LOOP_BLOCKING_DEBUG=True,
+        LOOP_BLOCKING_THRESHOLD_MS=50,
+    )
+    monitor.start()
+
+    with caplog.at_level(logging.WARNING, logger="snippetly.loop"):
+        await asyncio.sleep(0.05)
+        _block_loop(0.3)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    reports = [r.getMessage() for r in caplog.records]
+    # One report per stall, pointing at the call that blocked
+    assert len(reports) == 1
+    assert "Event loop blocked" in reports[0]
+    assert "_block_loop" in reports[0]
+    assert "time.sleep(seconds)" in reports[0]
+
+
+async def test_blocking_debug_off_starts_no_watchdog(settings, caplog):
+    monitor = _monitor(settings, LOOP_BLOCKING_THRESHOLD_MS=50)
+    monitor.start()
+
+    with caplog.at_level(logging.WARNING, logger="snippetly.loop"):
+        _block_loop(0.1)
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+    assert not caplog.records
@@ -0,0 +1,121 @@
+import asyncio
+from contextlib import suppress
+
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from src.adapters.mongo.documents import SnippetDocument
+from src.core.app import metrics
+from src.core.app.metrics import MetricsCollector
+from src.core.security import generate_secure_token
+
+
+def _sample(name: str, **labels: str) -> float | None:
+    return REGISTRY.get_sample_value(name, labels)
+
+
+async def test_collect_pools_sets_connection_gauges(settings):
+    await SnippetDocument.find_one()
+
+    MetricsCollector(settings).collect_pools()
+
+    assert _sample("snippetly_database_connections", database="mongo") >= 1
+    for database in ("postgres", "redis"):
+        assert (
+            _sample("snippetly_database_connections", database=database) >= 0
+        )
+
+
+async def test_collect_database_sets_totals(
+    db, settings, snippet_factory, active_user, refresh_token_repo
+):
+    collector = MetricsCollector(settings)
+    await db.execute(text("ANALYZE snippets"))
+    await collector.collect_database(db)
+    snippets_before = _sample("snippetly_total_snippets")
+    users_before = _sample("snippetly_active_users")
+
+    for _ in range(2):
+        await snippet_factory.create(active_user)
+    await refresh_token_repo.create(
+        active_user.id, generate_secure_token(), settings.REFRESH_TOKEN_LIFE
+    )
+    await db.flush()
+    await db.execute(text("ANALYZE snippets"))
+
+    await collector.collect_database(db)
+
+    assert _sample("snippetly_total_snippets") == snippets_before + 2
+    assert _sample("snippetly_active_users") == users_before + 1
+
+
+async def test_run_survives_failing_collections(settings, monkeypatch):
+    monkeypatch.setattr(metrics, "GAUGE_REFRESH_SECONDS", 0.01)
+    attempts = 0
+
+    def failing_session():
+        nonlocal attempts
+        attempts += 1
+        # What asyncpg raises for an unreachable host, not wrapped
+        raise OSError("Connect call failed")
+
+    def failing_pools():
+        raise RuntimeError("pool state changed")
+
+    collector = MetricsCollector(
+        settings.model_copy(update={"METRICS_COLLECT_INTERVAL": 0}),
+        session_factory=failing_session,
+    )
+    monkeypatch.setattr(collector, "collect_pools", failing_pools)
+
+    task = asyncio.create_task(collector.run())
+    await asyncio.sleep(0.1)
+
+    assert not task.done()
+    assert attempts > 1
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+async def test_only_one_worker_collects_database(
+    settings, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "GAUGE_REFRESH_SECONDS", 0.01)
+    queried = []
+
+    def counting_session(worker: str):
+        def factory():
+            queried.append(worker)
+            raise OSError("Connect call failed")
+
+        return factory
+
+    frequent = settings.model_copy(update={"METRICS_COLLECT_INTERVAL": 0})
+    workers = {
+        name: MetricsCollector(
+            frequent, session_factory=counting_session(name)
+        )
+        for name in ("first", "second")
+    }
+    tasks = {
+        name: asyncio.create_task(collector.run())
+        for name, collector in workers.items()
+    }
+    await asyncio.sleep(0.1)
+
+    assert queried and len(set(queried)) == 1
+    leader = queried[0]
+    # The lock is released when the leader stops, another worker follows
+    tasks[leader].cancel()
+    with suppress(asyncio.CancelledError):
+        await tasks[leader]
+    queried.clear()
+    await asyncio.sleep(0.1)
+
+    assert queried and set(queried) == {"first", "second"} - {leader}
+    for task in tasks.values():
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import src.core.exceptions as exc
+from src.core.profiling import SamplingProfiler, profile_process
+
+PROFILING_URL = "/api/v1/profiling/"
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _run_busy_thread() -> tuple[threading.Thread, threading.Event]:
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=_spin_until, args=(stop,), name="busy-worker"
+    )
+    thread.start()
+    return thread, stop
+
+
+def test_profiler_collapses_thread_stacks():
+    thread, stop = _run_busy_thread()
+    profiler = SamplingProfiler(interval=0.002)
+    try:
+        profiler.run(0.1)
+    finally:
+        stop.set()
+        thread.join()
+
+    lines = profiler.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "_spin_until (" in stack
+    assert profiler.samples > 0
+
+
+async def test_profile_process_runs_one_profile_at_a_time():
+    first = asyncio.create_task(profile_process(0.2, 0.01))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(exc.ProfilerBusyError):
+        await profile_process(0.1, 0.01)
+
+    profiler = await first
+    assert profiler.samples > 0
+
+
+async def test_profile_process_stops_sampling_when_cancelled():
+    task = asyncio.create_task(profile_process(30, 0.01))
+    await asyncio.sleep(0.05)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    time.sleep(0.05)
+    assert "snippetly-profiler" not in {t.name for t in threading.enumerate()}
+
+
+async def _admin_headers(jwt_manager, is_admin: bool) -> dict:
+    token = await jwt_manager.create_access_token(
+        {
+            "id": 1,
+            "email": "admin@test.com",
+            "username": "admin",
+            "is_admin": is_admin,
+        }
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def test_profiling_endpoint_returns_collapsed_stacks(
+    client, jwt_manager
+):
+    thread, stop = _run_busy_thread()
+    try:
+        response = await client.get(
+            PROFILING_URL,
+            params={"seconds": 0.1, "interval_ms": 5},
+            headers=await _admin_headers(jwt_manager, is_admin=True),
+        )
+    finally:
+        stop.set()
+        thread.join()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "attachment" in response.headers["content-disposition"]
+    assert int(response.headers["x-profile-samples"]) > 0
+    assert "busy-worker;" in response.text
+
+
+async def test_profiling_endpoint_requires_admin(client, jwt_manager):
+    response = await client.get(
+        PROFILING_URL,
+        params={"seconds": 0.1},
+        headers=await _admin_headers(jwt_manager, is_admin=False),
+    )
+
+    assert response.status_code == 403
+
+
+async def test_profiling_endpoint_bounds_duration(
+    client, jwt_manager, settings
+):
+    response = await client.get(
+        PROFILING_URL,
+        params={"seconds": settings.PROFILER_MAX_SECONDS + 1},
+        headers=await _admin_headers(jwt_manager, is_admin=True),
+    )
+
+    assert response.status_code == 422
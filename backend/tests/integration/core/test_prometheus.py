@@ -0,0 +1,158 @@
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY, Counter, Gauge, values
+from starlette.responses import PlainTextResponse
+
+from src.core.app import create_app
+from src.middleware import prometheus
+from src.middleware.prometheus import (
+    PrometheusMiddleware,
+    UNMATCHED_ENDPOINT,
+    mark_process_dead,
+    metrics_endpoint,
+    refresh_gauge_functions,
+    set_gauge_function,
+)
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    sub_app = FastAPI()
+
+    @sub_app.get("/files/{name}")
+    async def get_file(name: str) -> PlainTextResponse:
+        return PlainTextResponse("x" * 2048)
+
+    app.mount("/mounted", sub_app)
+    return app
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+async def _get(*paths: str) -> None:
+    transport = ASGITransport(app=_build_app())
+    async with AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        for path in paths:
+            await client.get(path)
+
+
+async def test_prometheus_labels_by_route_template():
+    labels = {"method": "GET", "endpoint": "/items/{item_id}"}
+    before = _sample("http_requests_total", status_code="200", **labels)
+
+    await _get("/items/1", "/items/2", "/items/3")
+
+    assert (
+        _sample("http_requests_total", status_code="200", **labels)
+        == before + 3
+    )
+    assert _sample("http_requests_in_progress", method="GET") == 0
+
+
+async def test_prometheus_mounted_and_unmatched_paths():
+    mounted = {"method": "GET", "endpoint": "/mounted/files/{name}"}
+    unmatched = {"method": "GET", "endpoint": UNMATCHED_ENDPOINT}
+    size_before = _sample("http_response_size_bytes_sum", **mounted)
+    ttfb_before = _sample("http_time_to_first_byte_seconds_count", **mounted)
+    missing_before = _sample(
+        "http_requests_total", status_code="404", **unmatched
+    )
+
+    await _get("/mounted/files/a.txt", "/random-1", "/random-2")
+
+    assert _sample("http_response_size_bytes_sum", **mounted) == (
+        size_before + 2048
+    )
+    assert (
+        _sample("http_time_to_first_byte_seconds_count", **mounted)
+        == ttfb_before + 1
+    )
+    assert (
+        _sample("http_requests_total", status_code="404", **unmatched)
+        == missing_before + 2
+    )
+
+
+async def test_create_app_registers_prometheus_middleware():
+    app = create_app()
+
+    assert any(m.cls is PrometheusMiddleware for m in app.user_middleware)
+
+
+def _use_worker(monkeypatch, pid: int) -> None:
+    # Metrics bind their value class on creation, like a forked worker
+    monkeypatch.setattr(
+        values, "ValueClass", values.MultiProcessValue(lambda: pid)
+    )
+
+
+async def test_metrics_endpoint_aggregates_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    for pid, amount in ((101, 2), (102, 3)):
+        _use_worker(monkeypatch, pid)
+        Counter("mp_test_requests", "Test", registry=None).inc(amount)
+
+    body = metrics_endpoint().body.decode()
+
+    assert "mp_test_requests_total 5.0" in body
+
+
+async def test_mark_process_dead_drops_live_gauges(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    _use_worker(monkeypatch, os.getpid())
+    Gauge(
+        "mp_test_in_use", "Test", registry=None, multiprocess_mode="livesum"
+    ).set(4)
+    assert "mp_test_in_use 4.0" in metrics_endpoint().body.decode()
+
+    mark_process_dead()
+
+    assert "mp_test_in_use" not in metrics_endpoint().body.decode()
+
+
+async def test_metrics_endpoint_sweeps_crashed_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    # A finished child stands in for a worker killed before shutdown
+    crashed = subprocess.Popen([sys.executable, "-c", "pass"])
+    crashed.wait()
+    for pid, in_use in ((crashed.pid, 4), (os.getpid(), 1)):
+        _use_worker(monkeypatch, pid)
+        Gauge(
+            "mp_test_crashed",
+            "Test",
+            registry=None,
+            multiprocess_mode="livesum",
+        ).set(in_use)
+
+    body = metrics_endpoint().body.decode()
+
+    assert "mp_test_crashed 1.0" in body
+    assert not (tmp_path / f"gauge_livesum_{crashed.pid}.db").exists()
+    assert (tmp_path / f"gauge_livesum_{os.getpid()}.db").exists()
+
+
+async def test_set_gauge_function_multiprocess(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(prometheus, "_gauge_functions", [])
+    gauge = Gauge("fn_test_gauge", "Test", registry=None)
+    current = {"value": 1}
+
+    set_gauge_function(gauge, lambda: current["value"])
+    current["value"] = 7
+    refresh_gauge_functions()
+
+    assert gauge._value.get() == 7
@@ -0,0 +1,121 @@
+import logging
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from src.adapters.postgres.instrumentation import fingerprint_statement
+from src.adapters.postgres.pool import create_db_engine
+from src.middleware.request_id import (
+    REQUEST_ID_HEADER,
+    RequestIdMiddleware,
+    get_request_id,
+)
+
+
+def test_fingerprint_ignores_literals_and_list_lengths():
+    one = fingerprint_statement(
+        "SELECT id FROM snippets WHERE uuid IN ($1::UUID) LIMIT $2::INTEGER"
+    )
+    many = fingerprint_statement(
+        "SELECT id FROM snippets\n WHERE uuid IN ($1::UUID, $2::UUID) LIMIT 10"
+    )
+    other = fingerprint_statement("SELECT id FROM users WHERE id = $1")
+
+    assert one == many
+    assert one[0] == "select"
+    assert other != one
+
+
+async def test_query_metrics_recorded_per_fingerprint(settings):
+    engine = create_db_engine(settings, settings.database_url, name="qm")
+    statement = "SELECT generate_series(1, 3)"
+    operation, fingerprint = fingerprint_statement(statement)
+    labels = {
+        "engine": "qm",
+        "operation": operation,
+        "fingerprint": fingerprint,
+    }
+    try:
+        async with engine.connect() as conn:
+            for _ in range(2):
+                await conn.execute(text(statement))
+    finally:
+        await engine.dispose()
+
+    assert (
+        REGISTRY.get_sample_value(
+            "snippetly_db_query_duration_seconds_count", labels
+        )
+        == 2
+    )
+    assert (
+        REGISTRY.get_sample_value("snippetly_db_query_rows_total", labels) == 6
+    )
+
+
+async def test_slow_query_logged_with_request_id(settings, caplog):
+    slow_settings = settings.model_copy(
+        update={
+            "POSTGRES_SLOW_QUERY_MS": 5,
+            "POSTGRES_QUERY_METRICS_SAMPLE_RATE": 0.0,
+        }
+    )
+    engine = create_db_engine(
+        slow_settings, settings.database_url, name="slow"
+    )
+
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/sleep")
+    async def sleep() -> dict:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT pg_sleep(0.02)"))
+            await conn.execute(text("SELECT 1"))
+        return {"request_id": get_request_id()}
+
+    transport = ASGITransport(app=app)
+    try:
+        with caplog.at_level(logging.WARNING, logger="snippetly.sql"):
+            async with AsyncClient(
+                transport=transport, base_url="http://testserver"
+            ) as client:
+                response = await client.get(
+                    "/sleep", headers={REQUEST_ID_HEADER: "req-123"}
+                )
+    finally:
+        await engine.dispose()
+
+    assert response.headers[REQUEST_ID_HEADER] == "req-123"
+    assert response.json() == {"request_id": "req-123"}
+    slow = [
+        r.getMessage()
+        for r in caplog.records
+        if "Slow query" in r.getMessage()
+    ]
+    assert len(slow) == 1
+    assert "request_id=req-123" in slow[0]
+    assert "pg_sleep" in slow[0]
+
+
+async def test_request_id_generated_for_invalid_header():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/id")
+    async def request_id() -> dict:
+        return {"request_id": get_request_id()}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        response = await client.get(
+            "/id", headers={REQUEST_ID_HEADER: "bad id; drop"}
+        )
+
+    generated = response.json()["request_id"]
+    assert len(generated) == 32
+    assert response.headers[REQUEST_ID_HEADER] == generated
@@ -0,0 +1,87 @@
+from fastapi import FastAPI, Depends
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.adapters.postgres import async_db
+from src.adapters.postgres.models import TagModel
+from src.adapters.postgres.pool import create_db_engine
+from src.adapters.postgres.routing import begin_read_routing, end_read_routing
+from src.core.dependencies.infrastructure import get_read_db
+from src.middleware.read_routing import ReadRoutingMiddleware, STICKY_COOKIE
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadRoutingMiddleware, sticky_seconds=30)
+
+    @app.get("/engine")
+    async def engine_name(db=Depends(get_read_db)) -> dict:  # noqa: B008
+        return {"engine": db.bind.sync_engine.pool.logging_name}
+
+    @app.post("/write")
+    async def write(db=Depends(async_db.get_db)) -> dict:  # noqa: B008
+        db.add(TagModel(name="routing-tag"))
+        await db.flush()
+        await db.rollback()
+        return {}
+
+    return app
+
+
+async def test_get_read_db_without_replica_uses_primary(monkeypatch):
+    monkeypatch.setattr(async_db, "ReadSessionLocal", None)
+    primary = async_db.SessionLocal()
+
+    sessions = get_read_db(primary)
+    assert await anext(sessions) is primary
+    await sessions.aclose()
+    await primary.close()
+
+
+async def test_read_routing_sticky_after_write(settings, monkeypatch):
+    replica_engine = create_db_engine(
+        settings, settings.database_url, name="replica"
+    )
+    monkeypatch.setattr(
+        async_db,
+        "ReadSessionLocal",
+        async_sessionmaker(bind=replica_engine),
+    )
+    transport = ASGITransport(app=_build_app())
+    try:
+        async with AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            response = await client.get("/engine")
+            assert response.json() == {"engine": "replica"}
+            assert STICKY_COOKIE not in response.cookies
+
+            response = await client.post("/write")
+            assert STICKY_COOKIE in response.cookies
+
+            # The cookie pins the client to the primary
+            response = await client.get("/engine")
+            assert response.json() == {"engine": "primary"}
+
+            client.cookies.clear()
+            response = await client.get("/engine")
+            assert response.json() == {"engine": "replica"}
+    finally:
+        await replica_engine.dispose()
+
+
+async def test_write_in_request_marks_routing_state():
+    state, token = begin_read_routing(sticky=False)
+    db = async_db.SessionLocal()
+    try:
+        await db.execute(text("SELECT 1"))
+        assert state.wrote is False
+
+        db.add(TagModel(name="routing-flush"))
+        await db.flush()
+        assert state.wrote is True
+    finally:
+        await db.rollback()
+        await db.close()
+        end_read_routing(token)
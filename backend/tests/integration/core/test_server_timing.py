@@ -0,0 +1,122 @@
+import asyncio
+
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from src.core.app import create_app
+from src.middleware.server_timing import (
+    SERVER_TIMING_HEADER,
+    ServerTimingMiddleware,
+    ServerTimingRoute,
+    enable_server_timing,
+    record_phase,
+    timed_phase,
+)
+
+
+def _build_app(always_emit: bool) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, always_emit=always_emit)
+
+    @app.get("/work")
+    async def work() -> dict:
+        with timed_phase("db"):
+            await asyncio.sleep(0.01)
+        # Tasks copy the context, their phases land in the same request
+        await asyncio.gather(
+            *(asyncio.to_thread(record_phase, "redis", 0.002) for _ in "ab")
+        )
+        return {}
+
+    @app.get("/admin")
+    async def admin() -> dict:
+        enable_server_timing()
+        record_phase("auth", 0.001)
+        return {}
+
+    router = APIRouter(route_class=ServerTimingRoute)
+
+    @router.get("/rendered", response_model=list[dict])
+    async def rendered() -> list[dict]:
+        return [{"item": i} for i in range(1000)]
+
+    @router.get("/rendered-sync")
+    def rendered_sync() -> dict:
+        # Returns on a worker thread
+        return {}
+
+    app.include_router(router)
+    return app
+
+
+async def _get(app: FastAPI, path: str) -> dict:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        return dict((await client.get(path)).headers)
+
+
+def _parse(header: str) -> dict[str, str]:
+    return {metric.split(";")[0]: metric for metric in header.split(", ")}
+
+
+async def test_server_timing_header_lists_phases():
+    headers = await _get(_build_app(always_emit=True), "/work")
+
+    metrics = _parse(headers[SERVER_TIMING_HEADER.lower()])
+    assert set(metrics) == {"db", "redis", "app"}
+    assert float(metrics["db"].split("dur=")[1].split(";")[0]) >= 10
+    assert 'desc="2 calls"' in metrics["redis"]
+
+
+async def test_server_timing_hidden_unless_enabled():
+    app = _build_app(always_emit=False)
+
+    assert SERVER_TIMING_HEADER.lower() not in await _get(app, "/work")
+    assert SERVER_TIMING_HEADER.lower() in await _get(app, "/admin")
+
+
+async def test_server_timing_observes_phase_histogram():
+    before = (
+        REGISTRY.get_sample_value(
+            "snippetly_request_phase_seconds_count", {"phase": "db"}
+        )
+        or 0
+    )
+
+    await _get(_build_app(always_emit=False), "/work")
+
+    assert (
+        REGISTRY.get_sample_value(
+            "snippetly_request_phase_seconds_count", {"phase": "db"}
+        )
+        == before + 1
+    )
+
+
+async def test_server_timing_route_records_serialize():
+    app = _build_app(always_emit=True)
+
+    for path in ("/rendered", "/rendered-sync"):
+        headers = await _get(app, path)
+        metrics = _parse(headers[SERVER_TIMING_HEADER.lower()])
+        assert 'desc="1 calls"' in metrics["serialize"]
+
+    # Plain routes do not time rendering
+    headers = await _get(app, "/work")
+    assert "serialize" not in _parse(headers[SERVER_TIMING_HEADER.lower()])
+
+
+def test_record_phase_outside_request_is_noop():
+    record_phase("db", 1.0)
+
+    with timed_phase("db"):
+        pass
+
+
+async def test_create_app_registers_server_timing_middleware():
+    app = create_app()
+
+    assert any(m.cls is ServerTimingMiddleware for m in app.user_middleware)
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+from src.core import tracing  # noqa: E402
+
+celery_app = Celery(
+    "tracing-test", broker="memory://", backend="cache+memory://"
+)
+
+
+@celery_app.task(name="tracing_test.add")
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+@pytest.fixture(scope="module")
+def span_exporter(settings, _engine):
+    exporter = InMemorySpanExporter()
+    traced_settings = settings.model_copy(
+        update={"TRACING_ENABLED": True, "TRACING_SAMPLE_RATE": 1.0}
+    )
+    assert tracing.setup_tracing(
+        traced_settings,
+        "snippetly-test",
+        engines=[_engine.sync_engine],
+        exporter=exporter,
+    )
+    yield exporter
+    tracing.shutdown_tracing()
+
+
+def _finished_spans(exporter: InMemorySpanExporter) -> dict:
+    tracing._provider.force_flush()
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_setup_tracing_disabled_by_default(settings):
+    assert tracing.setup_tracing(settings, "snippetly-test") is False
+
+
+async def test_request_trace_reaches_libraries_and_celery(
+    span_exporter, redis_client, db
+):
+    app = FastAPI()
+    tracing.instrument_app(app)
+
+    @app.get("/enqueue")
+    async def enqueue() -> dict:
+        await redis_client.ping()
+        await db.execute(text("SELECT 1"))
+        result = add.delay(1, 2)
+        return {"sum": await asyncio.to_thread(result.get, timeout=10)}
+
+    with start_worker(celery_app, perform_ping_check=False):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            response = await client.get("/enqueue")
+    assert response.json() == {"sum": 3}
+
+    spans = _finished_spans(span_exporter)
+    request = spans["GET /enqueue"]
+    trace_id = request.context.trace_id
+    assert spans["PING"].context.trace_id == trace_id
+    assert spans["SELECT"].context.trace_id == trace_id
+    assert spans["apply_async/tracing_test.add"].context.trace_id == trace_id
+    # The worker continues the trace from the task headers
+    assert spans["run/tracing_test.add"].context.trace_id == trace_id
+
+
+def test_sampler_follows_parent_decision():
+    tracer = TracerProvider(sampler=tracing.build_sampler(0.0)).get_tracer(
+        "test"
+    )
+    # A sampled parent from another process, like a task header
+    sampled_parent = trace.set_span_in_context(
+        trace.NonRecordingSpan(
+            trace.SpanContext(
+                trace_id=1,
+                span_id=2,
+                is_remote=True,
+                trace_flags=trace.TraceFlags(trace.TraceFlags.SAMPLED),
+            )
+        )
+    )
+
+    with tracer.start_as_current_span("root") as root:
+        assert not root.is_recording()
+    with tracer.start_as_current_span("task", context=sampled_parent) as task:
+        assert task.is_recording()
@@ -1,15 +1,18 @@
+from datetime import datetime, timezone
 from uuid import uuid4
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from src.adapters.postgres.models import (
     SnippetFavoritesModel,
     SnippetModel,
+    SnippetFeedModel,
     LanguageEnum,
 )
-from src.api.v1.schemas.snippets import FavoritesSortingEnum
+from src.api.v1.schemas.snippets import FavoritesSortingEnum, TagMatchEnum
 from src.core import exceptions as exc
+from tests.utils.db import explain
 
 
 async def test_add_to_favorites_success(
@@ -153,6 +156,27 @@ async def test_get_favorites_paginated_filter_by_tag(
     assert all(any(tag.name == "test" for tag in f.tags) for f in favorites)
 
 
+@pytest.mark.parametrize(
+    "tag_mode, expected", [(TagMatchEnum.ANY, 2), (TagMatchEnum.ALL, 1)]
+)
+async def test_get_favorites_paginated_filter_by_many_tags(
+    favorites_repo, setup_favorites, tag_mode, expected
+):
+    user1, _, _ = setup_favorites
+
+    favorites, total = await favorites_repo.get_favorites_paginated(
+        offset=0,
+        limit=10,
+        user_id=user1.id,
+        sort_by=FavoritesSortingEnum.DATE_ADDED,
+        tags=["test", "python"],
+        tag_mode=tag_mode,
+    )
+
+    assert total == expected
+    assert len({f.id for f in favorites}) == len(favorites) == expected
+
+
 async def test_get_favorites_paginated_sorting_snippet_date(
     favorites_repo, setup_favorites
 ):
@@ -185,3 +209,123 @@ async def test_get_favorites_paginated_sorting_title(
 
     titles = [f.title for f in favorites]
     assert titles == sorted(titles, key=str.lower)
+
+
+async def test_favorites_queries_use_indexes(db):
+    by_user = await explain(
+        db,
+        select(SnippetFavoritesModel)
+        .where(SnippetFavoritesModel.user_id == 1)
+        .order_by(SnippetFavoritesModel.created_at.desc())
+        .limit(10),
+    )
+    by_snippet = await explain(
+        db,
+        select(SnippetFavoritesModel).where(
+            SnippetFavoritesModel.snippet_id == 1
+        ),
+    )
+
+    assert "ix_snippet_favorites_user_id_created_at" in by_user
+    assert "Sort" not in by_user
+    assert "ix_snippet_favorites_snippet_id" in by_snippet
+
+
+async def test_favorites_count_follows_add_and_remove(
+    db, favorites_repo, snippet_factory, user_factory, active_user
+):
+    snippet, _ = await snippet_factory.create(active_user)
+    fan = await user_factory.create_active(db)
+
+    await favorites_repo.add_to_favorites(active_user, snippet.uuid)
+    await favorites_repo.add_to_favorites(fan, snippet.uuid)
+    await db.flush()
+    await favorites_repo.remove_from_favorites(fan, snippet.uuid)
+    await db.refresh(snippet)
+
+    assert snippet.favorites_count == 1
+    feed_count = await db.scalar(
+        select(SnippetFeedModel.favorites_count).where(
+            SnippetFeedModel.snippet_id == snippet.id
+        )
+    )
+    assert feed_count == 1
+
+
+async def test_favorite_toggle_keeps_snippet_updated_at(
+    db, favorites_repo, snippet_factory, user_factory, active_user
+):
+    snippet, _ = await snippet_factory.create(active_user)
+    fan = await user_factory.create_active(db)
+    # now() is fixed for the whole test transaction, an onupdate bump
+    # only shows against a timestamp from before it
+    edited_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await db.execute(
+        update(SnippetModel)
+        .where(SnippetModel.id == snippet.id)
+        .values(updated_at=edited_at)
+    )
+
+    await favorites_repo.add_to_favorites(fan, snippet.uuid)
+    await favorites_repo.remove_from_favorites(fan, snippet.uuid)
+    await favorites_repo.add_many_to_favorites(fan, [snippet.uuid])
+    await db.refresh(snippet)
+
+    assert snippet.favorites_count == 1
+    assert snippet.updated_at == edited_at
+
+
+async def test_add_many_to_favorites(
+    db, favorites_repo, snippet_factory, active_user
+):
+    first, _ = await snippet_factory.create(active_user)
+    second, _ = await snippet_factory.create(active_user)
+    missing = uuid4()
+    await favorites_repo.add_to_favorites(active_user, first.uuid)
+
+    result = await favorites_repo.add_many_to_favorites(
+        active_user, [first.uuid, second.uuid, missing]
+    )
+
+    assert result == {first.uuid: False, second.uuid: True}
+    favorited = await favorites_repo.get_favorited_ids(
+        active_user.id, [first.id, second.id]
+    )
+    assert favorited == {first.id, second.id}
+    await db.refresh(first)
+    await db.refresh(second)
+    assert first.favorites_count == second.favorites_count == 1
+
+
+async def test_remove_many_from_favorites(
+    db, favorites_repo, snippet_factory, active_user
+):
+    first, _ = await snippet_factory.create(active_user)
+    second, _ = await snippet_factory.create(active_user)
+    await favorites_repo.add_to_favorites(active_user, first.uuid)
+
+    result = await favorites_repo.remove_many_from_favorites(
+        active_user, [first.uuid, second.uuid, uuid4()]
+    )
+
+    assert result == {first.uuid: True, second.uuid: False}
+    assert not await favorites_repo.get_favorited_ids(
+        active_user.id, [first.id, second.id]
+    )
+    feed_count = await db.scalar(
+        select(SnippetFeedModel.favorites_count).where(
+            SnippetFeedModel.snippet_id == first.id
+        )
+    )
+    assert feed_count == 0
+
+
+async def test_get_favorited_ids(favorites_repo, setup_favorites):
+    user1, user2, favorites = setup_favorites
+    page_ids = [snippet.id for snippet in favorites[:2]] + [0]
+
+    assert await favorites_repo.get_favorited_ids(user1.id, page_ids) == {
+        snippet.id for snippet in favorites[:2]
+    }
+    assert await favorites_repo.get_favorited_ids(user2.id, page_ids) == set()
+    assert await favorites_repo.get_favorited_ids(user1.id, []) == set()
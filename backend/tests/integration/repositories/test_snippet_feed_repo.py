@@ -0,0 +1,198 @@
+from sqlalchemy import func, select, update
+
+from src.adapters.postgres.models import SnippetFeedModel
+from src.api.v1.schemas.snippets import (
+    SnippetSortingEnum,
+    TagMatchEnum,
+    UsernameMatchEnum,
+)
+from tests.utils.db import explain
+
+
+async def test_upsert_copies_snippet_state(
+    db, snippet_feed_repo, snippet_factory, active_user
+):
+    snippet, document = await snippet_factory.create(
+        active_user, tags=["beta", "alpha"]
+    )
+
+    row = await db.get(SnippetFeedModel, snippet.id)
+
+    assert row.uuid == snippet.uuid
+    assert row.username == active_user.username
+    assert row.title == snippet.title
+    assert row.tags == ["alpha", "beta"]
+    assert row.content == document.content
+    assert row.description == document.description
+    assert row.created_at == snippet.created_at
+
+
+async def test_upsert_overwrites_existing_row(
+    db, snippet_feed_repo, snippet_factory, active_user
+):
+    snippet, _ = await snippet_factory.create(active_user, tags=["alpha"])
+    snippet.title = "Renamed snippet"
+    snippet.tags = []
+    await db.flush()
+
+    await snippet_feed_repo.upsert(snippet.id, "new content", None)
+
+    row = await db.scalar(
+        select(SnippetFeedModel)
+        .where(SnippetFeedModel.snippet_id == snippet.id)
+        .execution_options(populate_existing=True)
+    )
+    assert row.title == "Renamed snippet"
+    assert row.tags == []
+    assert row.content == "new content"
+    assert row.description == ""
+
+
+async def test_get_feed_paginated_visibility(
+    snippet_feed_repo, setup_snippets
+):
+    user1 = setup_snippets["user1"]
+
+    snippets, total = await snippet_feed_repo.get_feed_paginated(
+        offset=0, limit=10, current_user_id=user1.id
+    )
+
+    assert total == 4
+    assert all(not s.is_private or s.user_id == user1.id for s in snippets)
+    assert [s.created_at for s in snippets] == sorted(
+        (s.created_at for s in snippets), reverse=True
+    )
+
+
+async def test_get_feed_paginated_pages_merge_visibility_branches(
+    db, snippet_feed_repo, setup_snippets
+):
+    user1 = setup_snippets["user1"]
+    # Rows made in one transaction share now(), ties have no fixed order
+    await db.execute(
+        update(SnippetFeedModel).values(
+            created_at=SnippetFeedModel.created_at
+            - func.make_interval(0, 0, 0, 0, 0, SnippetFeedModel.snippet_id)
+        )
+    )
+
+    full, _ = await snippet_feed_repo.get_feed_paginated(
+        offset=0, limit=10, current_user_id=user1.id
+    )
+    pages = []
+    for offset in range(4):
+        page, total = await snippet_feed_repo.get_feed_paginated(
+            offset=offset, limit=1, current_user_id=user1.id
+        )
+        assert total == 4
+        pages.extend(page)
+
+    assert [s.snippet_id for s in pages] == [s.snippet_id for s in full]
+    assert setup_snippets["u1_private_py"].id in {s.snippet_id for s in full}
+
+
+async def test_get_feed_paginated_filter_by_tags(
+    snippet_feed_repo, setup_snippets
+):
+    user1 = setup_snippets["user1"]
+
+    _, any_total = await snippet_feed_repo.get_feed_paginated(
+        offset=0,
+        limit=10,
+        current_user_id=user1.id,
+        tags=["test", "python"],
+    )
+    snippets, all_total = await snippet_feed_repo.get_feed_paginated(
+        offset=0,
+        limit=10,
+        current_user_id=user1.id,
+        tags=["test", "python"],
+        tag_mode=TagMatchEnum.ALL,
+    )
+
+    assert any_total == 2
+    assert all_total == 1
+    assert snippets[0].snippet_id == setup_snippets["u1_public_py"].id
+
+
+async def test_get_feed_paginated_filter_by_username(
+    snippet_feed_repo, setup_snippets
+):
+    user1 = setup_snippets["user1"]
+    user2 = setup_snippets["user2"]
+
+    snippets, total = await snippet_feed_repo.get_feed_paginated(
+        offset=0,
+        limit=10,
+        current_user_id=user1.id,
+        username=user2.username.upper(),
+        username_mode=UsernameMatchEnum.EXACT,
+    )
+    none, none_total = await snippet_feed_repo.get_feed_paginated(
+        offset=0,
+        limit=10,
+        current_user_id=user1.id,
+        username="no-such-author",
+    )
+
+    assert total == 1
+    assert snippets[0].user_id == user2.id
+    assert (list(none), none_total) == ([], 0)
+
+
+async def test_get_feed_paginated_most_favorited(
+    db, snippet_feed_repo, favorites_repo, setup_snippets
+):
+    user1 = setup_snippets["user1"]
+    target = setup_snippets["u1_public_js"]
+    await favorites_repo.add_to_favorites(user1, target.uuid)
+    await db.flush()
+
+    snippets, _ = await snippet_feed_repo.get_feed_paginated(
+        offset=0,
+        limit=10,
+        current_user_id=user1.id,
+        sort_by=SnippetSortingEnum.MOST_FAVORITED,
+    )
+
+    assert snippets[0].snippet_id == target.id
+    assert snippets[0].favorites_count == 1
+    assert all(s.favorites_count == 0 for s in snippets[1:])
+
+
+async def test_feed_queries_use_indexes(db, snippet_feed_repo):
+    def page(visibility=None, sort_by=SnippetSortingEnum.NEWEST):
+        return snippet_feed_repo.build_page_query(
+            snippet_feed_repo.build_visibility_filters(1, visibility),
+            [],
+            0,
+            10,
+            sort_by,
+        )
+
+    feed = await explain(db, page())
+    public = await explain(db, page("public"))
+    most_favorited = await explain(
+        db, page("public", SnippetSortingEnum.MOST_FAVORITED)
+    )
+    # Without the visibility OR, whose own-private branch the planner
+    # may prefer once the table has stats
+    count_by_tags = await explain(
+        db,
+        select(func.count())
+        .select_from(SnippetFeedModel)
+        .where(*snippet_feed_repo.build_filters(tags=["python"])),
+        bitmapscan=True,
+    )
+
+    # Public and own private branches merged in index order. Merge
+    # Append prints a Sort Key, only a Sort node means a sort
+    assert "Merge Append" in feed
+    assert "ix_snippet_feed_public_created_at" in feed
+    assert "ix_snippet_feed_user_id_created_at" in feed
+    assert "Sort  (" not in feed
+    assert "ix_snippet_feed_public_created_at" in public
+    assert "Sort  (" not in public
+    assert "ix_snippet_feed_public_favorites_count" in most_favorited
+    assert "Sort  (" not in most_favorited
+    assert "ix_snippet_feed_tags" in count_by_tags
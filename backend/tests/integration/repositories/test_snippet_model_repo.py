@@ -1,4 +1,3 @@
-from datetime import date, timedelta
 from uuid import uuid4
 
 import pytest
@@ -6,7 +5,12 @@ from beanie import PydanticObjectId
 from sqlalchemy import select
 
 import src.core.exceptions as exc
-from src.adapters.postgres.models import LanguageEnum, TagModel
+from src.adapters.postgres.models import (
+    LanguageEnum,
+    TagModel,
+    SnippetModel,
+)
+from tests.utils.db import explain
 
 snippet_data = {
     "title": "Test Snippet with Tags",
@@ -120,143 +124,6 @@ async def test_create_with_no_tags(
     assert len(snippet.tags) == 0
 
 
-async def test_get_paginated_default_visibility(
-    snippet_model_repo, setup_snippets
-):
-    user1 = setup_snippets["user1"]
-
-    snippets, total = await snippet_model_repo.get_snippets_paginated(
-        offset=0, limit=10, current_user_id=user1.id
-    )
-
-    assert total == 4
-
-    user1_ids = {
-        setup_snippets["u1_public_py"].id,
-        setup_snippets["u1_private_py"].id,
-        setup_snippets["u1_public_js"].id,
-    }
-    user2_public_id = setup_snippets["u2_public_py"].id
-
-    assert any(s.id in user1_ids for s in snippets)
-    assert all(not s.is_private or s.user_id == user1.id for s in snippets)
-    assert all(
-        s.language in [LanguageEnum.PYTHON, LanguageEnum.JAVASCRIPT]
-        for s in snippets
-    )
-    assert any(s.id == user2_public_id for s in snippets)
-
-
-async def test_get_paginated_public_only(snippet_model_repo, setup_snippets):
-    user1 = setup_snippets["user1"]
-
-    snippets, total = await snippet_model_repo.get_snippets_paginated(
-        offset=0, limit=10, current_user_id=user1.id, visibility="public"
-    )
-
-    assert total == 3
-    assert all(not s.is_private for s in snippets)
-
-
-async def test_get_paginated_private_only(snippet_model_repo, setup_snippets):
-    user1 = setup_snippets["user1"]
-
-    snippets, total = await snippet_model_repo.get_snippets_paginated(
-        offset=0, limit=10, current_user_id=user1.id, visibility="private"
-    )
-    assert total == 1
-    assert snippets[0].is_private
-    assert snippets[0].user_id == user1.id
-
-
-async def test_get_paginated_filter_by_language(
-    snippet_model_repo, setup_snippets
-):
-    user1 = setup_snippets["user1"]
-
-    snippets, total = await snippet_model_repo.get_snippets_paginated(
-        offset=0,
-        limit=10,
-        current_user_id=user1.id,
-        language=LanguageEnum.PYTHON,
-    )
-    assert total == 3
-    assert all(s.language == LanguageEnum.PYTHON for s in snippets)
-
-
-async def test_get_paginated_filter_by_tag(snippet_model_repo, setup_snippets):
-    user1 = setup_snippets["user1"]
-
-    snippets, total = await snippet_model_repo.get_snippets_paginated(
-        offset=0, limit=10, current_user_id=user1.id, tags=["test"]
-    )
-
-    assert total == 2
-    assert all("test" in {t.name for t in s.tags} for s in snippets)
-
-
-async def test_get_paginated_filter_by_username(
-    snippet_model_repo, setup_snippets
-):
-    user1 = setup_snippets["user1"]
-    user2 = setup_snippets["user2"]
-
-    snippets, total = await snippet_model_repo.get_snippets_paginated(
-        offset=0, limit=10, current_user_id=user1.id, username=user2.username
-    )
-
-    assert total == 1
-    assert snippets[0].user_id == user2.id
-    assert not snippets[0].is_private
-
-
-async def test_get_paginated_pagination(snippet_model_repo, setup_snippets):
-    user1 = setup_snippets["user1"]
-
-    snippets_p1, total = await snippet_model_repo.get_snippets_paginated(
-        offset=0, limit=2, current_user_id=user1.id
-    )
-    snippets_p2, total_p2 = await snippet_model_repo.get_snippets_paginated(
-        offset=2, limit=2, current_user_id=user1.id
-    )
-
-    assert total == total_p2 == 4
-    assert len(snippets_p1) == 2
-    assert len(snippets_p2) == 2
-    assert not {s.id for s in snippets_p1}.intersection(
-        {s.id for s in snippets_p2}
-    )
-
-
-async def test_get_paginated_filter_by_date(
-    snippet_model_repo, setup_snippets
-):
-    user1 = setup_snippets["user1"]
-
-    (
-        recent_snippets,
-        total_recent,
-    ) = await snippet_model_repo.get_snippets_paginated(
-        offset=0,
-        limit=10,
-        current_user_id=user1.id,
-        created_after=date.today() - timedelta(days=2),
-    )
-    old_snippets, total_old = await snippet_model_repo.get_snippets_paginated(
-        offset=0,
-        limit=10,
-        current_user_id=user1.id,
-        created_before=date.today() - timedelta(days=3),
-    )
-
-    assert total_recent == 3
-    assert total_old == 1
-    assert all(
-        s.created_at.date() < (date.today() - timedelta(days=3))
-        for s in old_snippets
-    )
-
-
 async def test_get_by_uuid(snippet_model_repo, setup_snippets):
     snippet = setup_snippets["u1_public_py"]
 
@@ -379,3 +246,14 @@ async def test_update_partial(db, snippet_model_repo, setup_snippets):
 async def test_update_not_found(snippet_model_repo):
     with pytest.raises(exc.SnippetNotFoundError):
         await snippet_model_repo.update(uuid4(), title="Won't work")
+
+
+async def test_tags_filter_uses_reverse_index(db, snippet_model_repo):
+    plan = await explain(
+        db,
+        select(SnippetModel.id).where(
+            snippet_model_repo.build_tags_filter(["python"])
+        ),
+    )
+
+    assert "ix_snippets_tags_tag_id" in plan
@@ -0,0 +1,22 @@
+from sqlalchemy import text
+
+from src.adapters.postgres.models import SnippetModel
+from src.adapters.postgres.repositories import StatsRepository
+
+
+async def test_estimate_count_after_analyze(db, snippet_factory, active_user):
+    repo = StatsRepository(db)
+    await db.execute(text("ANALYZE snippets"))
+    before = await repo.estimate_count(SnippetModel)
+
+    for _ in range(3):
+        await snippet_factory.create(active_user)
+    await db.flush()
+    await db.execute(text("ANALYZE snippets"))
+
+    assert await repo.estimate_count(SnippetModel) == before + 3
+
+
+async def test_estimate_count_is_not_negative(db):
+    # reltuples is -1 for a table that was never analyzed
+    assert await StatsRepository(db).estimate_count(SnippetModel) >= 0
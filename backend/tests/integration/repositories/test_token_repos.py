@@ -1,12 +1,17 @@
 import pytest
+from sqlalchemy import select, delete, func
 
 from src.adapters.postgres.models import (
     ActivationTokenModel,
     PasswordResetTokenModel,
     RefreshTokenModel,
 )
-from src.adapters.postgres.repositories import TokenRepository
-from src.core.security import generate_secure_token
+from src.adapters.postgres.repositories import (
+    TokenRepository,
+    RefreshTokenRepository,
+)
+from src.core.security import generate_secure_token, hash_token
+from tests.utils.db import explain
 
 
 @pytest.mark.parametrize(
@@ -28,7 +33,7 @@ async def test_create_and_get_token(db, user_factory, token_model):
     fetched = await repo.get_by_token(token)
 
     assert fetched is not None
-    assert fetched.token == token
+    assert fetched.token == token_model.lookup_key(token)
     assert fetched.user_id == user.id
 
 
@@ -80,7 +85,7 @@ async def test_get_by_user(
 
     token = await repo.get_by_user(user.id)
     assert token is not None
-    assert token.token == token_value
+    assert token.token == token_model.lookup_key(token_value)
 
 
 @pytest.mark.parametrize(
@@ -131,3 +136,84 @@ async def test_delete_by_user_id(
     await db.commit()
     token = await repo.get_by_token(token_value)
     assert token is None
+
+
+async def test_refresh_token_stored_as_digest(db, user_factory, jwt_manager):
+    repo = RefreshTokenRepository(db)
+    user = await user_factory.create(db)
+    refresh_token = jwt_manager.create_refresh_token(
+        {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "is_admin": user.is_admin,
+        }
+    )
+
+    await repo.create(user.id, refresh_token, days=7)
+    await db.flush()
+
+    stored = await repo.get_by_token(refresh_token)
+    assert stored is not None
+    assert stored.token == hash_token(refresh_token)
+    assert len(stored.token) == 64
+    assert stored.jti == jwt_manager.decode_token(refresh_token)["jti"]
+
+
+async def test_delete_by_user_id_returning(db, user_factory):
+    repo = RefreshTokenRepository(db)
+    user, _ = await user_factory.create_with_refresh_token(
+        db, generate_secure_token()
+    )
+    await repo.create(user.id, generate_secure_token(), days=7)
+    await db.flush()
+
+    revoked = await repo.delete_by_user_id_returning(user.id)
+
+    assert len(revoked) == 2
+    assert all(expires_at is not None for _, expires_at in revoked)
+    assert await repo.list_by_user(user.id) == []
+
+
+async def test_refresh_token_lookups_use_indexes(db):
+    repo = RefreshTokenRepository(db)
+
+    by_token = await explain(
+        db,
+        select(RefreshTokenModel).where(
+            RefreshTokenModel.token == repo.token_model.lookup_key("token")
+        ),
+    )
+    by_user = await explain(
+        db,
+        select(RefreshTokenModel).where(RefreshTokenModel.user_id == 1),
+    )
+
+    assert "refresh_tokens_token_key" in by_token
+    assert "ix_refresh_tokens_user_id" in by_user
+
+
+@pytest.mark.parametrize(
+    "token_model",
+    [ActivationTokenModel, PasswordResetTokenModel, RefreshTokenModel],
+)
+async def test_expired_token_cleanup_uses_index(db, token_model):
+    plan = await explain(
+        db,
+        delete(token_model).where(token_model.expires_at < func.now()),
+    )
+
+    assert f"ix_{token_model.__tablename__}_expires_at" in plan
+
+
+async def test_count_active_users(db, user_factory, refresh_token_repo):
+    before = await refresh_token_repo.count_active_users(days=7)
+    recent, other, stale = [await user_factory.create(db) for _ in range(3)]
+    await refresh_token_repo.create(recent.id, generate_secure_token(), 7)
+    await refresh_token_repo.create(recent.id, generate_secure_token(), 7)
+    await refresh_token_repo.create(other.id, generate_secure_token(), 7)
+    # Issued with a 7 day life two days ago
+    await refresh_token_repo.create(stale.id, generate_secure_token(), 5)
+    await db.flush()
+
+    assert await refresh_token_repo.count_active_users(days=7) == before + 2
@@ -1,3 +1,11 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import InvalidRequestError
+
+from src.api.v1.schemas.snippets import UsernameMatchEnum
+from tests.factories.user import UserFactory
+from tests.utils.db import explain
+
 test_user = {
     "email": "test@email.com",
     "password": "Test1234!",
@@ -47,10 +55,116 @@ async def test_get_user_by_login_email(db, user_repo, user_factory):
     assert fetched.username == user.username
 
 
-async def test_get_by_email_or_username(db, user_repo, user_factory):
+async def test_get_user_by_login_loads_only_login_columns(
+    db, user_repo, user_factory
+):
     user = await user_factory.create(db)
+    db.expunge_all()
+
+    fetched = await user_repo.get_by_login(user.username)
 
-    fetched = await user_repo.get_by_email_or_username(
-        user.email, user.username
-    )
     assert fetched is not None
+    assert fetched.verify_password(UserFactory.DEFAULT_PASSWORD) is True
+    with pytest.raises(InvalidRequestError):
+        _ = fetched.created_at
+    with pytest.raises(InvalidRequestError):
+        _ = fetched.profile
+
+
+async def test_get_user_by_login_case_insensitive(db, user_repo, user_factory):
+    user = await user_factory.create(db)
+
+    by_email = await user_repo.get_by_login(user.email.upper())
+    by_username = await user_repo.get_by_login(user.username.upper())
+
+    assert by_email is not None
+    assert by_username is not None
+    assert by_email.id == by_username.id == user.id
+
+
+async def test_get_user_by_login_not_found(db, user_repo):
+    assert await user_repo.get_by_login("missing@example.com") is None
+
+
+async def test_get_taken_field(db, user_repo, user_factory):
+    user = await user_factory.create(db)
+
+    assert await user_repo.get_taken_field(user.email, "free") == "email"
+    assert (
+        await user_repo.get_taken_field("free@email.com", user.username)
+        == "username"
+    )
+    assert (
+        await user_repo.get_taken_field(
+            user.email.upper(), user.username.upper()
+        )
+        == "email"
+    )
+    assert await user_repo.get_taken_field("free@email.com", "free") is None
+
+
+async def test_login_query_uses_lower_indexes(db, user_repo):
+    plan = await explain(db, user_repo.build_login_query("Test@Email.com"))
+
+    assert "ix_users_email_lower" in plan
+    assert "ix_users_username_lower" in plan
+    assert "BitmapOr" not in plan
+
+
+async def test_taken_field_query_uses_lower_indexes(db, user_repo):
+    plan = await explain(
+        db, user_repo.build_taken_field_query("test@email.com", "test")
+    )
+
+    assert "ix_users_email_lower" in plan
+    assert "ix_users_username_lower" in plan
+
+
+@pytest.mark.parametrize(
+    "mode, search, expected",
+    [
+        (UsernameMatchEnum.EXACT, "Search_Owner", {"search_owner"}),
+        (UsernameMatchEnum.EXACT, "search", set()),
+        (
+            UsernameMatchEnum.PREFIX,
+            "SEARCH_",
+            {"search_owner", "search_other"},
+        ),
+        (UsernameMatchEnum.PREFIX, "owner", set()),
+        (UsernameMatchEnum.FUZZY, "ch_ow", {"search_owner"}),
+        (
+            UsernameMatchEnum.FUZZY,
+            "owner",
+            {"search_owner", "searchxowner"},
+        ),
+    ],
+)
+async def test_build_ids_by_username_query(
+    db, user_repo, user_factory, mode, search, expected
+):
+    users = {
+        name: await user_factory.create(db, username=name)
+        for name in ("search_owner", "search_other", "searchxowner")
+    }
+
+    ids = await db.scalars(user_repo.build_ids_by_username_query(search, mode))
+
+    assert set(ids) == {users[name].id for name in expected}
+
+
+async def test_username_prefix_query_uses_pattern_index(db, user_repo):
+    # Under a C collation the plain lower(username) index serves the
+    # range too and the planner may pick either. Dropping it inside the
+    # test transaction (rolled back) leaves the pattern index, which is
+    # what non-C databases need
+    await db.execute(text("DROP INDEX ix_users_username_lower"))
+
+    prefix = await explain(
+        db,
+        user_repo.build_ids_by_username_query(
+            "owner", UsernameMatchEnum.PREFIX
+        ),
+    )
+
+    assert "Index Cond" in prefix
+    assert "ix_users_username_lower_pattern" in prefix
@@ -1,4 +1,5 @@
 import pytest
+from redis import RedisError
 from sqlalchemy.exc import SQLAlchemyError
 
 import src.core.exceptions as exc
@@ -73,3 +74,36 @@ async def test_logout_user_db_error(
 
     mock.assert_called_once()
     assert await refresh_token_repo.get_by_user(active_user.id) is not None
+
+
+async def test_logout_user_single_redis_round_trip(
+    logged_in_tokens, auth_service, jwt_manager, redis_client, mocker
+):
+    spy = mocker.spy(redis_client, "pipeline")
+    setex = mocker.spy(redis_client, "setex")
+
+    await auth_service.logout_user(
+        logged_in_tokens["refresh_token"], logged_in_tokens["access_token"]
+    )
+
+    spy.assert_called_once()
+    setex.assert_not_called()
+    for token in (
+        logged_in_tokens["access_token"],
+        logged_in_tokens["refresh_token"],
+    ):
+        jti = jwt_manager.decode_token(token)["jti"]
+        assert await jwt_manager.is_blacklisted(jti) is True
+
+
+async def test_logout_user_tolerates_refresh_blacklist_error(
+    logged_in_tokens, active_user, auth_service, refresh_token_repo, mocker
+):
+    mocker.patch(
+        "src.adapters.redis.unit_of_work.RedisUnitOfWork.flush",
+        side_effect=RedisError,
+    )
+
+    await auth_service.logout_user(logged_in_tokens["refresh_token"], "bad")
+
+    assert await refresh_token_repo.get_by_user(active_user.id) is None
@@ -40,6 +40,21 @@ async def test_register_user_already_exists(db, user_service, faker):
     assert str(e.value) == "This username is taken."
 
 
+async def test_register_user_already_exists_case_insensitive(
+    db, user_service, faker
+):
+    user_data = create_user_data(faker)
+    await user_service.register_user(**user_data)
+
+    user_data_upper = user_data.copy()
+    user_data_upper["email"] = "new" + user_data["email"]
+    user_data_upper["username"] = user_data["username"].upper()
+
+    with pytest.raises(exc.UserAlreadyExistsError) as e:
+        await user_service.register_user(**user_data_upper)
+    assert str(e.value) == "This username is taken."
+
+
 async def test_register_user_db_error(
     user_repo,
     user_service,
@@ -3,7 +3,10 @@ from uuid import uuid4
 import pytest
 
 from src.adapters.postgres.models import LanguageEnum
-from src.api.v1.schemas.snippets import FavoritesSortingEnum
+from src.api.v1.schemas.snippets import (
+    FavoritesBulkActionEnum,
+    FavoritesSortingEnum,
+)
 from src.core import exceptions as exc
 
 
@@ -75,6 +78,30 @@ async def test_remove_from_favorites_snippet_not_found(
         await favorites_service.remove_from_favorites(active_user, uuid4())
 
 
+async def test_bulk_update_favorites(
+    favorites_service, snippet_factory, active_user
+):
+    first, _ = await snippet_factory.create(active_user)
+    second, _ = await snippet_factory.create(active_user)
+    missing = uuid4()
+    await favorites_service.add_to_favorites(active_user, first.uuid)
+
+    added = await favorites_service.bulk_update_favorites(
+        active_user,
+        [first.uuid, second.uuid, missing, second.uuid],
+        FavoritesBulkActionEnum.ADD,
+    )
+    assert added.changed == [second.uuid]
+    assert added.unchanged == [first.uuid]
+    assert added.not_found == [missing]
+
+    removed = await favorites_service.bulk_update_favorites(
+        active_user, [first.uuid, second.uuid], FavoritesBulkActionEnum.REMOVE
+    )
+    assert removed.changed == [first.uuid, second.uuid]
+    assert removed.unchanged == removed.not_found == []
+
+
 async def test_get_favorites_paginated_basic(
     favorites_service, setup_favorites
 ):
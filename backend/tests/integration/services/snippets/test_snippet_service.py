@@ -1,7 +1,8 @@
+from datetime import datetime, timezone
 from uuid import uuid4
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.exc import SQLAlchemyError
 
 import src.core.exceptions as exc
@@ -123,6 +124,20 @@ async def test_get_other_user_public_snippet(
     assert response.title == other_public_snippet.title
 
 
+async def test_get_snippet_is_favorited(snippet_service, setup_favorites):
+    user1, user2, favorites = setup_favorites
+
+    as_fan = await snippet_service.get_snippet_by_uuid(
+        favorites[0].uuid, user1
+    )
+    as_other = await snippet_service.get_snippet_by_uuid(
+        favorites[0].uuid, user2
+    )
+
+    assert as_fan.is_favorited is True
+    assert as_other.is_favorited is False
+
+
 async def test_get_other_user_private_snippet_no_permission(
     db, snippet_service, setup_snippets
 ):
@@ -183,6 +198,8 @@ async def test_update_own_snippet_success(
         snippet_to_update.uuid, snippet_update_data, user1
     )
 
+    # Nothing ran after the commit, the connection went back to the pool
+    assert not db.in_transaction()
     assert response.title == snippet_update_data.title
     assert response.language == snippet_update_data.language
     assert response.is_private == snippet_update_data.is_private
@@ -203,6 +220,28 @@ async def test_update_own_snippet_success(
     )
 
 
+async def test_update_content_only_moves_updated_at(
+    db, snippet_service, setup_snippets
+):
+    user1 = setup_snippets["user1"]
+    snippet = setup_snippets["u1_public_py"]
+    edited_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await db.execute(
+        update(SnippetModel)
+        .where(SnippetModel.id == snippet.id)
+        .values(updated_at=edited_at)
+    )
+
+    # Nothing on the SQL row changes, the feed sync still has to see it
+    response = await snippet_service.update_snippet(
+        snippet.uuid,
+        SnippetUpdateRequestSchema(content="only the content changed"),
+        user1,
+    )
+
+    assert response.updated_at > edited_at
+
+
 async def test_update_other_user_snippet_no_permission(
     db, snippet_service, setup_snippets, snippet_update_data
 ):
@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select, update
+
+from src.adapters.postgres.models import SnippetFeedModel, SnippetModel
+from src.worker.tasks import snippets as snippet_tasks
+from src.worker.tasks.snippets import _sync_feed_batch, sync_snippet_feed
+
+
+async def _feed_row(db, snippet_id: int):
+    return await db.scalar(
+        select(SnippetFeedModel)
+        .where(SnippetFeedModel.snippet_id == snippet_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def test_sync_batch_backfills_missing_rows(
+    db, snippet_factory, active_user
+):
+    snippet, document = await snippet_factory.create(active_user)
+    await db.execute(
+        delete(SnippetFeedModel).where(
+            SnippetFeedModel.snippet_id == snippet.id
+        )
+    )
+
+    result = await db.run_sync(_sync_feed_batch, snippet.id - 1)
+
+    assert result == (snippet.id, 1)
+    row = await _feed_row(db, snippet.id)
+    assert row.content == document.content
+    assert row.description == document.description
+
+
+async def test_sync_batch_refreshes_stale_rows(
+    db, snippet_factory, active_user
+):
+    snippet, document = await snippet_factory.create(active_user)
+    await db.execute(
+        update(SnippetFeedModel)
+        .where(SnippetFeedModel.snippet_id == snippet.id)
+        .values(
+            content="outdated",
+            updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+    )
+
+    result = await db.run_sync(_sync_feed_batch, snippet.id - 1)
+
+    assert result == (snippet.id, 1)
+    row = await _feed_row(db, snippet.id)
+    assert row.content == document.content
+
+
+async def test_sync_batch_skips_snippets_updated_after_read(
+    db, snippet_factory, active_user, monkeypatch
+):
+    snippet, _ = await snippet_factory.create(active_user)
+    stale_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await db.execute(
+        update(SnippetFeedModel)
+        .where(SnippetFeedModel.snippet_id == snippet.id)
+        .values(content="outdated", updated_at=stale_at)
+    )
+    load_documents = snippet_tasks._load_documents
+
+    def sync_racing_update(session) -> tuple[int, int]:
+        def load_then_update(mongodb_ids: list[str]) -> dict[str, dict]:
+            documents = load_documents(mongodb_ids)
+            # An update commits its SQL row after the Mongo read
+            session.execute(
+                update(SnippetModel)
+                .where(SnippetModel.id == snippet.id)
+                .values(updated_at=func.now() + func.make_interval(0, 0, 0, 1))
+            )
+            return documents
+
+        monkeypatch.setattr(snippet_tasks, "_load_documents", load_then_update)
+        return _sync_feed_batch(session, snippet.id - 1)
+
+    result = await db.run_sync(sync_racing_update)
+
+    assert result == (snippet.id, 1)
+    row = await _feed_row(db, snippet.id)
+    # Still stale, the next sync picks it up with the new content
+    assert row.content == "outdated"
+    assert row.updated_at == stale_at
+
+
+async def test_sync_batch_skips_rows_in_sync(db, snippet_factory, active_user):
+    snippet, _ = await snippet_factory.create(active_user)
+    # Same updated_at as the snippet, the row counts as current
+    await db.execute(
+        update(SnippetFeedModel)
+        .where(SnippetFeedModel.snippet_id == snippet.id)
+        .values(content="untouched")
+    )
+
+    result = await db.run_sync(_sync_feed_batch, snippet.id - 1)
+
+    assert result == (snippet.id - 1, 0)
+    row = await _feed_row(db, snippet.id)
+    assert row.content == "untouched"
+
+
+async def test_sync_snippet_feed_task(db, snippet_factory, active_user):
+    snippet, document = await snippet_factory.create(active_user)
+    await db.execute(
+        delete(SnippetFeedModel).where(
+            SnippetFeedModel.snippet_id == snippet.id
+        )
+    )
+    # The task reads through its own sync session
+    await db.commit()
+
+    try:
+        await asyncio.to_thread(sync_snippet_feed)
+
+        row = await _feed_row(db, snippet.id)
+        assert row is not None
+        assert row.content == document.content
+    finally:
+        await db.execute(
+            delete(SnippetModel).where(SnippetModel.id == snippet.id)
+        )
+        await db.commit()
@@ -0,0 +1,18 @@
+from sqlalchemy import text, Executable
+from sqlalchemy.dialects import postgresql
+
+
+async def explain(db, query: Executable, *, bitmapscan: bool = False) -> str:
+    # Test tables are tiny, so the planner would always prefer a seq or
+    # bitmap scan followed by a sort over an ordered index scan. GIN
+    # indexes are only reachable through bitmap scans
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    await db.execute(text("SET LOCAL enable_sort = off"))
+    bitmap = "on" if bitmapscan else "off"
+    await db.execute(text(f"SET LOCAL enable_bitmapscan = {bitmap}"))
+    compiled = query.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    result = await db.execute(text(f"EXPLAIN {compiled}"))
+    return "\n".join(row[0] for row in result)
@@ -0,0 +1,17 @@
+#!/bin/sh
+# Creates the replication role and allows it to stream from the primary.
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<EOSQL
+DO \$\$
+BEGIN
+    IF NOT EXISTS (SELECT FROM pg_roles WHERE rolname = '${REPLICATION_USER}') THEN
+        CREATE ROLE ${REPLICATION_USER} WITH REPLICATION LOGIN PASSWORD '${REPLICATION_PASSWORD}';
+    END IF;
+END
+\$\$;
+EOSQL
+
+if ! grep -q "replication ${REPLICATION_USER}" "$PGDATA/pg_hba.conf"; then
+    echo "host replication ${REPLICATION_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
+fi
@@ -0,0 +1,24 @@
+#!/bin/sh
+# Clones the primary on first start, then runs as a hot standby.
+set -e
+
+PRIMARY_PORT="${PRIMARY_PORT:-5432}"
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until pg_isready -h "$PRIMARY_HOST" -p "$PRIMARY_PORT" \
+        -U "$REPLICATION_USER"; do
+        echo "Waiting for primary at $PRIMARY_HOST:$PRIMARY_PORT..."
+        sleep 2
+    done
+
+    PGPASSWORD="$REPLICATION_PASSWORD" pg_basebackup \
+        -h "$PRIMARY_HOST" \
+        -p "$PRIMARY_PORT" \
+        -U "$REPLICATION_USER" \
+        -D "$PGDATA" \
+        -X stream \
+        -R
+    chmod 0700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on